@@ -10,7 +10,10 @@ from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Any
 from db import SessionLocal
-from models import User, Job, JobApplication
+from models import User, Job, JobApplication, JobMatchScore, AutomationSetting
+from enhanced_profile import EnhancedUserProfile
+from skill_index import skill_index
+from skill_taxonomy import skill_taxonomy
 from tasks.scraping_tasks import scrape_jobs_for_user, refresh_job_listings
 from tasks.application_tasks import apply_to_job, generate_application_report
 from tasks.notification_tasks import send_daily_summary, send_job_matches
@@ -54,7 +57,7 @@ class JobScheduler:
 
             # Weekly job matching notifications on Mondays at 10 AM
             'weekly-job-matches': {
-                'task': 'tasks.notification_tasks.send_job_matches',
+                'task': 'tasks.notification_tasks.send_weekly_job_matches',
                 'schedule': crontab(hour=10, minute=0, day_of_week=1),  # Monday 10 AM
                 'args': (),
                 'options': {'queue': 'notifications'}
@@ -76,12 +79,12 @@ class JobScheduler:
                 'options': {'queue': 'applications'}
             },
 
-            # Update job match scores daily at 6 AM
+            # Score recent jobs that missed ingest-time match scoring, daily at 6 AM
             'update-job-matches': {
-                'task': 'advanced_scheduler.update_job_match_scores',
+                'task': 'tasks.matching_tasks.score_unscored_jobs',
                 'schedule': crontab(hour=6, minute=0),  # 6:00 AM daily
                 'args': (),
-                'options': {'queue': 'scraping'}
+                'options': {'queue': 'matching'}
             },
 
             # Generate analytics reports weekly on Sundays
@@ -103,19 +106,35 @@ def auto_apply_to_matched_jobs(self):
         db = SessionLocal()
 
         # Get users with auto-apply enabled
-        auto_apply_users = db.query(User).join(User.enhanced_profile).filter(
-            User.enhanced_profile.has(auto_apply_enabled=True)
+        auto_apply_users = db.query(User).join(
+            EnhancedUserProfile, EnhancedUserProfile.user_id == User.id
+        ).filter(
+            EnhancedUserProfile.auto_apply_enabled == True
         ).all()
 
         applied_count = 0
 
+        taxonomy = skill_taxonomy.current()
+        skill_index.sync(db)
+
         for user in auto_apply_users:
-            # Get highly matched jobs (score > 0.8) that haven't been applied to
-            high_match_jobs = db.query(Job).outerjoin(JobApplication).filter(
-                JobApplication.user_id.is_(None),  # Not applied to
-                Job.match_score > 0.8,  # High match score
+            # Get this user's highly matched jobs (score >= 80) that they haven't applied to
+            applied_job_ids = db.query(JobApplication.job_id).filter(JobApplication.user_id == user.id)
+            high_match_query = db.query(Job).join(JobMatchScore).filter(
+                JobMatchScore.user_id == user.id,
+                JobMatchScore.match_score >= 80,  # High match score
+                ~Job.id.in_(applied_job_ids),  # Not applied to
                 Job.scraped_at >= datetime.utcnow() - timedelta(days=7)  # Recent jobs
-            ).limit(5).all()  # Limit to 5 applications per run
+            )
+
+            # Must-have keywords that are known skills narrow candidates through the skill index
+            settings = db.query(AutomationSetting).filter(AutomationSetting.user_id == user.id).first()
+            required_skills = [keyword for keyword in (settings.keywords_include or []) if taxonomy.resolve(keyword)] if settings else []
+            if required_skills:
+                candidate_ids = skill_index.query(all_of=required_skills).tolist()
+                high_match_query = high_match_query.filter(Job.id.in_(candidate_ids))
+
+            high_match_jobs = high_match_query.order_by(JobMatchScore.match_score.desc()).limit(5).all()  # Limit to 5 applications per run
 
             for job in high_match_jobs:
                 # Check daily application limit
@@ -142,62 +161,6 @@ def auto_apply_to_matched_jobs(self):
         logger.error(f"Auto-apply task failed: {str(e)}")
         raise self.retry(exc=e, countdown=300, max_retries=3)
 
-@celery_app.task(bind=True, name='advanced_scheduler.update_job_match_scores')
-def update_job_match_scores(self):
-    """Update match scores for recent jobs based on user profiles"""
-    try:
-        from jd_matcher import match_jd
-
-        db = SessionLocal()
-
-        # Get recent jobs without match scores
-        recent_jobs = db.query(Job).filter(
-            Job.match_score.is_(None),
-            Job.scraped_at >= datetime.utcnow() - timedelta(days=3)
-        ).limit(100).all()
-
-        updated_count = 0
-
-        for job in recent_jobs:
-            # Get all users to calculate match scores
-            users = db.query(User).all()
-
-            for user in users:
-                if user.enhanced_profile:
-                    # Create resume text from profile
-                    resume_text = f"""
-                    {user.enhanced_profile.first_name} {user.enhanced_profile.last_name}
-                    Experience: {user.enhanced_profile.years_experience} years
-                    Skills: {', '.join(user.enhanced_profile.technical_skills or [])}
-                    Education: {user.enhanced_profile.highest_education}
-                    Current Title: {user.enhanced_profile.current_title}
-                    """
-
-                    # Calculate match score
-                    try:
-                        match_score = match_jd(resume_text, job.description)
-
-                        # Store match score (you might want a separate table for this)
-                        if match_score > 0.5:  # Only store good matches
-                            job.match_score = match_score
-                            updated_count += 1
-
-                    except Exception as e:
-                        logger.warning(f"Failed to calculate match for job {job.id}: {e}")
-
-        db.commit()
-        db.close()
-
-        return {
-            'status': 'completed',
-            'updated_count': updated_count,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-
-    except Exception as e:
-        logger.error(f"Match score update failed: {str(e)}")
-        raise self.retry(exc=e, countdown=300, max_retries=3)
-
 @celery_app.task(bind=True, name='advanced_scheduler.generate_weekly_analytics')
 def generate_weekly_analytics(self):
     """Generate comprehensive weekly analytics report"""
@@ -292,7 +255,6 @@ job_scheduler = JobScheduler()
 __all__ = [
     'job_scheduler',
     'auto_apply_to_matched_jobs',
-    'update_job_match_scores',
     'generate_weekly_analytics',
     'smart_job_search'
 ]
@@ -6,23 +6,13 @@ import PyPDF2
 import openai
 import os
 
+from skill_taxonomy import skill_taxonomy
+
 class AIResumeAnalyzer:
     def __init__(self):
         # Set OpenAI API key (in production, use environment variable)
         openai.api_key = os.getenv('OPENAI_API_KEY', 'your-openai-key-here')
 
-        # Define skill categories for better analysis
-        self.skill_categories = {
-            'programming': ['Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust', 'Ruby', 'PHP', 'Swift', 'Kotlin'],
-            'web_frontend': ['React', 'Vue.js', 'Angular', 'HTML', 'CSS', 'SASS', 'LESS', 'Bootstrap', 'Tailwind'],
-            'web_backend': ['Node.js', 'Express', 'Django', 'Flask', 'Spring Boot', 'ASP.NET', 'Laravel', 'Rails'],
-            'databases': ['MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server', 'Elasticsearch'],
-            'cloud': ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Jenkins', 'CI/CD'],
-            'mobile': ['React Native', 'Flutter', 'iOS', 'Android', 'Xamarin'],
-            'data_science': ['Pandas', 'NumPy', 'Scikit-learn', 'TensorFlow', 'PyTorch', 'R', 'Tableau', 'Power BI'],
-            'devops': ['Git', 'GitHub', 'GitLab', 'JIRA', 'Agile', 'Scrum', 'Linux', 'Bash']
-        }
-
     def parse_resume(self, file_path: str) -> Dict[str, Any]:
         """Parse resume and extract comprehensive information"""
         try:
@@ -159,13 +149,7 @@ class AIResumeAnalyzer:
 
     def _extract_skills(self, text: str) -> List[str]:
         """Extract technical skills"""
-        skills = []
-        text_lower = text.lower()
-
-        for category, skill_list in self.skill_categories.items():
-            for skill in skill_list:
-                if skill.lower() in text_lower:
-                    skills.append(skill)
+        skills = skill_taxonomy.current().find_skill_names(text)
 
         # Look for additional skills in skills section
         skills_section = re.search(r'skills?\s*:?\s*(.*?)(?=\n\s*\n|\n[A-Z]|\Z)', text, re.IGNORECASE | re.DOTALL)
@@ -247,15 +231,15 @@ class AIResumeAnalyzer:
 
     def _categorize_skills(self, skills: List[str]) -> Dict[str, List[str]]:
         """Categorize skills by type"""
-        categorized = {category: [] for category in self.skill_categories.keys()}
+        taxonomy = skill_taxonomy.current()
+        categorized = {}
 
         for skill in skills:
-            for category, skill_list in self.skill_categories.items():
-                if skill in skill_list:
-                    categorized[category].append(skill)
-                    break
+            category = taxonomy.category_of(skill)
+            if category:
+                categorized.setdefault(category, []).append(skill)
 
-        return {k: v for k, v in categorized.items() if v}  # Remove empty categories
+        return categorized
 
     def _determine_experience_level(self, text: str) -> str:
         """Determine experience level"""
@@ -0,0 +1,45 @@
+"""Add job_skills table for skills extracted at ingest time
+
+Revision ID: 003_job_skills
+Revises: 002_enhanced_profile
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_job_skills'
+down_revision = '002_enhanced_profile'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Taxonomy version the stored skills were extracted with
+    op.add_column('jobs', sa.Column('skills_taxonomy_version', sa.String(), nullable=True))
+    op.create_index(op.f('ix_jobs_skills_taxonomy_version'), 'jobs', ['skills_taxonomy_version'], unique=False)
+
+    # Create job_skills table
+    op.create_table('job_skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('skill', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('importance', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_skills_id'), 'job_skills', ['id'], unique=False)
+    op.create_index(op.f('ix_job_skills_job_id'), 'job_skills', ['job_id'], unique=False)
+    op.create_index(op.f('ix_job_skills_skill'), 'job_skills', ['skill'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_job_skills_skill'), table_name='job_skills')
+    op.drop_index(op.f('ix_job_skills_job_id'), table_name='job_skills')
+    op.drop_index(op.f('ix_job_skills_id'), table_name='job_skills')
+    op.drop_table('job_skills')
+    op.drop_index(op.f('ix_jobs_skills_taxonomy_version'), table_name='jobs')
+    op.drop_column('jobs', 'skills_taxonomy_version')
@@ -0,0 +1,45 @@
+"""Add job_match_scores table for per-user background match scores
+
+Revision ID: 004_job_match_scores
+Revises: 003_job_skills
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_job_match_scores'
+down_revision = '003_job_skills'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create job_match_scores table
+    op.create_table('job_match_scores',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('match_score', sa.Float(), nullable=False),
+        sa.Column('skill_score', sa.Float(), nullable=False),
+        sa.Column('semantic_score', sa.Float(), nullable=True),
+        sa.Column('resume_hash', sa.String(), nullable=False),
+        sa.Column('scored_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'job_id', name='uq_job_match_scores_user_job')
+    )
+    op.create_index(op.f('ix_job_match_scores_id'), 'job_match_scores', ['id'], unique=False)
+    op.create_index(op.f('ix_job_match_scores_user_id'), 'job_match_scores', ['user_id'], unique=False)
+    op.create_index(op.f('ix_job_match_scores_job_id'), 'job_match_scores', ['job_id'], unique=False)
+    op.create_index(op.f('ix_job_match_scores_match_score'), 'job_match_scores', ['match_score'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_job_match_scores_match_score'), table_name='job_match_scores')
+    op.drop_index(op.f('ix_job_match_scores_job_id'), table_name='job_match_scores')
+    op.drop_index(op.f('ix_job_match_scores_user_id'), table_name='job_match_scores')
+    op.drop_index(op.f('ix_job_match_scores_id'), table_name='job_match_scores')
+    op.drop_table('job_match_scores')
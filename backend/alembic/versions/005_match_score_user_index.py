@@ -0,0 +1,23 @@
+"""Add (user_id, match_score) index for per-user top-K recommendation reads
+
+Revision ID: 005_match_score_user_index
+Revises: 004_job_match_scores
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_match_score_user_index'
+down_revision = '004_job_match_scores'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_job_match_scores_user_score', 'job_match_scores', ['user_id', 'match_score'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_match_scores_user_score', table_name='job_match_scores')
@@ -0,0 +1,42 @@
+"""Add cover_letters table for pre-generated cover letters
+
+Revision ID: 006_cover_letters
+Revises: 005_match_score_user_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_cover_letters'
+down_revision = '005_match_score_user_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create cover_letters table
+    op.create_table('cover_letters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('resume_hash', sa.String(), nullable=False),
+        sa.Column('template_version', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resume_hash', 'job_id', 'template_version', name='uq_cover_letters_resume_job_version')
+    )
+    op.create_index(op.f('ix_cover_letters_id'), 'cover_letters', ['id'], unique=False)
+    op.create_index(op.f('ix_cover_letters_user_id'), 'cover_letters', ['user_id'], unique=False)
+    op.create_index(op.f('ix_cover_letters_job_id'), 'cover_letters', ['job_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_cover_letters_job_id'), table_name='cover_letters')
+    op.drop_index(op.f('ix_cover_letters_user_id'), table_name='cover_letters')
+    op.drop_index(op.f('ix_cover_letters_id'), table_name='cover_letters')
+    op.drop_table('cover_letters')
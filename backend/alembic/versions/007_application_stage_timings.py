@@ -0,0 +1,23 @@
+"""Add stage_timings to job_applications
+
+Revision ID: 007_application_stage_timings
+Revises: 006_cover_letters
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_application_stage_timings'
+down_revision = '006_cover_letters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('job_applications', sa.Column('stage_timings', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('job_applications', 'stage_timings')
@@ -0,0 +1,56 @@
+"""Add job_search_documents and the full-text job search index
+
+Revision ID: 008_job_search_index
+Revises: 007_application_stage_timings
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008_job_search_index'
+down_revision = '007_application_stage_timings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create job_search_documents table (rows are filled by job_search_index.sync)
+    op.create_table('job_search_documents',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(), nullable=True),
+        sa.Column('job_type', sa.String(), nullable=True),
+        sa.Column('experience_level', sa.String(), nullable=True),
+        sa.Column('remote', sa.Boolean(), nullable=False),
+        sa.Column('salary_min', sa.Integer(), nullable=True),
+        sa.Column('salary_max', sa.Integer(), nullable=True),
+        sa.Column('posted_date', sa.DateTime(), nullable=True),
+        sa.Column('indexed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(op.f('ix_job_search_documents_platform'), 'job_search_documents', ['platform'], unique=False)
+    op.create_index('ix_job_search_documents_posted', 'job_search_documents', ['posted_date', 'job_id'], unique=False)
+    op.create_index('ix_job_search_documents_type_posted', 'job_search_documents', ['job_type', 'posted_date'], unique=False)
+    op.create_index('ix_job_search_documents_level_posted', 'job_search_documents', ['experience_level', 'posted_date'], unique=False)
+    op.create_index('ix_job_search_documents_remote_posted', 'job_search_documents', ['remote', 'posted_date'], unique=False)
+    op.create_index('ix_job_search_documents_salary', 'job_search_documents', ['salary_max', 'salary_min'], unique=False)
+
+    # Full-text index: FTS5 table on SQLite, tsvector + GIN on PostgreSQL
+    if op.get_bind().dialect.name == 'postgresql':
+        op.add_column('job_search_documents', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.create_index('ix_job_search_documents_search_vector', 'job_search_documents', ['search_vector'],
+                        unique=False, postgresql_using='gin')
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_search_fts "
+            "USING fts5(title, company, location, description, tokenize='porter unicode61')"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("DROP TABLE IF EXISTS job_search_fts")
+    op.drop_table('job_search_documents')
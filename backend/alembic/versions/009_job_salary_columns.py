@@ -0,0 +1,38 @@
+"""Add normalized salary columns to jobs
+
+Revision ID: 009_job_salary_columns
+Revises: 008_job_search_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009_job_salary_columns'
+down_revision = '008_job_search_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are filled in batches by tasks.scraping_tasks.normalize_job_salaries
+    op.add_column('jobs', sa.Column('salary_min', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_max', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_currency', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_period', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_parser_version', sa.String(), nullable=True))
+    op.create_index(op.f('ix_jobs_salary_parser_version'), 'jobs', ['salary_parser_version'], unique=False)
+    op.create_index('ix_jobs_salary', 'jobs', ['salary_max', 'salary_min'], unique=False)
+    op.create_index('ix_jobs_currency_salary', 'jobs', ['salary_currency', 'salary_max', 'salary_min'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_jobs_currency_salary', table_name='jobs')
+    op.drop_index('ix_jobs_salary', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_salary_parser_version'), table_name='jobs')
+    op.drop_column('jobs', 'salary_parser_version')
+    op.drop_column('jobs', 'salary_period')
+    op.drop_column('jobs', 'salary_currency')
+    op.drop_column('jobs', 'salary_max')
+    op.drop_column('jobs', 'salary_min')
@@ -0,0 +1,61 @@
+"""Add normalized location columns to jobs and job_search_documents
+
+Revision ID: 010_job_locations
+Revises: 009_job_salary_columns
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_job_locations'
+down_revision = '009_job_salary_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are filled, and their search documents re-indexed, in batches
+    # by tasks.scraping_tasks.normalize_job_locations
+    op.add_column('jobs', sa.Column('location_city', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('location_region', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('location_country', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('remote', sa.Boolean(), nullable=True))
+    op.add_column('jobs', sa.Column('hybrid', sa.Boolean(), nullable=True))
+    op.add_column('jobs', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('location_parser_version', sa.String(), nullable=True))
+    op.create_index(op.f('ix_jobs_location_parser_version'), 'jobs', ['location_parser_version'], unique=False)
+    op.create_index('ix_jobs_location', 'jobs', ['location_country', 'location_region', 'location_city'], unique=False)
+    op.create_index('ix_jobs_geo', 'jobs', ['latitude', 'longitude'], unique=False)
+
+    op.add_column('job_search_documents', sa.Column('hybrid', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('job_search_documents', sa.Column('country', sa.String(), nullable=True))
+    op.add_column('job_search_documents', sa.Column('region', sa.String(), nullable=True))
+    op.add_column('job_search_documents', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('job_search_documents', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_job_search_documents_region_posted', 'job_search_documents', ['country', 'region', 'posted_date'], unique=False)
+    op.create_index('ix_job_search_documents_geo', 'job_search_documents', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_search_documents_geo', table_name='job_search_documents')
+    op.drop_index('ix_job_search_documents_region_posted', table_name='job_search_documents')
+    op.drop_column('job_search_documents', 'longitude')
+    op.drop_column('job_search_documents', 'latitude')
+    op.drop_column('job_search_documents', 'region')
+    op.drop_column('job_search_documents', 'country')
+    op.drop_column('job_search_documents', 'hybrid')
+
+    op.drop_index('ix_jobs_geo', table_name='jobs')
+    op.drop_index('ix_jobs_location', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_location_parser_version'), table_name='jobs')
+    op.drop_column('jobs', 'location_parser_version')
+    op.drop_column('jobs', 'longitude')
+    op.drop_column('jobs', 'latitude')
+    op.drop_column('jobs', 'hybrid')
+    op.drop_column('jobs', 'remote')
+    op.drop_column('jobs', 'location_country')
+    op.drop_column('jobs', 'location_region')
+    op.drop_column('jobs', 'location_city')
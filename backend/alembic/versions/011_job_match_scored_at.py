@@ -0,0 +1,30 @@
+"""Record when match scoring was dispatched for a job
+
+Revision ID: 011_job_match_scored_at
+Revises: 010_job_locations
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_job_match_scored_at'
+down_revision = '010_job_locations'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('match_scored_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_jobs_match_scored_at'), 'jobs', ['match_scored_at'], unique=False)
+    # Jobs that already have scores were scored; the sweep only needs the rest
+    op.execute(
+        "UPDATE jobs SET match_scored_at = scraped_at "
+        "WHERE EXISTS (SELECT 1 FROM job_match_scores WHERE job_match_scores.job_id = jobs.id)"
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_jobs_match_scored_at'), table_name='jobs')
+    op.drop_column('jobs', 'match_scored_at')
@@ -0,0 +1,36 @@
+"""Filter search salaries by currency; drop the unused jobs salary indexes
+
+Revision ID: 012_search_salary_currency
+Revises: 011_job_match_scored_at
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_search_salary_currency'
+down_revision = '011_job_match_scored_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Salary filters run on job_search_documents; these were never used
+    op.drop_index('ix_jobs_currency_salary', table_name='jobs')
+    op.drop_index('ix_jobs_salary', table_name='jobs')
+
+    op.add_column('job_search_documents', sa.Column('salary_currency', sa.String(), nullable=True))
+    op.create_index('ix_job_search_documents_currency_salary', 'job_search_documents',
+                    ['salary_currency', 'salary_max', 'salary_min'], unique=False)
+    op.execute(
+        "UPDATE job_search_documents SET salary_currency = "
+        "(SELECT salary_currency FROM jobs WHERE jobs.id = job_search_documents.job_id)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_job_search_documents_currency_salary', table_name='job_search_documents')
+    op.drop_column('job_search_documents', 'salary_currency')
+    op.create_index('ix_jobs_salary', 'jobs', ['salary_max', 'salary_min'], unique=False)
+    op.create_index('ix_jobs_currency_salary', 'jobs', ['salary_currency', 'salary_max', 'salary_min'], unique=False)
@@ -0,0 +1,171 @@
+"""
+Apply Pipeline - One job application with independent stages overlapped
+Loading the profile is quick and runs first. Then four stages run
+concurrently: launching the browser and loading the job page, the cover
+letter (stored, or generated on the shared LLM client), materializing the
+resume file, and resolving questionnaire answers. The form is filled and
+submitted once all of them are done, so wall-clock time is close to the
+slowest stage instead of the sum. Per-stage timings are returned for the
+JobApplication row.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from auto_applier import AutoApplier
+from cover_letter_generator import generate_cover_letter_async
+from cover_letter_store import get_letter, save_letter
+from db import SessionLocal
+from llm_client import BACKGROUND
+from models import Job, QuestionnaireAnswer, Resume, User
+from resume_storage import download_resume_from_s3
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ApplyOutcome:
+    success: bool
+    result: Dict[str, Any]
+    cover_letter: str = ''
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def error(self) -> Optional[str]:
+        return None if self.success else self.result.get('message') or self.result.get('error')
+
+class StageTimer:
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    async def run(self, name: str, awaitable: Awaitable) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 3)
+
+    def finish(self) -> Dict[str, float]:
+        self.timings['total'] = round(time.perf_counter() - self._start, 3)
+        return self.timings
+
+def _primary_resume(session: Session, user_id: int) -> Optional[Resume]:
+    resume = session.query(Resume).filter(Resume.user_id == user_id, Resume.is_primary == True).first()
+    if resume is None:
+        resume = session.query(Resume).filter(Resume.user_id == user_id).order_by(Resume.uploaded_at.desc()).first()
+    return resume
+
+def _questionnaire_answers(user_id: int) -> Dict[str, str]:
+    # Runs in a worker thread, so it uses its own session
+    session = SessionLocal()
+    try:
+        return {
+            answer.question_key: answer.answer
+            for answer in session.query(QuestionnaireAnswer).filter(QuestionnaireAnswer.user_id == user_id)
+        }
+    finally:
+        session.close()
+
+def _materialize_resume(resume_path: Optional[str], s3_url: Optional[str], filename: Optional[str]) -> str:
+    if resume_path:
+        return resume_path
+    if s3_url and filename:
+        return download_resume_from_s3(s3_url, filename)
+    return ''
+
+async def run_application(session: Session, user_id: int, job_id: int,
+                          application_data: Optional[Dict] = None, headless: bool = True,
+                          priority: int = BACKGROUND) -> ApplyOutcome:
+    """
+    Apply to a stored job for a user. ``application_data`` may carry a
+    ready ``cover_letter``, a local ``resume_path`` and extra profile fields.
+    """
+    application_data = application_data or {}
+    timer = StageTimer()
+
+    # Stage 1: profile (fast, needed by every other stage)
+    start = time.perf_counter()
+    user = session.query(User).filter(User.id == user_id).first()
+    job = session.query(Job).filter(Job.id == job_id).first()
+    if not user or not job:
+        raise ValueError(f"User {user_id} or Job {job_id} not found")
+    resume = _primary_resume(session, user_id)
+    resume_text = resume.parsed_data.get('text', '') if resume and resume.parsed_data else ''
+    job_info = {
+        'id': job.id, 'title': job.title, 'company': job.company,
+        'url': job.url, 'platform': job.platform or '', 'description': job.description or ''
+    }
+    user_profile = {
+        'full_name': f"{user.first_name or ''} {user.last_name or ''}".strip(),
+        'firstName': user.first_name or '',
+        'lastName': user.last_name or '',
+        'email': user.email,
+        'phone': user.phone or '',
+        'linkedin_url': user.linkedin_url or '',
+        'experience_years': user.experience_years or 0,
+        'skills': application_data.get('skills', []),
+    }
+    stored_letter = application_data.get('cover_letter') or (get_letter(session, resume_text, job.id) if resume_text else None)
+    timer.timings['profile'] = round(time.perf_counter() - start, 3)
+
+    applier = AutoApplier(user_profile)
+
+    async def cover_letter_stage() -> str:
+        if stored_letter:
+            return stored_letter
+        if not resume_text:
+            return ''
+        return await generate_cover_letter_async(
+            resume_text, job_info['description'], job.company, job.title, priority=priority
+        )
+
+    # Stage 2: everything that doesn't depend on anything else, at once
+    browser, cover_letter, resume_path, answers = await asyncio.gather(
+        timer.run('browser', asyncio.to_thread(applier.open_job_page, job_info, headless)),
+        timer.run('cover_letter', cover_letter_stage()),
+        timer.run('resume_file', asyncio.to_thread(
+            _materialize_resume, application_data.get('resume_path'),
+            resume.s3_url if resume else None, resume.filename if resume else None
+        )),
+        timer.run('questionnaire', asyncio.to_thread(_questionnaire_answers, user_id)),
+        return_exceptions=True
+    )
+
+    try:
+        if isinstance(cover_letter, BaseException):
+            # An application without a letter beats no application
+            logger.warning(f"Cover letter failed for user {user_id}, job {job_id}: {cover_letter}")
+            cover_letter = ''
+        elif cover_letter and not stored_letter:
+            # Kept even if the browser stage failed, so a retry doesn't generate it again
+            save_letter(session, user_id, job.id, resume_text, cover_letter)
+        if isinstance(browser, BaseException):
+            return ApplyOutcome(False, {'status': 'error', 'message': f"Could not open job page: {browser}"},
+                                cover_letter=cover_letter, stage_timings=timer.finish())
+        for name, value in (('resume_file', resume_path), ('questionnaire', answers)):
+            if isinstance(value, BaseException):
+                logger.warning(f"Apply stage {name} failed for user {user_id}, job {job_id}: {value}")
+        applier.user_profile['resume_path'] = resume_path if isinstance(resume_path, str) else ''
+        applier.user_profile['questionnaire_answers'] = answers if isinstance(answers, dict) else {}
+
+        # Stage 3: fill and submit on the loaded page
+        result = await timer.run('submit', applier.complete_application(job_info, cover_letter))
+    finally:
+        await asyncio.to_thread(applier.cleanup)
+
+    return ApplyOutcome(
+        success=result.get('status') == 'success',
+        result=result,
+        cover_letter=cover_letter,
+        stage_timings=timer.finish()
+    )
+
+def application_record_data(outcome: ApplyOutcome, application_data: Optional[Dict] = None) -> str:
+    """JSON for JobApplication.application_data"""
+    return json.dumps(dict(application_data or {}, cover_letter=outcome.cover_letter, result=outcome.result))
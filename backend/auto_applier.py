@@ -63,22 +63,39 @@ class AutoApplier:
         """
         Main method to automatically apply to a job
         """
-        if not self.driver:
-            if not self.setup_browser():
-                return {"status": "error", "message": "Failed to setup browser"}
-
         try:
-            platform = job_info.get('platform', '').lower()
-            job_url = job_info.get('url', '')
-
-            if not job_url:
+            if not job_info.get('url', ''):
                 return {"status": "error", "message": "Job URL not provided"}
 
-            logger.info(f"Starting application to {job_info.get('title')} at {job_info.get('company')}")
+            # Launching the browser and loading the page block; keep them off the event loop
+            await asyncio.to_thread(self.open_job_page, job_info)
+            return await self.complete_application(job_info, cover_letter)
 
-            # Navigate to job page
-            self.driver.get(job_url)
-            await asyncio.sleep(2)  # Allow page to load
+        except Exception as e:
+            logger.error(f"Error during job application: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def open_job_page(self, job_info: Dict, headless: bool = True):
+        """
+        Launch the browser if needed and load the job page. Blocking; callers
+        run it in a thread (the apply pipeline, while the cover letter is generated).
+        """
+        job_url = job_info.get('url', '')
+        if not job_url:
+            raise ValueError("Job URL not provided")
+        if not self.driver and not self.setup_browser(headless=headless):
+            raise RuntimeError("Failed to setup browser")
+
+        logger.info(f"Starting application to {job_info.get('title')} at {job_info.get('company')}")
+
+        # Navigate to job page
+        self.driver.get(job_url)
+        time.sleep(2)  # Allow page to load
+
+    async def complete_application(self, job_info: Dict, cover_letter: str = None) -> Dict:
+        """Fill and submit the application on the already loaded job page"""
+        try:
+            platform = job_info.get('platform', '').lower()
 
             # Platform-specific application logic
             if platform == 'indeed':
@@ -294,6 +311,17 @@ class AutoApplier:
                         logger.debug(f"Could not fill field {selector}: {e}")
                         continue
 
+            # Attach the resume file when one was materialized for this application
+            resume_path = self.user_profile.get('resume_path')
+            if resume_path:
+                for element in self.driver.find_elements(By.CSS_SELECTOR, 'input[type="file"]'):
+                    try:
+                        element.send_keys(resume_path)
+                        filled_any = True
+                        break
+                    except Exception as e:
+                        logger.debug(f"Could not attach resume: {e}")
+
             # Try to submit the form
             if filled_any:
                 await self._try_submit_form()
@@ -393,20 +421,26 @@ async def apply_to_multiple_jobs(jobs: List[Dict], user_profile: Dict, cover_let
     Apply to multiple jobs in batch with proper error handling
     """
     results = []
+    letter_tasks = []
     applier = AutoApplier(user_profile)
 
     try:
         applier.setup_browser(headless=True)
 
-        for job in jobs:
+        # Start every cover letter up front; they generate concurrently while earlier applications run
+        letter_tasks = [
+            asyncio.ensure_future(cover_letter_generator(
+                user_profile.get('resume_text', ''),
+                job.get('description', ''),
+                job.get('company', ''),
+                job.get('title', '')
+            ))
+            for job in jobs
+        ]
+
+        for job, letter_task in zip(jobs, letter_tasks):
             try:
-                # Generate custom cover letter for each job
-                cover_letter = await cover_letter_generator(
-                    user_profile.get('resume_text', ''),
-                    job.get('description', ''),
-                    job.get('company', ''),
-                    job.get('title', '')
-                )
+                cover_letter = await letter_task
 
                 # Apply to the job
                 result = await applier.apply_to_job(job, cover_letter)
@@ -425,6 +459,8 @@ async def apply_to_multiple_jobs(jobs: List[Dict], user_profile: Dict, cover_let
                 continue
 
     finally:
+        for letter_task in letter_tasks:
+            letter_task.cancel()
         applier.cleanup()
 
     return results
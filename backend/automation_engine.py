@@ -12,6 +12,7 @@ from models import User, JobPortalCredential, AutomationSetting, QuestionnaireAn
 from db import get_db_session
 from advanced_job_scraper import AdvancedJobScraper
 from auto_applier import AutoApplier
+from recommendation_index import recommendation_index
 
 logger = logging.getLogger(__name__)
 
@@ -120,7 +121,7 @@ class AutomationEngine:
             )
 
             # Filter jobs based on user preferences
-            suitable_jobs = self.filter_suitable_jobs(jobs, user)
+            suitable_jobs = self.filter_suitable_jobs(jobs, user, db)
 
             # Apply to jobs
             for job in suitable_jobs[:5]:  # Limit to 5 applications per portal per cycle
@@ -129,11 +130,18 @@ class AutomationEngine:
         except Exception as e:
             logger.error(f"Error processing {portal.platform} for user {user.id}: {e}")
 
-    def filter_suitable_jobs(self, jobs: List[Dict], user: User) -> List[Dict]:
+    def filter_suitable_jobs(self, jobs: List[Dict], user: User, db: Session) -> List[Dict]:
         """Filter jobs based on user preferences and criteria"""
-        # This would implement sophisticated filtering logic
-        # For now, return first few jobs
-        return jobs[:10]
+        # Jobs in the user's recommendation index go first, best match first
+        recommended = recommendation_index.scores_by_url(db, user.id)
+        ranked = sorted(
+            (job for job in jobs if job.get('url') in recommended),
+            key=lambda job: recommended[job['url']],
+            reverse=True
+        )
+        # Listings not scored yet keep their search order after them
+        ranked.extend(job for job in jobs if job.get('url') not in recommended)
+        return ranked[:10]
 
     async def apply_to_job(self, user: User, job: Dict, portal: JobPortalCredential, db: Session):
         """Apply to a specific job"""
@@ -0,0 +1,97 @@
+"""
+Benchmark: columnar job filters vs. the list-comprehension filter chain
+Run from the backend directory:  python benchmarks/bench_job_filters.py
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_columns import JobColumns, cached_columns, select_jobs
+
+
+TITLES = ["Software Engineer", "Senior Software Engineer", "Junior Data Analyst", "Director of Engineering",
+          "Staff ML Engineer", "Product Designer", "Associate Product Manager", "Principal Architect"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Remote", "Remote - US", "Austin, TX", "London, UK"]
+
+
+def synthetic_job(rng: random.Random, i: int) -> dict:
+    """A live-search-shaped job dict (the fields the filters read, plus a real description)"""
+    title = rng.choice(TITLES)
+    salary_min = rng.randint(60_000, 200_000)
+    return {
+        "id": f"job_{i}",
+        "title": title,
+        "location": rng.choice(LOCATIONS),
+        "description": f"We are seeking a talented {title} to join our innovative team. " * 4,
+        "salary_range_min": salary_min,
+        "salary_range_max": salary_min + rng.randint(20_000, 80_000),
+        "posted_date": (datetime.now() - timedelta(days=rng.randint(0, 45))).isoformat(),
+        "job_type": rng.choice(["full-time", "full-time", "part-time", "contract"]),
+        "portal": rng.choice(["linkedin", "indeed", "glassdoor"]),
+        "remote_ok": rng.random() < 0.3,
+    }
+
+
+def filter_chain(jobs, job_type, level_keywords, remote_ok):
+    """The per-filter list comprehensions search_jobs used to run"""
+    filtered = [job for job in jobs if job.get('job_type', '').lower() == job_type.lower()]
+    filtered = [
+        job for job in filtered
+        if any(keyword in job.get('title', '').lower() or keyword in job.get('description', '').lower()
+               for keyword in level_keywords)
+    ]
+    if remote_ok:
+        filtered = [
+            job for job in filtered
+            if job.get('remote_ok', False) or 'remote' in job.get('location', '').lower()
+            or 'remote' in job.get('title', '').lower()
+        ]
+    return filtered
+
+
+def main():
+    rng = random.Random(5)
+    filters = dict(job_type="full-time", experience_level="senior-level", remote_only=True)
+
+    for job_count in (1_000, 10_000, 50_000):
+        jobs = [synthetic_job(rng, i) for i in range(job_count)]
+
+        start = time.perf_counter()
+        filter_chain(jobs, "full-time", ['senior', 'lead', 'principal', 'director', 'manager'], True)
+        chain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columns = JobColumns.from_jobs(jobs)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for sort_by in ("date", "salary"):
+            columns.order(columns.mask(**filters), sort_by)
+        query = (time.perf_counter() - start) / 2
+
+        start = time.perf_counter()
+        columns.order(columns.mask(**filters), "salary", top_k=50)
+        top = time.perf_counter() - start
+
+        start = time.perf_counter()
+        select_jobs(jobs, sort_by="date", **filters)
+        end_to_end = time.perf_counter() - start
+
+        # Repeat searches over a cached result set reuse its columns
+        cached_columns(jobs)
+        start = time.perf_counter()
+        select_jobs(jobs, sort_by="date", columns=cached_columns(jobs), **filters)
+        repeat = time.perf_counter() - start
+
+        print(f"{job_count:>6} jobs: filter chain (unsorted) {chain * 1000:7.1f} ms  columns build {build * 1000:7.1f} ms  "
+              f"filter+sort {query * 1000:6.2f} ms  top-50 {top * 1000:6.2f} ms  select_jobs {end_to_end * 1000:7.1f} ms  "
+              f"cached {repeat * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
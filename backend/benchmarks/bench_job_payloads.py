@@ -0,0 +1,80 @@
+"""
+Benchmark: serializing a 500-job search page
+FastAPI's default path (jsonable_encoder + json) vs. orjson vs. splicing
+cached per-job payloads, plus gzip/brotli compression of the body.
+Run from the backend directory:  python benchmarks/bench_job_payloads.py
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+import brotli
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_json import dumps, json_array
+
+
+def search_result(i: int) -> dict:
+    """A stored-job search result (job_search_index.job_result shape)"""
+    return {
+        "id": i,
+        "title": f"Senior Software Engineer {i}",
+        "company": f"TechCorp {i % 100}",
+        "location": "San Francisco, CA",
+        "description": "We are seeking a talented engineer to join our innovative team. " * 12,
+        "requirements": "5+ years of experience with Python, Kubernetes and PostgreSQL",
+        "salary_range": "$150,000 - $210,000",
+        "salary_range_min": 150000,
+        "salary_range_max": 210000,
+        "posted_date": (datetime(2024, 5, 1) - timedelta(days=i % 30)).isoformat(),
+        "job_type": "full-time",
+        "experience_level": "senior-level",
+        "portal": "linkedin",
+        "portal_display_name": "Linkedin",
+        "url": f"https://www.linkedin.com/jobs/view/{3000000000 + i}",
+        "apply_url": f"https://www.linkedin.com/jobs/view/{3000000000 + i}",
+        "portal_url": f"https://www.linkedin.com/jobs/view/{3000000000 + i}",
+        "remote_ok": i % 3 == 0,
+        "skills_required": ["python", "kubernetes", "postgresql", "aws", "docker"],
+    }
+
+
+def timed(func, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    jobs = [search_result(i) for i in range(500)]
+    payloads = [dumps(job) for job in jobs]
+
+    def default_path():
+        return json.dumps(jsonable_encoder({"jobs": jobs, "total": len(jobs)}), ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    default_ms, body = timed(default_path)
+    orjson_ms, _ = timed(lambda: dumps({"jobs": jobs, "total": len(jobs)}))
+    spliced_ms, spliced = timed(lambda: dumps({"jobs": json_array(payloads), "total": len(jobs)}))
+    assert json.loads(spliced) == json.loads(body)
+
+    gzip_ms, gzipped = timed(lambda: gzip.compress(spliced, compresslevel=6))
+    brotli_ms, brotlied = timed(lambda: brotli.compress(spliced, quality=4))
+
+    print(f"500 jobs, {len(body) / 1024:.0f} KiB")
+    print(f"  jsonable_encoder + json {default_ms:7.2f} ms")
+    print(f"  orjson                  {orjson_ms:7.2f} ms")
+    print(f"  cached payloads spliced {spliced_ms:7.2f} ms")
+    print(f"  gzip -6                 {gzip_ms:7.2f} ms  {len(gzipped) / 1024:6.1f} KiB")
+    print(f"  brotli -q4              {brotli_ms:7.2f} ms  {len(brotlied) / 1024:6.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
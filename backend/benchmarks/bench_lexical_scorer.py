@@ -0,0 +1,53 @@
+"""
+Benchmark: offline lexical relevance scoring latency
+Run from the backend directory:  python benchmarks/bench_lexical_scorer.py
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexical_scorer import LexicalScorer
+from skill_taxonomy import skill_taxonomy
+
+
+def build_document(rng: random.Random, aliases, words: int) -> str:
+    """Synthetic job description / resume mixing filler text with skill mentions"""
+    filler = ("we are looking for an engineer to join our team and build reliable systems "
+              "you will collaborate with product and design on customer facing features "
+              "experience mentoring shipping scaling services ownership communication").split()
+    return ' '.join(rng.choice(aliases) if rng.random() < 0.1 else rng.choice(filler) for _ in range(words))
+
+
+def main():
+    rng = random.Random(11)
+    aliases = [alias for skill in skill_taxonomy.current().skills for alias in skill.aliases]
+    resume = build_document(rng, aliases, 600)
+
+    for job_count in (1_000, 10_000):
+        jobs = [build_document(rng, aliases, 400) for _ in range(job_count)]
+
+        for method in ('bm25', 'tfidf'):
+            scorer = LexicalScorer(method=method)
+            start = time.perf_counter()
+            scorer.fit(jobs)
+            fit_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for job in jobs[:200]:
+                scorer.score(resume, job)
+            pair_time = (time.perf_counter() - start) / 200
+
+            start = time.perf_counter()
+            scorer.score_many(resume, jobs)
+            many_time = time.perf_counter() - start
+
+            print(f"{job_count:>6} jobs {method:>5}: fit {fit_time * 1000:8.1f} ms  "
+                  f"per pair {pair_time * 1000:6.2f} ms  all jobs {many_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Cache Utilities - Building blocks for the in-process and shared caches
+Provides a thread-safe LRU with optional TTL, Redis and SQLite string
+stores that can sit behind it as a shared tier, and single-flight
+deduplication of concurrent identical computations (threads or coroutines).
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional per-entry TTL (seconds). With
+    ``max_size``, entries are also evicted once their total ``sizeof`` exceeds it
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None,
+                 max_size: Optional[int] = None, sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof or (lambda value: 1)
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = self.sizeof(value) if self.max_size is not None else 0
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, expires_at, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_size is not None and self.size > self.max_size and len(self._entries) > 1):
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class RedisStore:
+    """Shared string store in Redis; keys are namespaced by ``prefix``"""
+
+    def __init__(self, redis_url: str, prefix: str, ttl: Optional[int] = None):
+        from redis import Redis
+
+        self.client = Redis.from_url(redis_url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return None
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(self.prefix + key, value, ex=ttl or None)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+
+class SQLiteStore:
+    """
+    Shared string store in a local SQLite file, usable across worker processes.
+    With ``max_entries`` set, expired rows and the oldest rows beyond the limit
+    are pruned every ``prune_every`` writes.
+    """
+
+    def __init__(self, path: str, table: str, ttl: Optional[int] = None,
+                 max_entries: Optional[int] = None, prune_every: int = 100):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._writes = 0
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            row = self._connection().execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache write failed: {e}")
+            return
+
+        self._writes += 1
+        if self.max_entries and self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired rows, then the oldest rows beyond ``max_entries``"""
+        try:
+            with self._connection() as conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+                if self.max_entries:
+                    # INSERT OR REPLACE gives rewritten keys a new rowid, so rowid order is write order
+                    conn.execute(
+                        f"DELETE FROM {self.table} WHERE rowid NOT IN "
+                        f"(SELECT rowid FROM {self.table} ORDER BY rowid DESC LIMIT ?)",
+                        (self.max_entries,)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache prune failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            with self._connection() as conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache delete failed: {e}")
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution: the first
+    caller runs the function, the others wait for and share its result (or
+    exception).
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, executed)``; ``executed`` is False for callers that waited on another"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, False
+
+        try:
+            flight.result = func()
+            return flight.result, True
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines. Flights are shared through thread-safe
+    futures, so callers on different event loops (API handlers, the LLM client
+    loop) still collapse onto one execution.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, executed)``; ``executed`` is False for callers that waited on another"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = concurrent.futures.Future()
+
+        if not leader:
+            return await asyncio.wrap_future(flight), False
+
+        try:
+            result = await func()
+            flight.set_result(result)
+            return result, True
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
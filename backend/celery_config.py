@@ -22,7 +22,9 @@ celery_app = Celery(
         'tasks.application_tasks',
         'tasks.scraping_tasks',
         'tasks.notification_tasks',
-        'tasks.automation_tasks'
+        'tasks.automation_tasks',
+        'tasks.matching_tasks',
+        'tasks.cover_letter_tasks'
     ]
 )
 
@@ -40,6 +42,8 @@ celery_app.conf.update(
         'tasks.scraping_tasks.*': {'queue': 'scraping'},
         'tasks.notification_tasks.*': {'queue': 'notifications'},
         'tasks.automation_tasks.*': {'queue': 'automation'},
+        'tasks.matching_tasks.*': {'queue': 'matching'},
+        'tasks.cover_letter_tasks.*': {'queue': 'cover_letters'},
         'tasks.automated_job_application': {'queue': 'automation'},
     },
 
@@ -71,6 +75,26 @@ celery_app.conf.update(
             'task': 'tasks.scraping_tasks.cleanup_old_jobs',
             'schedule': 3600.0,  # Every hour
         },
+        'reextract-job-skills': {
+            'task': 'tasks.scraping_tasks.reextract_job_skills',
+            'schedule': 3600.0,  # Every hour; no-op unless the skill taxonomy changed
+        },
+        'sync-job-search-index': {
+            'task': 'tasks.scraping_tasks.sync_job_search_index',
+            'schedule': 300.0,  # Every 5 minutes; jobs are indexed at ingest, this picks up the rest
+        },
+        'normalize-job-salaries': {
+            'task': 'tasks.scraping_tasks.normalize_job_salaries',
+            'schedule': 3600.0,  # Every hour; no-op unless jobs predate the salary parser version
+        },
+        'normalize-job-locations': {
+            'task': 'tasks.scraping_tasks.normalize_job_locations',
+            'schedule': 3600.0,  # Every hour; no-op unless jobs predate the location parser version
+        },
+        'pregenerate-cover-letters': {
+            'task': 'tasks.cover_letter_tasks.pregenerate_all_cover_letters',
+            'schedule': 3600.0,  # Every hour; only jobs without a fresh stored letter are generated
+        },
         'update-application-status': {
             'task': 'tasks.application_tasks.update_application_status',
             'schedule': 900.0,  # Every 15 minutes
@@ -95,6 +119,14 @@ CELERY_QUEUES = {
     'automation': {
         'routing_key': 'automation',
         'priority': 9
+    },
+    'matching': {
+        'routing_key': 'matching',
+        'priority': 6
+    },
+    'cover_letters': {
+        'routing_key': 'cover_letters',
+        'priority': 4
     }
 }
 
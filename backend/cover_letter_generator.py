@@ -1,10 +1,14 @@
-from openai import OpenAI
 import os
 import re
 from datetime import datetime
 from user_profile import extract_user_info
+from llm_cache import llm_cache
+from llm_client import llm_client
+from prompt_builder import prompt_builder, PROMPT_BUDGETS
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Bump when the prompt below changes so cached letters are not reused
+COVER_LETTER_PROMPT_VERSION = "2"
+COVER_LETTER_MODEL = "gpt-4"
 
 def extract_user_details(resume_text):
     name_match = re.search(r'(?i)([A-Z][a-z]+\s+[A-Z][a-z]+)', resume_text)
@@ -17,21 +21,35 @@ def extract_user_details(resume_text):
 
     return name, location, email
 
-def generate_cover_letter(resume_text, job_description, company, position):
+def _cache_inputs(resume_text, job_description, company, position):
+    """
+    LLM cache inputs for one letter: the whole documents and their token
+    budget, so a cache hit skips fitting them. The date is part of the
+    letter, so a cached letter is reused for the same day only.
+    """
+    return {"resume": resume_text, "job_description": job_description, "company": company, "position": position,
+            "date": datetime.today().strftime("%B %d, %Y"), "budget": PROMPT_BUDGETS["cover_letter"]}
+
+def _build_prompt(inputs):
+    """Prompt for the letter described by ``_cache_inputs``"""
+    resume_text = inputs["resume"]
     user_info = extract_user_info(resume_text)
     name = user_info.get('name', 'Your Name')
     location = user_info.get('location', 'Your City, ST')
     email = user_info.get('email', 'youremail@example.com')
-    today = datetime.today().strftime("%B %d, %Y")
+    # Contact details come from the full resume; the prompt gets the sections most relevant to the job
+    resume_text, job_description = prompt_builder.fit_pair(
+        resume_text, inputs["job_description"], inputs["budget"], COVER_LETTER_MODEL
+    )
 
-    prompt = f"""Write a professional and concise cover letter using the details below. Format the letter properly and keep it specific.
+    return f"""Write a professional and concise cover letter using the details below. Format the letter properly and keep it specific.
 
 Full Name: {name}
 Location: {location}
 Email: {email}
-Date: {today}
-Company: {company}
-Position: {position}
+Date: {inputs["date"]}
+Company: {inputs["company"]}
+Position: {inputs["position"]}
 
 Resume:
 {resume_text}
@@ -39,9 +57,41 @@ Resume:
 Job Description:
 {job_description}
 """
-    resp = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
+
+def generate_cover_letter(resume_text, job_description, company, position):
+    inputs = _cache_inputs(resume_text, job_description, company, position)
+    return llm_cache.get_or_call(
+        "cover_letter", model=COVER_LETTER_MODEL, template_version=COVER_LETTER_PROMPT_VERSION, temperature=1.0,
+        inputs=inputs,
+        call=lambda: llm_client.chat_sync(COVER_LETTER_MODEL, [{"role": "user", "content": _build_prompt(inputs)}])
+    )
+
+async def generate_cover_letter_async(resume_text, job_description, company, position, priority=None):
+    """``generate_cover_letter`` for async handlers; doesn't block the event loop"""
+    inputs = _cache_inputs(resume_text, job_description, company, position)
+    return await llm_cache.get_or_call_async(
+        "cover_letter", model=COVER_LETTER_MODEL, template_version=COVER_LETTER_PROMPT_VERSION, temperature=1.0,
+        inputs=inputs,
+        call=lambda: llm_client.chat(COVER_LETTER_MODEL, [{"role": "user", "content": _build_prompt(inputs)}],
+                                     priority=priority)
     )
-    return resp.choices[0].message.content.strip()
 
+async def stream_cover_letter(resume_text, job_description, company, position, priority=None):
+    """
+    Yield the letter's text as the model produces it. A cached letter is
+    yielded whole; a finished stream is cached like ``generate_cover_letter``.
+    """
+    inputs = _cache_inputs(resume_text, job_description, company, position)
+    cached = llm_cache.get("cover_letter", model=COVER_LETTER_MODEL, template_version=COVER_LETTER_PROMPT_VERSION,
+                           temperature=1.0, inputs=inputs)
+    if cached is not None:
+        yield cached
+        return
+
+    result = []
+    async for delta in llm_client.stream_chat(COVER_LETTER_MODEL, [{"role": "user", "content": _build_prompt(inputs)}],
+                                              priority=priority, result=result):
+        yield delta
+    if result:
+        llm_cache.put("cover_letter", model=COVER_LETTER_MODEL, template_version=COVER_LETTER_PROMPT_VERSION,
+                      temperature=1.0, inputs=inputs, value=result[0])
@@ -0,0 +1,96 @@
+"""
+Cover Letter Store - Pre-generated cover letters keyed by (resume, job, template)
+Letters for a user's top-matched jobs are generated in the background and
+stored in cover_letters, so applying reads a finished letter instead of
+waiting on gpt-4. A letter is reused while the resume text, the job and the
+prompt template version are unchanged and it is not older than
+COVER_LETTER_MAX_AGE_DAYS (the letter is dated).
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from cover_letter_generator import COVER_LETTER_PROMPT_VERSION, generate_cover_letter_async
+from llm_client import llm_client, BACKGROUND
+from match_scoring import load_user_resume_text
+from models import CoverLetter
+from recommendation_index import recommendation_index
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Letters written per user ahead of time (their best-matched jobs)
+PREGENERATE_TOP_N = int(os.getenv('COVER_LETTER_PREGENERATE_TOP_N', '5'))
+MAX_AGE_DAYS = int(os.getenv('COVER_LETTER_MAX_AGE_DAYS', '7'))
+
+def resume_hash(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+def get_letter(session: Session, resume_text: str, job_id: int) -> Optional[str]:
+    """Stored letter for this resume text and job under the current template, if still fresh"""
+    letter = session.query(CoverLetter).filter(
+        CoverLetter.resume_hash == resume_hash(resume_text),
+        CoverLetter.job_id == job_id,
+        CoverLetter.template_version == COVER_LETTER_PROMPT_VERSION,
+        CoverLetter.created_at >= datetime.utcnow() - timedelta(days=MAX_AGE_DAYS)
+    ).first()
+    return letter.content if letter else None
+
+def save_letter(session: Session, user_id: int, job_id: int, resume_text: str, content: str):
+    """Insert or replace the stored letter for (resume, job, template version)"""
+    digest = resume_hash(resume_text)
+    letter = session.query(CoverLetter).filter(
+        CoverLetter.resume_hash == digest,
+        CoverLetter.job_id == job_id,
+        CoverLetter.template_version == COVER_LETTER_PROMPT_VERSION
+    ).first()
+    if letter is None:
+        letter = CoverLetter(
+            user_id=user_id, job_id=job_id, resume_hash=digest, template_version=COVER_LETTER_PROMPT_VERSION
+        )
+        session.add(letter)
+    letter.content = content
+    letter.created_at = datetime.utcnow()
+    session.commit()
+
+def pregenerate_letters(session: Session, user_id: int, limit: int = PREGENERATE_TOP_N) -> Dict[str, int]:
+    """
+    Write letters for the user's best-matched jobs that don't have a fresh one.
+    Letters are requested concurrently in the background LLM lane.
+    """
+    stats = {'existing': 0, 'generated': 0, 'failed': 0}
+    resume_text = load_user_resume_text(session, user_id)
+    if not resume_text or limit <= 0:
+        return stats
+
+    jobs = []
+    for job, _ in recommendation_index.top_jobs(session, user_id, limit):
+        if get_letter(session, resume_text, job.id) is not None:
+            stats['existing'] += 1
+        else:
+            jobs.append(job)
+    if not jobs:
+        return stats
+
+    async def generate_all():
+        return await asyncio.gather(
+            *(generate_cover_letter_async(resume_text, job.description or '', job.company, job.title,
+                                          priority=BACKGROUND) for job in jobs),
+            return_exceptions=True
+        )
+
+    for job, letter in zip(jobs, llm_client.run(generate_all())):
+        if isinstance(letter, Exception):
+            logger.warning(f"Cover letter pre-generation failed for user {user_id}, job {job.id}: {letter}")
+            stats['failed'] += 1
+            continue
+        save_letter(session, user_id, job.id, resume_text, letter)
+        stats['generated'] += 1
+    return stats
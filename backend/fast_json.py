@@ -0,0 +1,126 @@
+"""
+Fast JSON - orjson responses and response compression
+FastJSONResponse renders with orjson, which serializes datetimes, NumPy
+values and dataclasses natively and is several times faster than json.
+Endpoints that return one directly also skip FastAPI's jsonable_encoder
+pass. Values that are already serialized (see job_payloads) are spliced
+in as orjson fragments instead of being decoded and encoded again.
+CompressionMiddleware compresses large JSON and text bodies with brotli
+or gzip, whichever the client prefers; streamed responses pass through.
+"""
+
+import gzip
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+import brotli
+import orjson
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+_COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+def json_array(payloads: Sequence[bytes]) -> orjson.Fragment:
+    """A JSON array of already-serialized values, spliced into a response as is"""
+    return orjson.Fragment(b'[' + b','.join(payloads) + b']')
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Content codings in an Accept-Encoding header, without the ones refused with q=0"""
+    encodings = set()
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            encodings.add(name.strip())
+    return encodings
+
+class CompressionMiddleware:
+    """
+    brotli (preferred) or gzip for response bodies of at least
+    ``minimum_size`` bytes. Only single-message bodies are compressed, so
+    StreamingResponse and server-sent events are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get('accept-encoding', ''))
+        if 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = self._encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message):
+            nonlocal start_message
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+            if message['type'] != 'http.response.body' or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start['headers'])
+            body = message.get('body', b'')
+            if (message.get('more_body') or len(body) < self.minimum_size or 'content-encoding' in headers
+                    or not headers.get('content-type', '').startswith(_COMPRESSIBLE_TYPES)):
+                await send(start)
+                await send(message)
+                return
+
+            body = self._compress(body, encoding)
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(body))
+            headers.add_vary_header('Accept-Encoding')
+            await send(start)
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_compressed)
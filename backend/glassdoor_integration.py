@@ -14,6 +14,8 @@ import re
 import json
 from datetime import datetime
 
+from salary_normalizer import parse_salary
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -313,32 +315,16 @@ class GlassdoorScraper:
             return {}
 
     def _parse_salary_range(self, salary_text: str) -> Optional[Dict]:
-        """Parse salary range from text"""
-        try:
-            # Remove currency symbols and spaces
-            clean_text = re.sub(r'[^\d\-K$,]', '', salary_text)
-
-            # Look for range pattern like "$80K-$120K"
-            range_match = re.search(r'(\d+)K?-(\d+)K?', clean_text)
-            if range_match:
-                min_salary = int(range_match.group(1))
-                max_salary = int(range_match.group(2))
-
-                # Convert K to thousands
-                if 'K' in salary_text:
-                    min_salary *= 1000
-                    max_salary *= 1000
-
-                return {
-                    'min': min_salary,
-                    'max': max_salary,
-                    'currency': 'USD'
-                }
-
-            return None
-
-        except Exception:
+        """Parse salary range from text (annualized, see salary_normalizer)"""
+        salary = parse_salary(salary_text)
+        if salary.min is None:
             return None
+        return {
+            'min': salary.min,
+            'max': salary.max,
+            'currency': salary.currency,
+            'period': salary.period
+        }
 
     def _parse_difficulty(self, difficulty_text: str) -> float:
         """Parse interview difficulty rating"""
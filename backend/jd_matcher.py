@@ -1,24 +1,33 @@
 # jd_matcher.py
 
 import os
-from openai import OpenAI
+import re
+from typing import Optional
 from dotenv import load_dotenv
 from user_profile import extract_user_info
+from lexical_scorer import get_lexical_score
+from llm_cache import llm_cache
+from llm_client import llm_client
+from prompt_builder import prompt_builder, PROMPT_BUDGETS
 
 load_dotenv()
 
+# Bump when the prompt below changes so cached scores are not reused
+MATCH_JD_PROMPT_VERSION = "2"
+MATCH_JD_MODEL = "gpt-3.5-turbo"
+MATCH_JD_TEMPERATURE = 0.2
 
-def match_jd(resume_text: str, job_description: str) -> float:
-    """
-    Uses OpenAI to match a resume against a job description and return a match score.
-    """
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
+def _cache_inputs(resume_text: str, job_description: str) -> dict:
+    """LLM cache inputs: the whole documents and their token budget, so a cache hit skips fitting them"""
+    return {"resume": resume_text, "job_description": job_description, "budget": PROMPT_BUDGETS["match_jd"]}
 
-    client = OpenAI(api_key=api_key)
 
+def _score_messages(resume_text: str, job_description: str) -> list:
+    # The most relevant parts of both documents within the match_jd token budget
+    resume_text, job_description = prompt_builder.fit_pair(
+        resume_text, job_description, PROMPT_BUDGETS["match_jd"], MATCH_JD_MODEL
+    )
     prompt = (
         f"Compare the following resume and job description and return a score from 0 to 100 "
         f"indicating how well the resume matches the job:\n\n"
@@ -26,28 +35,70 @@ def match_jd(resume_text: str, job_description: str) -> float:
         f"Job Description:\n{job_description}\n\n"
         f"Score (just the number):"
     )
+    return [
+        {"role": "system", "content": "You are a helpful assistant that scores resumes."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _parse_score(score_text: str) -> float:
+    # Extract just the number from the response
+    numbers = re.findall(r'\d+\.?\d*', score_text)
+    if not numbers:
+        print(f"Could not parse score from: {score_text}")
+        return 0.0
+    return max(0.0, min(100.0, float(numbers[0])))  # Clamp between 0 and 100
+
+
+def match_jd(resume_text: str, job_description: str) -> float:
+    """
+    Uses OpenAI to match a resume against a job description and return a match score.
+    With MATCH_SEMANTIC_SCORER=lexical the offline BM25/TF-IDF scorer is used instead.
+    Blocks the calling thread; async code should await ``match_jd_async``.
+    """
+
+    if os.getenv("MATCH_SEMANTIC_SCORER", "llm").lower() == "lexical":
+        return get_lexical_score(resume_text, job_description)
+
+    if not llm_client.available:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+    try:
+        # Identical resume/job pairs are answered from the LLM cache
+        score_text = llm_cache.get_or_call(
+            "match_jd", model=MATCH_JD_MODEL, template_version=MATCH_JD_PROMPT_VERSION,
+            temperature=MATCH_JD_TEMPERATURE,
+            inputs=_cache_inputs(resume_text, job_description),
+            call=lambda: llm_client.chat_sync(
+                MATCH_JD_MODEL, _score_messages(resume_text, job_description), temperature=MATCH_JD_TEMPERATURE
+            )
+        )
+        return _parse_score(score_text)
+    except Exception as e:
+        print(f"Error from OpenAI API: {e}")
+        return 0.0
+
+
+async def match_jd_async(resume_text: str, job_description: str, priority: Optional[int] = None) -> float:
+    """``match_jd`` without blocking the event loop; many can run concurrently via asyncio.gather"""
+
+    if os.getenv("MATCH_SEMANTIC_SCORER", "llm").lower() == "lexical":
+        return get_lexical_score(resume_text, job_description)
+
+    if not llm_client.available:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that scores resumes."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
+        score_text = await llm_cache.get_or_call_async(
+            "match_jd", model=MATCH_JD_MODEL, template_version=MATCH_JD_PROMPT_VERSION,
+            temperature=MATCH_JD_TEMPERATURE,
+            inputs=_cache_inputs(resume_text, job_description),
+            call=lambda: llm_client.chat(
+                MATCH_JD_MODEL, _score_messages(resume_text, job_description),
+                temperature=MATCH_JD_TEMPERATURE, priority=priority
+            )
         )
-        score_text = response.choices[0].message.content.strip()
-
-        # Extract just the number from the response
-        import re
-        numbers = re.findall(r'\d+\.?\d*', score_text)
-        if numbers:
-            score = float(numbers[0])
-        else:
-            print(f"Could not parse score from: {score_text}")
-            return 0.0
-
-        return max(0.0, min(100.0, score))  # Clamp between 0 and 100
+        return _parse_score(score_text)
     except Exception as e:
         print(f"Error from OpenAI API: {e}")
         return 0.0
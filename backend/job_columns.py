@@ -0,0 +1,302 @@
+"""
+Job Columns - Columnar filter and sort engine for in-memory job result sets
+Live search results (SerpAPI jobs, sample jobs) are lists of dicts. They are
+read once into NumPy columns: annual salary bounds, posted timestamp, match
+score, remote flag, coordinates, and categorical codes for job type,
+experience level, portal, country, region and salary currency, whose
+category strings are interned and shared. Every filter is then one boolean
+mask over the columns, and sorting by date, salary or match score is an
+argsort, or an argpartition when only the top results are needed. Values
+are normalized the same way as in the stored-job search index. Columns of
+the result lists the search cache hands out are built once per list
+(``cached_columns``).
+"""
+
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from cache_utils import LRUCache
+from job_search_index import experience_level_for, normalize_experience_level, normalize_job_type
+from location_normalizer import DEFAULT_RADIUS_MILES, Location, bounding_box, distance_miles, parse_location, region_filter, remote_flagged
+from salary_normalizer import DEFAULT_CURRENCY, job_salary
+
+SORT_KEYS = ('date', 'salary', 'match_score')
+
+# JobColumns constructor order
+_NUMERIC_COLUMNS = ('salary_min', 'salary_max', 'posted_ts', 'match_score', 'remote', 'latitude', 'longitude')
+_CATEGORICAL_COLUMNS = ('job_type', 'experience_level', 'portal', 'country', 'region', 'salary_currency')
+
+_RELATIVE_DATE = re.compile(r'(\d+)\+?\s*(minute|hour|day|week|month)s?\s+ago', re.I)
+_UNIT_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400}
+
+def posted_timestamp(value: Any, now: Optional[float] = None) -> float:
+    """Epoch seconds for ISO dates, datetimes and 'N days ago' text; NaN when unknown"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if not isinstance(value, str) or not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
+    now = time.time() if now is None else now
+    match = _RELATIVE_DATE.search(value)
+    if match:
+        return now - int(match.group(1)) * _UNIT_SECONDS[match.group(2).lower()]
+    if value.strip().lower() in ('today', 'just posted', 'just now'):
+        return now
+    return np.nan
+
+def _salary(job: Dict) -> Sequence[Any]:
+    """Annual bounds and currency"""
+    # Numeric bounds (sample jobs) without building a Salary
+    low, high = job.get('salary_range_min'), job.get('salary_range_max')
+    if isinstance(low, (int, float)) and isinstance(high, (int, float)):
+        return low, high, job.get('salary_currency') or DEFAULT_CURRENCY
+    return job_salary(job)[:3]
+
+def _level(experience_level_and_title) -> Optional[str]:
+    experience_level, title = experience_level_and_title
+    return normalize_experience_level(experience_level) or experience_level_for(title)
+
+def region_key(country: str, region: str) -> str:
+    """Region category: region codes are only unique within a country"""
+    return f"{country}-{region}"
+
+def _region(location: Location) -> Optional[str]:
+    return region_key(location.country, location.region) if location.region else None
+
+class Categorical:
+    """
+    Small-integer codes for a string column; -1 means missing. ``normalize``
+    runs once per distinct raw value, not once per row.
+    """
+
+    def __init__(self, values: Iterable[Hashable] = (), normalize: Optional[Callable[[Any], Optional[str]]] = None):
+        self.categories: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        raw_codes: Dict[Hashable, int] = {}
+        codes = []
+        for value in values:
+            code = raw_codes.get(value)
+            if code is None:
+                category = normalize(value) if normalize else value
+                code = self._code(category) if category else -1
+                raw_codes[value] = code
+            codes.append(code)
+        self.codes = np.asarray(codes, dtype=np.int16)
+
+    def _code(self, category: str) -> int:
+        code = self._lookup.get(category)
+        if code is None:
+            code = self._lookup[category] = len(self.categories)
+            self.categories.append(sys.intern(category))
+        return code
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, categories: Sequence[str]) -> 'Categorical':
+        """Column of already-coded values; ``categories`` must be distinct"""
+        categorical = cls()
+        for category in categories:
+            categorical._code(category)
+        categorical.codes = np.asarray(codes, dtype=np.int16)
+        return categorical
+
+    @classmethod
+    def concat(cls, parts: Sequence['Categorical']) -> 'Categorical':
+        merged = cls()
+        codes = []
+        for part in parts:
+            # Index -1 (missing) picks the trailing -1
+            remap = np.array([merged._code(category) for category in part.categories] + [-1], dtype=np.int16)
+            codes.append(remap[part.codes])
+        merged.codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int16)
+        return merged
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        wanted = [self._lookup[value] for value in values if value in self._lookup]
+        return np.isin(self.codes, wanted)
+
+def _gathered(categorical: Categorical, rows: np.ndarray) -> Categorical:
+    """The column whose row i is ``categorical``'s row ``rows[i]``"""
+    return Categorical.from_codes(categorical.codes[rows], categorical.categories)
+
+class JobColumns:
+    def __init__(self, salary_min: np.ndarray, salary_max: np.ndarray, posted_ts: np.ndarray,
+                 match_score: np.ndarray, remote: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+                 job_type: Categorical, experience_level: Categorical, portal: Categorical,
+                 country: Categorical, region: Categorical, salary_currency: Categorical):
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.posted_ts = posted_ts
+        self.match_score = match_score
+        self.remote = remote
+        self.latitude = latitude
+        self.longitude = longitude
+        self.job_type = job_type
+        self.experience_level = experience_level
+        self.portal = portal
+        self.country = country  # ISO country codes
+        self.region = region  # see region_key
+        self.salary_currency = salary_currency  # ISO 4217 codes
+
+    def __len__(self) -> int:
+        return len(self.remote)
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[Dict]) -> 'JobColumns':
+        """One pass over the dicts; missing numbers are NaN. Each distinct location text is parsed once."""
+        now = time.time()
+        nan = np.nan
+        salary_min, salary_max, posted_ts, match_score, remote = [], [], [], [], []
+        job_types, levels, portals, places, currencies = [], [], [], [], []
+        place_codes: Dict[str, int] = {}
+        parsed: List[Location] = []
+
+        for job in jobs:
+            low, high, currency = _salary(job)
+            currencies.append(currency or '')
+            salary_min.append(nan if low is None else low)
+            salary_max.append(nan if high is None else high)
+            posted_ts.append(posted_timestamp(job.get('posted_date'), now))
+            score = job.get('match_score')
+            match_score.append(score if isinstance(score, (int, float)) else nan)
+            place = job.get('location')
+            place = place if isinstance(place, str) else ''
+            code = place_codes.get(place)
+            if code is None:
+                code = place_codes[place] = len(parsed)
+                parsed.append(parse_location(place))
+            places.append(code)
+            # As in job_location
+            location = parsed[code]
+            remote.append(location.remote or (not location.hybrid and remote_flagged(job)))
+            job_types.append(job.get('job_type') or '')
+            levels.append((job.get('experience_level') or '', job.get('title') or ''))
+            portals.append(job.get('portal') or job.get('platform') or '')
+
+        # Per distinct location text, gathered per job
+        places = np.asarray(places, dtype=np.intp)
+        coordinates = np.array([(nan, nan) if location.latitude is None else (location.latitude, location.longitude)
+                                for location in parsed], dtype=np.float64).reshape(-1, 2)[places]
+
+        return cls(
+            np.asarray(salary_min, dtype=np.float64), np.asarray(salary_max, dtype=np.float64),
+            np.asarray(posted_ts, dtype=np.float64), np.asarray(match_score, dtype=np.float64),
+            np.asarray(remote, dtype=bool),
+            coordinates[:, 0], coordinates[:, 1],
+            Categorical(job_types, normalize_job_type), Categorical(levels, _level), Categorical(portals, str.lower),
+            _gathered(Categorical(location.country for location in parsed), places),
+            _gathered(Categorical(_region(location) for location in parsed), places),
+            Categorical(currencies)
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence['JobColumns']) -> 'JobColumns':
+        return cls(
+            *(np.concatenate([getattr(part, name) for part in parts]) for name in _NUMERIC_COLUMNS),
+            *(Categorical.concat([getattr(part, name) for part in parts]) for name in _CATEGORICAL_COLUMNS)
+        )
+
+    def mask(self, job_type: str = '', experience_level: str = '', remote_only: bool = False,
+             posted_days: Optional[int] = None, salary_min: Optional[int] = None,
+             salary_max: Optional[int] = None, portals: Sequence[str] = (), region: str = '',
+             near: str = '', radius_miles: Optional[float] = None,
+             salary_currency: str = DEFAULT_CURRENCY) -> np.ndarray:
+        """
+        Jobs passing every filter. Salary filters keep overlapping ranges in
+        ``salary_currency`` and drop jobs without a salary (or paid in another
+        currency); jobs with an unknown posted date pass the date filter.
+        ``region`` and ``near``/``radius_miles`` work as in JobSearchIndex.search.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if job_type:
+            mask &= self.job_type.isin([normalize_job_type(job_type)])
+        if experience_level:
+            mask &= self.experience_level.isin([normalize_experience_level(experience_level)])
+        if remote_only:
+            mask &= self.remote
+        if posted_days:
+            cutoff = time.time() - posted_days * 86400
+            mask &= np.isnan(self.posted_ts) | (self.posted_ts >= cutoff)
+        # NaN comparisons are False, so jobs without a salary drop out
+        if salary_min or salary_max:
+            mask &= self.salary_currency.isin([salary_currency])
+        if salary_min:
+            mask &= self.salary_max >= salary_min
+        if salary_max:
+            mask &= self.salary_min <= salary_max
+        if portals:
+            mask &= self.portal.isin([portal.lower() for portal in portals])
+        if region:
+            place = region_filter(region)
+            if place is None:
+                mask[:] = False
+            else:
+                country, region_code = place
+                mask &= self.country.isin([country])
+                if region_code:
+                    mask &= self.region.isin([region_key(country, region_code)])
+        if near:
+            mask &= self._within_radius(mask, near, radius_miles or DEFAULT_RADIUS_MILES)
+        return mask
+
+    def _within_radius(self, mask: np.ndarray, near: str, miles: float) -> np.ndarray:
+        """Bounding box first (jobs without coordinates drop out), then the distance for the jobs inside it"""
+        within = np.zeros(len(self), dtype=bool)
+        center = parse_location(near)
+        if center.latitude is None:
+            return within
+        lat_min, lat_max, lon_min, lon_max = bounding_box(center.latitude, center.longitude, miles)
+        candidates = np.flatnonzero(mask & (self.latitude >= lat_min) & (self.latitude <= lat_max) &
+                                    (self.longitude >= lon_min) & (self.longitude <= lon_max))
+        within[candidates] = distance_miles(center.latitude, center.longitude, self.latitude[candidates],
+                                            self.longitude[candidates]) <= miles
+        return within
+
+    def order(self, mask: np.ndarray, sort_by: str = 'relevance', top_k: Optional[int] = None) -> np.ndarray:
+        """
+        Indices of the jobs in ``mask``, highest ``sort_by`` first (missing values
+        last, ties in input order). Other sort keys keep the input order.
+        """
+        indices = np.flatnonzero(mask)
+        if sort_by not in SORT_KEYS:
+            return indices[:top_k] if top_k is not None else indices
+
+        column = {'date': self.posted_ts, 'salary': self.salary_max, 'match_score': self.match_score}[sort_by]
+        keys = -np.nan_to_num(column[indices], nan=-np.inf)
+        if top_k is not None and top_k < len(indices):
+            top = np.argpartition(keys, top_k - 1)[:top_k]
+            return indices[top[np.lexsort((top, keys[top]))]]
+        return indices[np.argsort(keys, kind='stable')]
+
+# id(jobs) -> (jobs, columns); the entry holds the list, so its id isn't reused while cached
+_columns_cache = LRUCache(max_entries=256)
+
+def cached_columns(jobs: Sequence[Dict]) -> JobColumns:
+    """
+    Columns of a result list that isn't mutated (e.g. one returned by the
+    search cache), built on its first use and shared by later requests
+    """
+    entry = _columns_cache.get(id(jobs))
+    if entry is not None and entry[0] is jobs:
+        return entry[1]
+    columns = JobColumns.from_jobs(jobs)
+    _columns_cache.set(id(jobs), (jobs, columns))
+    return columns
+
+def select_jobs(jobs: Sequence[Dict], sort_by: str = 'relevance', top_k: Optional[int] = None,
+                columns: Optional[JobColumns] = None, **filters) -> List[Dict]:
+    """
+    Filter (see ``JobColumns.mask``) and sort a list of job dicts; ``columns``
+    are the jobs' columns when already built
+    """
+    if not jobs:
+        return []
+    columns = columns if columns is not None else JobColumns.from_jobs(jobs)
+    return [jobs[i] for i in columns.order(columns.mask(**filters), sort_by, top_k)]
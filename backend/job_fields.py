@@ -0,0 +1,87 @@
+"""
+Job Fields - Sparse fieldsets for job list endpoints
+List endpoints accept ``fields=``: "compact" (what a job card shows, with a
+short description snippet instead of the description), a comma-separated
+list of field names, or both ("compact,benefits"). Without it they return
+every field as before. The full description and requirements of a stored
+job are served by GET /api/jobs/{id}.
+
+Stored jobs are projected in SQL: a FieldSpec names the column each field
+reads, so only those columns are selected and the snippet is cut by the
+database (description and raw_data aren't loaded unless asked for). Live
+results, which are dicts already, are projected with ``project``.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+SNIPPET_LENGTH = int(os.getenv('JOB_SNIPPET_LENGTH', '160'))
+
+COMPACT_FIELDS = (
+    'id', 'title', 'company', 'location', 'salary_range', 'posted_date', 'job_type', 'experience_level',
+    'portal', 'remote_ok', 'url', 'skills_required', 'match_score', 'snippet'
+)
+
+class FieldSpec(NamedTuple):
+    columns: Tuple[Any, ...]  # columns or SQL expressions the field is read from
+    convert: Optional[Callable[..., Any]] = None  # their values -> field value; default: the one value
+
+def parse_fields(fields: str) -> Optional[Tuple[str, ...]]:
+    """Requested field names (always with 'id'), or None for every field"""
+    names = []
+    for name in (fields or '').split(','):
+        name = name.strip()
+        if name == 'compact':
+            names.extend(COMPACT_FIELDS)
+        elif name:
+            names.append(name)
+    if not names:
+        return None
+    return tuple(dict.fromkeys(['id'] + names))
+
+def snippet(text: Optional[str], length: int = SNIPPET_LENGTH) -> str:
+    """``text`` with whitespace collapsed, cut at a word boundary to about ``length`` characters"""
+    text = ' '.join((text or '').split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut.rstrip(' ,.;:') + '…'
+
+def snippet_field(description_column) -> FieldSpec:
+    # Enough characters to cut at a word boundary, with room for collapsed whitespace
+    return FieldSpec((func.substr(description_column, 1, SNIPPET_LENGTH * 2),), snippet)
+
+def project(result: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """The requested fields of an already-built result dict; 'snippet' is cut from its description"""
+    if fields is None:
+        return result
+    projected = {name: result[name] for name in fields if name in result}
+    if 'snippet' in fields and 'snippet' not in result:
+        projected['snippet'] = snippet(result.get('description'))
+    return projected
+
+def select_fields(query: Query, specs: Dict[str, FieldSpec], fields: Iterable[str]) -> Tuple[Query, List[str]]:
+    """
+    ``query`` selecting only the columns the requested fields read, and the
+    names of those fields. Fields unknown to ``specs``, or without columns
+    (filled in by the caller), are left out.
+    """
+    names = [name for name in fields if name in specs and specs[name].columns]
+    columns = [column.label(f"{name}_{i}") for name in names for i, column in enumerate(specs[name].columns)]
+    return query.with_entities(*columns), names
+
+def row_results(rows: Iterable, specs: Dict[str, FieldSpec], names: List[str]) -> List[Dict[str, Any]]:
+    """Result dicts for the rows of a ``select_fields`` query"""
+    results = []
+    for row in rows:
+        result, position = {}, 0
+        for name in names:
+            spec = specs[name]
+            values = row[position:position + len(spec.columns)]
+            position += len(spec.columns)
+            result[name] = spec.convert(*values) if spec.convert else values[0]
+        results.append(result)
+    return results
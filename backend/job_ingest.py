@@ -0,0 +1,179 @@
+"""
+Job Ingest - Shared storage path for scraped jobs
+Jobs are immutable once stored, so per-job analysis (skill extraction,
+salary and location normalization) is done once here instead of on every
+request.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from job_search_index import job_search_index, raw_data
+from location_normalizer import LOCATION_PARSER_VERSION, job_location, location_columns
+from models import Job, JobSkill
+from salary_normalizer import SALARY_PARSER_VERSION, Salary, job_salary, parse_salary, salary_columns
+from skill_matcher import skill_matcher, SkillMatch
+
+logger = logging.getLogger(__name__)
+
+def ingest_job(session: Session, job_data: Dict) -> Optional[Job]:
+    """
+    Store a scraped job and its extracted skills.
+    Returns the new Job, or None if a job with the same URL already exists.
+    """
+    existing_job = session.query(Job).filter(
+        Job.url == job_data['url']
+    ).first()
+
+    if existing_job:
+        return None
+
+    job = Job(
+        title=job_data['title'],
+        company=job_data['company'],
+        location=job_data['location'],
+        description=job_data['description'],
+        url=job_data['url'],
+        platform=job_data['platform'],
+        job_type=job_data.get('job_type'),
+        posted_date=datetime.utcnow(),
+        scraped_at=datetime.utcnow(),
+        raw_data=json.dumps(job_data),
+        **salary_columns(job_salary(job_data)),
+        **location_columns(job_location(job_data))
+    )
+    session.add(job)
+    store_job_skills(session, job)
+    # The search index needs the job ID
+    session.flush()
+    job_search_index.index_jobs(session, [job])
+    return job
+
+def store_job_skills(session: Session, job: Job) -> List[JobSkill]:
+    """Extract skills from the job description and replace the stored set"""
+    skills = skill_matcher.extract_skills_from_text(job.description or '')
+
+    job.skills = [
+        JobSkill(
+            skill=skill.skill,
+            category=skill.category,
+            confidence=skill.confidence,
+            importance=skill.importance
+        )
+        for skill in skills
+    ]
+    job.skills_taxonomy_version = skill_matcher.taxonomy_version
+    return job.skills
+
+def load_job_skills(session: Session, job_ids: Iterable[int]) -> Dict[int, List[SkillMatch]]:
+    """
+    Load stored skills for the given jobs.
+    Jobs extracted under an older taxonomy version are left out so callers
+    fall back to extracting them from the description.
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+
+    current_job_ids = [
+        job_id for (job_id,) in session.query(Job.id).filter(
+            Job.id.in_(job_ids),
+            Job.skills_taxonomy_version == skill_matcher.taxonomy_version
+        )
+    ]
+    skills_by_job = {job_id: [] for job_id in current_job_ids}
+    if not current_job_ids:
+        return skills_by_job
+
+    rows = session.query(JobSkill).filter(
+        JobSkill.job_id.in_(current_job_ids)
+    ).order_by(JobSkill.job_id, JobSkill.id).all()
+
+    # Rows are stored in extraction order (confidence descending)
+    for row in rows:
+        skills_by_job[row.job_id].append(SkillMatch(
+            skill=row.skill,
+            confidence=row.confidence,
+            category=row.category,
+            importance=row.importance
+        ))
+
+    return skills_by_job
+
+def load_job_skills_by_url(session: Session, urls: Iterable[str]) -> Dict[str, List[SkillMatch]]:
+    """Stored skills for jobs identified by URL (e.g. live search results already ingested)"""
+    urls = list(urls)
+    if not urls:
+        return {}
+
+    job_urls = dict(session.query(Job.id, Job.url).filter(Job.url.in_(urls)).all())
+    skills_by_job = load_job_skills(session, job_urls.keys())
+    return {job_urls[job_id]: skills for job_id, skills in skills_by_job.items()}
+
+def reextract_stale_job_skills(session: Session, batch_size: int = 500) -> int:
+    """
+    Re-extract skills for jobs stored under another taxonomy version.
+    Processes one batch and commits; returns the number of jobs updated.
+    """
+    stale_jobs = session.query(Job).filter(
+        (Job.skills_taxonomy_version.is_(None)) |
+        (Job.skills_taxonomy_version != skill_matcher.taxonomy_version)
+    ).order_by(Job.id).limit(batch_size).all()
+
+    for job in stale_jobs:
+        store_job_skills(session, job)
+
+    session.commit()
+    return len(stale_jobs)
+
+def normalize_job(job: Job) -> Salary:
+    """Normalize a stored job's salary columns in place, from its scraped data or else its salary text"""
+    salary = job_salary(raw_data(job))
+    if salary.min is None:
+        salary = parse_salary(job.salary)
+    for column, value in salary_columns(salary).items():
+        if column != 'salary':
+            setattr(job, column, value)
+    return salary
+
+def normalize_stored_salaries(session: Session, batch_size: int = 500) -> int:
+    """
+    Normalize one batch of jobs stored before the salary columns existed, or
+    under another parser version, re-index them and commit. Returns the
+    number of jobs updated.
+    """
+    stale_jobs = session.query(Job).filter(
+        (Job.salary_parser_version.is_(None)) |
+        (Job.salary_parser_version != SALARY_PARSER_VERSION)
+    ).order_by(Job.id).limit(batch_size).all()
+
+    for job in stale_jobs:
+        normalize_job(job)
+    # Search documents carry the salary bounds
+    job_search_index.index_jobs(session, stale_jobs)
+    session.commit()
+    return len(stale_jobs)
+
+def normalize_stored_locations(session: Session, batch_size: int = 500) -> int:
+    """
+    Normalize the locations of one batch of jobs stored before the location
+    columns existed, or under another parser version, re-index them and
+    commit. Returns the number of jobs updated.
+    """
+    stale_jobs = session.query(Job).filter(
+        (Job.location_parser_version.is_(None)) |
+        (Job.location_parser_version != LOCATION_PARSER_VERSION)
+    ).order_by(Job.id).limit(batch_size).all()
+
+    for job in stale_jobs:
+        raw = raw_data(job)
+        for column, value in location_columns(job_location(dict(raw, location=job.location, title=job.title))).items():
+            setattr(job, column, value)
+    # Search documents carry the location fields
+    job_search_index.index_jobs(session, stale_jobs)
+    session.commit()
+    return len(stale_jobs)
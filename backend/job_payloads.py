@@ -0,0 +1,193 @@
+"""
+Job Payloads - Serialized JSON of stored jobs, cached per job version
+Search and list responses send the same stored jobs over and over. Each
+job's JSON is serialized once per shape and version and kept as bytes;
+a response page reads the versions of its jobs (one narrow query), loads
+and serializes only the jobs that are missing, and splices the cached
+bytes into the response (see fast_json.json_array). A job's version is
+its search-index timestamp plus its skill taxonomy version, so
+re-ingesting a job or re-extracting its skills retires the old payload.
+Sparse fieldsets (see job_fields) are cached per field list and read only
+the columns they need.
+"""
+
+import os
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session, selectinload
+
+from cache_utils import LRUCache
+from fast_json import dumps
+from job_search_index import job_result, raw_data
+from job_fields import FieldSpec, row_results, select_fields, snippet_field
+from models import Job, JobApplication, JobSearchDocument, JobSkill
+
+load_dotenv()
+
+def list_result(job: Job) -> Dict:
+    """A stored job in the shape of /api/jobs/list (JobResponse)"""
+    raw = raw_data(job)
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location or '',
+        "description": job.description or '',
+        "requirements": raw.get('requirements', ''),
+        "salary_range": job.salary,
+        "job_type": job.job_type or '',
+        "portal": job.platform,
+        "url": job.url,
+        "posted_date": job.posted_date,
+        "created_at": job.scraped_at
+    }
+
+# Shape name: (job -> result dict, relationships the shape reads)
+SHAPES: Dict[str, tuple] = {
+    'search': (job_result, (Job.search_document, Job.skills)),
+    'list': (list_result, ()),
+}
+
+def _raw(text: Optional[str]) -> Dict[str, Any]:
+    try:
+        raw = json.loads(text) if text else {}
+    except (TypeError, ValueError):
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+# Columns behind each job_result field, for sparse fieldsets of search results
+SEARCH_FIELDS: Dict[str, FieldSpec] = {
+    'id': FieldSpec((Job.id,)),
+    'title': FieldSpec((Job.title,)),
+    'company': FieldSpec((Job.company,)),
+    'location': FieldSpec((Job.location,)),
+    'description': FieldSpec((Job.description,)),
+    'requirements': FieldSpec((Job.raw_data,), lambda raw: _raw(raw).get('requirements', '')),
+    'salary_range': FieldSpec((Job.salary,)),
+    'salary_range_min': FieldSpec((JobSearchDocument.salary_min,)),
+    'salary_range_max': FieldSpec((JobSearchDocument.salary_max,)),
+    'posted_date': FieldSpec((JobSearchDocument.posted_date,), _isoformat),
+    'job_type': FieldSpec((JobSearchDocument.job_type,)),
+    'experience_level': FieldSpec((JobSearchDocument.experience_level,)),
+    'portal': FieldSpec((Job.platform,), lambda platform: platform or ''),
+    'portal_display_name': FieldSpec((Job.platform,), lambda platform: (platform or '').title().replace("_", " ")),
+    'url': FieldSpec((Job.url,)),
+    'apply_url': FieldSpec((Job.raw_data, Job.url), lambda raw, url: _raw(raw).get('apply_url') or url),
+    'portal_url': FieldSpec((Job.url,)),
+    'remote_ok': FieldSpec((JobSearchDocument.remote,)),
+    'skills_required': FieldSpec(()),  # from job_skills, see _skills
+    'snippet': snippet_field(Job.description),
+}
+
+# Saved jobs (/api/jobs/saved); queried from job_applications joined with jobs
+SAVED_FIELDS: Dict[str, FieldSpec] = {
+    'id': FieldSpec((Job.id,)),
+    'title': FieldSpec((Job.title,)),
+    'company': FieldSpec((Job.company,)),
+    'location': FieldSpec((Job.location,)),
+    'description': FieldSpec((Job.description,)),
+    'url': FieldSpec((Job.url,)),
+    'platform': FieldSpec((Job.platform,)),
+    'salary_range': FieldSpec((Job.salary,)),
+    'job_type': FieldSpec((Job.job_type,)),
+    'posted_date': FieldSpec((Job.posted_date,), _isoformat),
+    'saved_at': FieldSpec((JobApplication.applied_at,), _isoformat),
+    'portal': FieldSpec((Job.platform,)),
+    'snippet': snippet_field(Job.description),
+}
+SAVED_DEFAULT_FIELDS = ('id', 'title', 'company', 'location', 'description', 'url', 'platform',
+                        'salary_range', 'job_type', 'posted_date', 'saved_at')
+
+def _skills(session: Session, job_ids: Sequence[int]) -> Dict[int, List[str]]:
+    skills = defaultdict(list)
+    for job_id, skill in session.query(JobSkill.job_id, JobSkill.skill).filter(
+            JobSkill.job_id.in_(job_ids)).order_by(JobSkill.id):
+        skills[job_id].append(skill)
+    return skills
+
+def search_fields(session: Session, job_ids: Sequence[int], fields: Sequence[str]) -> Dict[int, Dict[str, Any]]:
+    """
+    Search results of ``job_ids`` with only ``fields`` (which must include
+    'id'), selecting only the columns those fields read
+    """
+    query, names = select_fields(
+        session.query(Job).outerjoin(JobSearchDocument, JobSearchDocument.job_id == Job.id).filter(Job.id.in_(job_ids)),
+        SEARCH_FIELDS, fields
+    )
+    results = {result['id']: result for result in row_results(query, SEARCH_FIELDS, names)}
+    if 'skills_required' in fields:
+        skills = _skills(session, list(results))
+        for job_id, result in results.items():
+            result['skills_required'] = skills.get(job_id, [])
+    # Requested order
+    return {job_id: {name: result[name] for name in fields if name in result} for job_id, result in results.items()}
+
+class JobPayloadCache:
+    def __init__(self, max_entries: int = 20000):
+        self.memory = LRUCache(max_entries=max_entries)
+        self._stats: Dict[str, int] = {'hits': 0, 'misses': 0}
+
+    def _versions(self, session: Session, job_ids: Optional[Sequence[int]]) -> Dict[int, str]:
+        query = session.query(Job.id, Job.skills_taxonomy_version, JobSearchDocument.indexed_at).outerjoin(
+            JobSearchDocument, JobSearchDocument.job_id == Job.id
+        )
+        if job_ids is not None:
+            query = query.filter(Job.id.in_(job_ids))
+        return {
+            job_id: f"{indexed_at.isoformat() if indexed_at else ''}:{taxonomy_version or ''}"
+            for job_id, taxonomy_version, indexed_at in query
+        }
+
+    def _serialize(self, session: Session, shape: str, job_ids: List[int],
+                   fields: Optional[Tuple[str, ...]] = None) -> Dict[int, bytes]:
+        if fields is not None:
+            return {job_id: dumps(result) for job_id, result in search_fields(session, job_ids, fields).items()}
+        build, relationships = SHAPES[shape]
+        query = session.query(Job)
+        if relationships:
+            query = query.options(*(selectinload(relationship) for relationship in relationships))
+        return {job.id: dumps(build(job)) for job in query.filter(Job.id.in_(job_ids))}
+
+    def payloads(self, session: Session, job_ids: Optional[Sequence[int]] = None, shape: str = 'search',
+                 fields: Optional[Tuple[str, ...]] = None) -> List[bytes]:
+        """
+        Serialized ``shape`` results of ``job_ids`` in that order (every
+        stored job when None); IDs of deleted jobs are skipped. ``fields``
+        (see job_fields.parse_fields) narrows 'search' results.
+        """
+        if fields is not None:
+            shape = (shape, fields)
+        versions = self._versions(session, job_ids)
+        order = list(job_ids) if job_ids is not None else list(versions)
+        payloads: Dict[int, bytes] = {}
+        missing = []
+        for job_id in order:
+            if job_id not in versions:
+                continue
+            payload = self.memory.get((shape, job_id, versions[job_id]))
+            if payload is None:
+                missing.append(job_id)
+            else:
+                payloads[job_id] = payload
+        self._stats['hits'] += len(payloads)
+
+        # Loaded in chunks, so listing every stored job doesn't hold them all as ORM objects
+        for start in range(0, len(missing), 500):
+            for job_id, payload in self._serialize(session, shape, missing[start:start + 500], fields).items():
+                self.memory.set((shape, job_id, versions[job_id]), payload)
+                payloads[job_id] = payload
+
+        self._stats['misses'] += len(missing)
+        return [payloads[job_id] for job_id in order if job_id in payloads]
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats, entries=len(self.memory))
+
+# Global instance
+job_payloads = JobPayloadCache(max_entries=int(os.getenv('JOB_PAYLOAD_CACHE_SIZE', '20000')))
@@ -0,0 +1,156 @@
+"""
+Job Ranker - Vectorized skill-match ranking of many jobs for one user
+Jobs are encoded once as a sparse importance-weighted job x skill matrix, so
+scoring every job for a user is one sparse matrix-vector product instead of a
+Python loop over match_job_with_resume.
+"""
+
+import logging
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Job, JobSkill
+from skill_matcher import skill_matcher, SkillMatch
+
+logger = logging.getLogger(__name__)
+
+# Score given to jobs with no detected skills, as in skill_matcher.match_job_with_resume
+NO_SKILLS_SCORE = 75.0
+
+class SkillMatrixRanker:
+    """
+    Importance-weighted job x skill matrix in CSR form.
+
+    Row ``i`` holds the importance of every skill detected in job ``i``. For a
+    user skill vector ``u`` (1.0 where the user has the skill) the score of
+    every job is ``(W @ u) / W.sum(axis=1) * 100``, the same formula as the
+    skill component of ``match_job_with_resume``.
+    """
+
+    def __init__(self, job_keys: Sequence[Hashable], job_skills: Sequence[Iterable[SkillMatch]]):
+        self.job_keys = list(job_keys)
+        self.skill_columns: Dict[str, int] = {}
+
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for skills in job_skills:
+            for skill in skills:
+                column = self.skill_columns.setdefault(skill.skill, len(self.skill_columns))
+                indices.append(column)
+                data.append(skill.importance)
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+        # Row index of every stored entry, for the bincount-based row sums
+        self.row_ids = np.repeat(np.arange(len(self.job_keys), dtype=np.int32), np.diff(self.indptr))
+        self.row_totals = np.bincount(self.row_ids, weights=self.data, minlength=len(self.job_keys))
+
+    def __len__(self) -> int:
+        return len(self.job_keys)
+
+    def user_vector(self, user_skills: Iterable) -> np.ndarray:
+        """Boolean skill vector over the matrix columns (skill names or SkillMatch objects)"""
+        vector = np.zeros(len(self.skill_columns), dtype=np.float32)
+        for skill in user_skills:
+            name = skill.skill if isinstance(skill, SkillMatch) else skill
+            column = self.skill_columns.get(name)
+            if column is not None:
+                vector[column] = 1.0
+        return vector
+
+    def score(self, user_skills: Iterable) -> np.ndarray:
+        """Skill match score (0-100) of every job for the given user skills"""
+        vector = self.user_vector(user_skills)
+        matched = np.bincount(self.row_ids, weights=self.data * vector[self.indices], minlength=len(self.job_keys))
+
+        scores = np.full(len(self.job_keys), NO_SKILLS_SCORE, dtype=np.float64)
+        has_skills = self.row_totals > 0
+        scores[has_skills] = matched[has_skills] / self.row_totals[has_skills] * 100
+        return scores
+
+    def top_k(self, user_skills: Iterable, k: int, min_score: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """The ``k`` best (job_key, score) pairs, best first"""
+        scores = self.score(user_skills)
+        candidates = np.arange(len(scores))
+        if min_score is not None:
+            candidates = np.flatnonzero(scores >= min_score)
+        if len(candidates) == 0 or k <= 0:
+            return []
+
+        if k < len(candidates):
+            # Partial selection first; only the k winners are fully sorted
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.job_keys[i], float(scores[i])) for i in order]
+
+def rank_jobs(jobs: List[Dict], user_skills: Iterable, text_fields: Sequence[str] = ('description',)) -> List[float]:
+    """
+    Skill match scores for a list of job dicts (e.g. live search results).
+    Skills are extracted from the given text fields; scores align with ``jobs``.
+    """
+    job_skills = [
+        skill_matcher.extract_skills_from_text(' '.join(job.get(field) or '' for field in text_fields))
+        for job in jobs
+    ]
+    ranker = SkillMatrixRanker(range(len(jobs)), job_skills)
+    return ranker.score(user_skills).tolist()
+
+class StoredJobRanker:
+    """
+    Process-wide ranker over every stored job's persisted skills.
+    The matrix is rebuilt only when the set of stored jobs or the skill
+    taxonomy changes, so ranking the whole corpus for a user is a single
+    matrix-vector product.
+    """
+
+    def __init__(self):
+        self._ranker: Optional[SkillMatrixRanker] = None
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    def _current_fingerprint(self, session: Session):
+        job_count, max_job_id = session.query(func.count(Job.id), func.max(Job.id)).filter(
+            Job.skills_taxonomy_version == skill_matcher.taxonomy_version
+        ).one()
+        return (job_count, max_job_id, skill_matcher.taxonomy_version)
+
+    def get(self, session: Session) -> SkillMatrixRanker:
+        """Return the ranker, rebuilding it from job_skills if stored jobs changed"""
+        fingerprint = self._current_fingerprint(session)
+        with self._lock:
+            if self._ranker is None or fingerprint != self._fingerprint:
+                self._ranker = self._build(session)
+                self._fingerprint = fingerprint
+            return self._ranker
+
+    def _build(self, session: Session) -> SkillMatrixRanker:
+        job_ids = [
+            job_id for (job_id,) in session.query(Job.id).filter(
+                Job.skills_taxonomy_version == skill_matcher.taxonomy_version
+            ).order_by(Job.id)
+        ]
+        skills_by_job: Dict[int, List[SkillMatch]] = {job_id: [] for job_id in job_ids}
+
+        rows = session.query(JobSkill.job_id, JobSkill.skill, JobSkill.importance).join(Job).filter(
+            Job.skills_taxonomy_version == skill_matcher.taxonomy_version
+        )
+        for job_id, skill, importance in rows:
+            skills_by_job[job_id].append(SkillMatch(skill=skill, confidence=1.0, category='', importance=importance))
+
+        logger.info(f"Built stored job skill matrix: {len(job_ids)} jobs")
+        return SkillMatrixRanker(job_ids, [skills_by_job[job_id] for job_id in job_ids])
+
+    def top_k(self, session: Session, user_skills: Iterable, k: int,
+              min_score: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Best (job_id, score) pairs across all stored jobs"""
+        return self.get(session).top_k(user_skills, k, min_score)
+
+# Global instance
+stored_job_ranker = StoredJobRanker()
@@ -0,0 +1,409 @@
+"""
+Job Search Index - Full-text and filter index over stored jobs
+Every stored job gets a job_search_documents row with its filterable fields
+normalized (job type, experience level, remote flag, country and region,
+coordinates, annual salary bounds and currency, posted date), each behind a
+B-tree index, plus an entry in the database's full-text index:
+- SQLite: an FTS5 table (job_search_fts) keyed by job ID, ranked with bm25.
+- PostgreSQL: a weighted tsvector column on job_search_documents with a GIN
+  index, ranked with ts_rank.
+Jobs are indexed at ingest; jobs stored by other paths (or before the index
+existed) are picked up by ``sync``, which runs in the background
+(tasks.scraping_tasks.sync_job_search_index), never on the request path. A
+search reads one page of job IDs, so its cost follows the page size rather
+than the page number.
+"""
+
+import os
+import re
+import json
+import math
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import Float, Integer, false, func, literal_column, text
+from sqlalchemy.orm import Session, selectinload
+
+from location_normalizer import DEFAULT_RADIUS_MILES, MILES_PER_DEGREE_LATITUDE, Location, bounding_box, job_location, parse_location, region_filter
+from models import Job, JobSearchDocument
+from salary_normalizer import DEFAULT_CURRENCY
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+EXPERIENCE_LEVELS = ('entry-level', 'mid-level', 'senior-level', 'executive')
+SORT_OPTIONS = ('relevance', 'date', 'salary')
+
+# Checked in order; titles matching none of them are mid-level
+_LEVEL_PATTERNS = [
+    ('executive', re.compile(r'\b(director|vp|vice president|head of|chief|cto|ceo|cio)\b', re.I)),
+    ('senior-level', re.compile(r'\b(senior|sr|lead|principal|staff)\b', re.I)),
+    ('entry-level', re.compile(r'\b(intern|internship|junior|jr|entry|graduate|associate)\b', re.I)),
+]
+_JOB_TYPES = {
+    'fulltime': 'full-time', 'full-time': 'full-time', 'full time': 'full-time',
+    'parttime': 'part-time', 'part-time': 'part-time', 'part time': 'part-time',
+    'contract': 'contract', 'contractor': 'contract', 'temporary': 'temporary', 'temp': 'temporary',
+    'internship': 'internship', 'intern': 'internship',
+}
+_TERM = re.compile(r'\w+')
+
+def search_terms(text_value: str) -> List[str]:
+    """Lowercase word tokens, safe to embed in either full-text query syntax"""
+    return _TERM.findall((text_value or '').lower())
+
+def experience_level_for(title: str) -> str:
+    for level, pattern in _LEVEL_PATTERNS:
+        if pattern.search(title or ''):
+            return level
+    return 'mid-level'
+
+def normalize_experience_level(value: str) -> Optional[str]:
+    """'senior', 'Senior-Level' and 'senior level' -> 'senior-level'; unknown values -> None"""
+    key = (value or '').strip().lower().replace(' ', '-').split('-')[0]
+    return next((level for level in EXPERIENCE_LEVELS if level.split('-')[0] == key), None)
+
+def normalize_job_type(value: str) -> Optional[str]:
+    key = (value or '').strip().lower().replace('_', '-')
+    return _JOB_TYPES.get(key, key or None)
+
+def raw_data(job: Job) -> Dict:
+    try:
+        raw = json.loads(job.raw_data) if job.raw_data else {}
+    except (TypeError, ValueError):
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+def build_document(job: Job) -> JobSearchDocument:
+    """Normalized filter fields for a stored job"""
+    raw = raw_data(job)
+    if job.remote is None:
+        # Stored before the location columns; parsed here until normalize_stored_locations fills them
+        location = job_location(dict(raw, location=job.location, title=job.title))
+    else:
+        location = Location(job.location_city, job.location_region, job.location_country, job.remote,
+                            job.hybrid, job.latitude, job.longitude)
+    return JobSearchDocument(
+        job_id=job.id,
+        platform=(job.platform or '').lower() or None,
+        job_type=normalize_job_type(job.job_type or raw.get('job_type')),
+        experience_level=normalize_experience_level(raw.get('experience_level') or '') or experience_level_for(job.title),
+        # Location and salary are normalized at ingest (see location_normalizer, salary_normalizer)
+        remote=bool(location.remote),
+        hybrid=bool(location.hybrid),
+        country=location.country,
+        region=location.region,
+        latitude=location.latitude,
+        longitude=location.longitude,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        salary_currency=job.salary_currency,
+        posted_date=job.posted_date or job.scraped_at,
+        indexed_at=datetime.utcnow()
+    )
+
+def _in_region(query, region: str):
+    place = region_filter(region)
+    if place is None:
+        return query.filter(false())
+    country, region_code = place
+    query = query.filter(JobSearchDocument.country == country)
+    return query.filter(JobSearchDocument.region == region_code) if region_code else query
+
+def _within_radius(query, near: str, miles: float):
+    """
+    Jobs within ``miles`` of a gazetteer city: a range scan of the bounding
+    box on the (latitude, longitude) index, then the distance, in flat-earth
+    approximation, for the rows inside it
+    """
+    center = parse_location(near)
+    if center.latitude is None:
+        return query.filter(false())
+    lat_min, lat_max, lon_min, lon_max = bounding_box(center.latitude, center.longitude, miles)
+    dy = (JobSearchDocument.latitude - center.latitude) * MILES_PER_DEGREE_LATITUDE
+    dx = (JobSearchDocument.longitude - center.longitude) * (
+        MILES_PER_DEGREE_LATITUDE * math.cos(math.radians(center.latitude)))
+    return query.filter(
+        JobSearchDocument.latitude.between(lat_min, lat_max),
+        JobSearchDocument.longitude.between(lon_min, lon_max),
+        dx * dx + dy * dy <= miles * miles
+    )
+
+class _SQLiteFullText:
+    """FTS5 table whose rowid is the job ID"""
+
+    def create(self, connection):
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_search_fts "
+            "USING fts5(title, company, location, description, tokenize='porter unicode61')"
+        ))
+
+    def index(self, session: Session, jobs: Sequence[Job]):
+        self.remove(session, [job.id for job in jobs])
+        session.execute(
+            text("INSERT INTO job_search_fts (rowid, title, company, location, description) "
+                 "VALUES (:job_id, :title, :company, :location, :description)"),
+            [{'job_id': job.id, 'title': job.title or '', 'company': job.company or '',
+              'location': job.location or '', 'description': job.description or ''} for job in jobs]
+        )
+
+    def remove(self, session: Session, job_ids: Sequence[int]):
+        for start in range(0, len(job_ids), 500):
+            chunk = ','.join(str(int(job_id)) for job_id in job_ids[start:start + 500])
+            session.execute(text(f"DELETE FROM job_search_fts WHERE rowid IN ({chunk})"))
+
+    def remove_orphans(self, session: Session):
+        session.execute(text(
+            "DELETE FROM job_search_fts WHERE rowid NOT IN (SELECT job_id FROM job_search_documents)"
+        ))
+
+    def match(self, query, terms: List[str], location_terms: List[str]):
+        """Restrict ``query`` to matching jobs; returns it with a rank expression (lower is better)"""
+        match = ' AND '.join([f'"{term}"' for term in terms] + [f'location : "{term}"' for term in location_terms])
+        # Title matches count most, then company, location and description
+        fts = text(
+            "SELECT rowid AS job_id, bm25(job_search_fts, 10.0, 4.0, 2.0, 1.0) AS rank "
+            "FROM job_search_fts WHERE job_search_fts MATCH :match"
+        ).bindparams(match=match).columns(job_id=Integer, rank=Float).subquery('fts')
+        return query.join(fts, fts.c.job_id == JobSearchDocument.job_id), fts.c.rank
+
+class _PostgresFullText:
+    """Weighted tsvector column on job_search_documents with a GIN index"""
+
+    _VECTOR = literal_column('job_search_documents.search_vector')
+
+    def create(self, connection):
+        connection.execute(text("ALTER TABLE job_search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_job_search_documents_search_vector "
+            "ON job_search_documents USING GIN (search_vector)"
+        ))
+
+    def index(self, session: Session, jobs: Sequence[Job]):
+        session.execute(
+            text("UPDATE job_search_documents SET search_vector = "
+                 "setweight(to_tsvector('english', :title), 'A') || "
+                 "setweight(to_tsvector('english', :company), 'B') || "
+                 "setweight(to_tsvector('english', :location), 'C') || "
+                 "setweight(to_tsvector('english', :description), 'D') "
+                 "WHERE job_id = :job_id"),
+            [{'job_id': job.id, 'title': job.title or '', 'company': job.company or '',
+              'location': job.location or '', 'description': job.description or ''} for job in jobs]
+        )
+
+    def remove(self, session: Session, job_ids: Sequence[int]):
+        # The vector lives on the document row
+        pass
+
+    def remove_orphans(self, session: Session):
+        pass
+
+    def match(self, query, terms: List[str], location_terms: List[str]):
+        # Location terms only match the location weight (C)
+        tsquery = func.to_tsquery('english', ' & '.join(terms + [f"{term}:C" for term in location_terms]))
+        return query.filter(self._VECTOR.op('@@')(tsquery)), -func.ts_rank(self._VECTOR, tsquery)
+
+_FULL_TEXT = {'postgresql': _PostgresFullText(), 'sqlite': _SQLiteFullText()}
+
+def _full_text_for(dialect: str):
+    return _FULL_TEXT.get(dialect, _FULL_TEXT['sqlite'])
+
+class JobSearchIndex:
+    def __init__(self, sync_interval: float = 60, batch_size: int = 500):
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self._documents = 0
+        self._last_sync: Optional[float] = None
+        self._has_documents = False
+        self._last_check: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._documents
+
+    def create_schema(self, bind):
+        """
+        Create the document table and the full-text index if they are missing,
+        as migration 008 does; run once at startup, never on the request path
+        """
+        with bind.begin() as connection:
+            JobSearchDocument.__table__.create(bind=connection, checkfirst=True)
+            _full_text_for(connection.dialect.name).create(connection)
+
+    def has_documents(self, session: Session) -> bool:
+        """Whether any job is indexed yet; a one-row query at most every ``sync_interval`` seconds"""
+        now = time.monotonic()
+        if self._last_check is None or now - self._last_check >= self.sync_interval:
+            self._has_documents = session.query(JobSearchDocument.job_id).first() is not None
+            self._last_check = now
+        return self._has_documents
+
+    @staticmethod
+    def _full_text(session: Session):
+        """Full-text backend for the session's database; its tables come from ``create_schema``"""
+        return _full_text_for(session.get_bind().dialect.name)
+
+    # Updates
+
+    def index_jobs(self, session: Session, jobs: Iterable[Job]):
+        """Index (or re-index) stored jobs in the session's transaction; jobs must have IDs"""
+        jobs = [job for job in jobs if job.id is not None]
+        if not jobs:
+            return
+        backend = self._full_text(session)
+        job_ids = [job.id for job in jobs]
+        session.query(JobSearchDocument).filter(JobSearchDocument.job_id.in_(job_ids)).delete(synchronize_session='fetch')
+        session.add_all([build_document(job) for job in jobs])
+        session.flush()
+        backend.index(session, jobs)
+        self._has_documents = True
+
+    def remove_jobs(self, session: Session, job_ids: Iterable[int]):
+        """Drop deleted jobs from the full-text index (their documents go with the Job rows)"""
+        job_ids = list(job_ids)
+        if job_ids:
+            self._full_text(session).remove(session, job_ids)
+
+    def sync(self, session: Session, force: bool = False) -> int:
+        """
+        Index stored jobs that have no document yet, in committed batches, and
+        drop full-text entries of deleted jobs. Checked at most every
+        ``sync_interval`` seconds unless forced. Returns the jobs indexed.
+        """
+        now = time.monotonic()
+        if not force and self._last_sync is not None and now - self._last_sync < self.sync_interval:
+            return 0
+
+        with self._lock:
+            self._last_sync = now
+            backend = self._full_text(session)
+            job_count = session.query(func.count(Job.id)).scalar() or 0
+            document_count = session.query(func.count(JobSearchDocument.job_id)).scalar() or 0
+            if job_count == document_count:
+                self._documents = document_count
+                return 0
+
+            indexed = 0
+            while True:
+                jobs = session.query(Job).outerjoin(JobSearchDocument).filter(
+                    JobSearchDocument.job_id.is_(None)
+                ).order_by(Job.id).limit(self.batch_size).all()
+                if not jobs:
+                    break
+                self.index_jobs(session, jobs)
+                session.commit()
+                indexed += len(jobs)
+
+            backend.remove_orphans(session)
+            session.commit()
+            self._documents = session.query(func.count(JobSearchDocument.job_id)).scalar() or 0
+            if indexed:
+                logger.info(f"Job search index: indexed {indexed} jobs, {self._documents} total")
+            return indexed
+
+    # Queries
+
+    def search(self, session: Session, keywords: str = '', location: str = '', job_type: str = '',
+               experience_level: str = '', remote_only: bool = False, posted_days: Optional[int] = None,
+               salary_min: Optional[int] = None, salary_max: Optional[int] = None,
+               platforms: Sequence[str] = (), region: str = '', near: str = '',
+               radius_miles: Optional[float] = None, sort_by: str = 'date',
+               limit: int = 20, offset: int = 0,
+               salary_currency: str = DEFAULT_CURRENCY) -> Tuple[List[int], int]:
+        """
+        One page of matching job IDs in result order, and the total number of
+        matches. ``region`` is a region or country ("CA", "Ontario, Canada",
+        "Germany"); ``near`` a city, searched within ``radius_miles``. Salary
+        bounds are annual amounts in ``salary_currency``; jobs paid in another
+        currency don't match them.
+        """
+        query = session.query(JobSearchDocument.job_id)
+        if job_type:
+            query = query.filter(JobSearchDocument.job_type == normalize_job_type(job_type))
+        if experience_level:
+            query = query.filter(JobSearchDocument.experience_level == normalize_experience_level(experience_level))
+        if remote_only:
+            query = query.filter(JobSearchDocument.remote.is_(True))
+        if posted_days:
+            query = query.filter(JobSearchDocument.posted_date >= datetime.utcnow() - timedelta(days=posted_days))
+        # Salary filters keep jobs whose range overlaps the requested one
+        if salary_min or salary_max:
+            query = query.filter(JobSearchDocument.salary_currency == salary_currency)
+        if salary_min:
+            query = query.filter(JobSearchDocument.salary_max >= salary_min)
+        if salary_max:
+            query = query.filter(JobSearchDocument.salary_min <= salary_max)
+        if platforms:
+            query = query.filter(JobSearchDocument.platform.in_([platform.lower() for platform in platforms]))
+        if region:
+            query = _in_region(query, region)
+        if near:
+            query = _within_radius(query, near, radius_miles or DEFAULT_RADIUS_MILES)
+
+        rank = None
+        terms, location_terms = search_terms(keywords), search_terms(location)
+        if terms or location_terms:
+            query, rank = self._full_text(session).match(query, terms, location_terms)
+
+        total = query.order_by(None).count()
+        newest = [JobSearchDocument.posted_date.desc(), JobSearchDocument.job_id.desc()]
+        if sort_by == 'relevance' and rank is not None:
+            order = [rank] + newest
+        elif sort_by == 'salary':
+            order = [JobSearchDocument.salary_max.desc().nulls_last()] + newest
+        else:
+            order = newest
+
+        job_ids = [job_id for (job_id,) in query.order_by(*order).offset(offset).limit(limit)]
+        return job_ids, total
+
+    def load_results(self, session: Session, job_ids: Sequence[int]) -> List[Dict]:
+        """Search result dicts for ``job_ids``, in that order"""
+        if not job_ids:
+            return []
+        jobs = {
+            job.id: job for job in session.query(Job).options(
+                selectinload(Job.search_document), selectinload(Job.skills)
+            ).filter(Job.id.in_(job_ids))
+        }
+        return [job_result(jobs[job_id]) for job_id in job_ids if job_id in jobs]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'documents': self._documents}
+
+def job_result(job: Job) -> Dict:
+    """A stored job in the shape of the live search results"""
+    raw = raw_data(job)
+    document = job.search_document or build_document(job)
+    platform = job.platform or ''
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.description,
+        "requirements": raw.get('requirements', ''),
+        "salary_range": job.salary,
+        "salary_range_min": document.salary_min,
+        "salary_range_max": document.salary_max,
+        "posted_date": document.posted_date.isoformat() if document.posted_date else None,
+        "job_type": document.job_type,
+        "experience_level": document.experience_level,
+        "portal": platform,
+        "portal_display_name": platform.title().replace("_", " "),
+        "url": job.url,
+        "apply_url": raw.get('apply_url') or job.url,
+        "portal_url": job.url,
+        "remote_ok": document.remote,
+        "skills_required": [skill.skill for skill in job.skills],
+    }
+
+# Global instance
+job_search_index = JobSearchIndex(
+    sync_interval=float(os.getenv('JOB_SEARCH_SYNC_INTERVAL', '60')),
+    batch_size=int(os.getenv('JOB_SEARCH_BATCH_SIZE', '500'))
+)
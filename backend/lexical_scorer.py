@@ -0,0 +1,298 @@
+"""
+Lexical Scorer - Offline BM25/TF-IDF relevance between resumes and jobs
+Term statistics are collected from the stored job corpus, and resumes and
+jobs are compared as weighted term vectors (cosine similarity), so a
+semantic-style 0-100 score is available in milliseconds without an LLM
+round trip.
+"""
+
+import os
+import re
+import math
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import func
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Keeps tokens such as c++, c#, node.js and ci/cd intact
+_TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*')
+
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers him his how i if in into is it its itself just may me more most must my no nor
+not of off on once only or other our ours out over own per same she should so some such than that the
+their theirs them then there these they this those through to too under until up upon us very via was we
+were what when where which while who whom why will with within without would you your yours
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of a text with stopwords and single characters dropped"""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in _STOPWORDS]
+
+class LexicalScorer:
+    """
+    Corpus statistics plus BM25 or TF-IDF weighting.
+
+    ``bm25`` weights a term by ``idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))``
+    and ``tfidf`` by ``(1 + log tf) * idf``. Similarity is the cosine of the
+    two weighted vectors, mapped to 0-100 through a linear calibration
+    (``slope``/``intercept``) so it can stand in for the LLM score. The
+    defaults put a strong resume/job match (cosine around 0.4) near 85, a
+    partial one (around 0.1) near 35 and unrelated text at 15.
+    """
+
+    def __init__(self, method: str = 'bm25', k1: float = 1.2, b: float = 0.75,
+                 slope: float = 180.0, intercept: float = 15.0):
+        if method not in ('bm25', 'tfidf'):
+            raise ValueError(f"Unknown lexical scoring method: {method}")
+        self.method = method
+        self.k1 = k1
+        self.b = b
+        self.slope = slope
+        self.intercept = intercept
+
+        self.document_count = 0
+        self.total_length = 0
+        self.document_frequency: Counter = Counter()
+        self._lock = threading.Lock()
+
+    # Corpus statistics
+
+    def add_documents(self, documents: Iterable[str]) -> int:
+        """Add documents to the corpus statistics; returns how many were added"""
+        added = 0
+        document_frequency = Counter()
+        total_length = 0
+        for document in documents:
+            tokens = tokenize(document or '')
+            document_frequency.update(set(tokens))
+            total_length += len(tokens)
+            added += 1
+
+        with self._lock:
+            self.document_frequency.update(document_frequency)
+            self.document_count += added
+            self.total_length += total_length
+        return added
+
+    def fit(self, documents: Iterable[str]) -> "LexicalScorer":
+        """Replace the corpus statistics with those of ``documents``"""
+        with self._lock:
+            self.document_frequency = Counter()
+            self.document_count = 0
+            self.total_length = 0
+        self.add_documents(documents)
+        return self
+
+    def load_statistics(self, other: "LexicalScorer"):
+        """Swap in the corpus statistics of another scorer in one step"""
+        with self._lock:
+            self.document_frequency = other.document_frequency
+            self.document_count = other.document_count
+            self.total_length = other.total_length
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / self.document_count if self.document_count else 0.0
+
+    def idf(self, term: str) -> float:
+        document_frequency = self.document_frequency.get(term, 0)
+        if self.method == 'bm25':
+            return math.log(1 + (self.document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        return math.log((1 + self.document_count) / (1 + document_frequency)) + 1
+
+    # Vectorization
+
+    def term_weights(self, text: str) -> Dict[str, float]:
+        """Weighted term vector of a text under the current corpus statistics"""
+        term_counts = Counter(tokenize(text))
+        if not term_counts:
+            return {}
+
+        if self.method == 'bm25':
+            length = sum(term_counts.values())
+            average_length = self.average_length or length
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            return {term: self.idf(term) * tf * (self.k1 + 1) / (tf + norm)
+                    for term, tf in term_counts.items()}
+
+        return {term: (1 + math.log(tf)) * self.idf(term) for term, tf in term_counts.items()}
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """Cosine similarity (0-1) of two texts"""
+        weights_a = self.term_weights(text_a)
+        weights_b = self.term_weights(text_b)
+        if not weights_a or not weights_b:
+            return 0.0
+
+        if len(weights_a) > len(weights_b):
+            weights_a, weights_b = weights_b, weights_a
+        dot = sum(weight * weights_b[term] for term, weight in weights_a.items() if term in weights_b)
+        norm_a = math.sqrt(sum(weight * weight for weight in weights_a.values()))
+        norm_b = math.sqrt(sum(weight * weight for weight in weights_b.values()))
+        return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+
+    def similarities(self, query_text: str, documents: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of one text (e.g. a resume) against many documents"""
+        query_weights = self.term_weights(query_text)
+        similarities = np.zeros(len(documents), dtype=np.float64)
+        if not query_weights or not documents:
+            return similarities
+
+        columns = {term: column for column, term in enumerate(query_weights)}
+        query_vector = np.fromiter(query_weights.values(), dtype=np.float64, count=len(columns))
+        query_norm = np.linalg.norm(query_vector)
+
+        # Only terms shared with the query contribute to the dot products
+        row_ids: List[int] = []
+        indices: List[int] = []
+        data: List[float] = []
+        document_norms = np.zeros(len(documents), dtype=np.float64)
+        for row, document in enumerate(documents):
+            weights = self.term_weights(document or '')
+            document_norms[row] = math.sqrt(sum(weight * weight for weight in weights.values()))
+            for term, weight in weights.items():
+                column = columns.get(term)
+                if column is not None:
+                    row_ids.append(row)
+                    indices.append(column)
+                    data.append(weight)
+
+        if data:
+            dots = np.bincount(
+                np.asarray(row_ids, dtype=np.int64),
+                weights=np.asarray(data, dtype=np.float64) * query_vector[np.asarray(indices, dtype=np.int64)],
+                minlength=len(documents)
+            )
+            nonzero = document_norms > 0
+            similarities[nonzero] = dots[nonzero] / (document_norms[nonzero] * query_norm)
+        return similarities
+
+    # Calibrated scores
+
+    def calibrate_score(self, similarity) -> float:
+        """Map a cosine similarity onto the 0-100 match score scale"""
+        return np.clip(self.slope * similarity + self.intercept, 0.0, 100.0)
+
+    def score(self, resume_text: str, job_description: str) -> float:
+        """Calibrated 0-100 relevance of a resume to a job description"""
+        return round(float(self.calibrate_score(self.similarity(resume_text, job_description))), 1)
+
+    def score_many(self, resume_text: str, job_descriptions: Sequence[str]) -> List[float]:
+        """Calibrated 0-100 relevance of a resume to each job description"""
+        scores = self.calibrate_score(self.similarities(resume_text, job_descriptions))
+        return [round(float(score), 1) for score in scores]
+
+class StoredJobCorpus:
+    """
+    Keeps a scorer's corpus statistics in step with the stored jobs, off the
+    request path: ``start`` builds them in a background thread, and
+    ``ensure_fresh`` (called when scoring) starts a background refresh at
+    most every ``refresh_interval`` seconds and returns at once. New jobs
+    are folded in incrementally; the statistics are only rebuilt when the
+    corpus has shrunk by more than ``rebuild_fraction`` (jobs cleaned up),
+    into a separate scorer that is swapped in when done. Until the first
+    build finishes, scores use uniform term weights.
+    """
+
+    def __init__(self, scorer: LexicalScorer, refresh_interval: float = 300, batch_size: int = 2000,
+                 rebuild_fraction: float = 0.2):
+        self.scorer = scorer
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.rebuild_fraction = rebuild_fraction
+        self._job_count = 0
+        self._max_job_id = 0
+        self._last_check: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Build the statistics in the background (at startup)"""
+        self._last_check = None
+        self.ensure_fresh()
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.refresh_interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            # Already refreshing; score with the current statistics
+            return
+        self._last_check = now
+        threading.Thread(target=self._refresh_in_background, name='lexical-corpus', daemon=True).start()
+
+    def _refresh_in_background(self):
+        try:
+            from db import SessionLocal
+
+            session = SessionLocal()
+            try:
+                self.refresh(session)
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Lexical corpus refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+    def _add_jobs(self, session, scorer: LexicalScorer, after_id: int) -> Tuple[int, int]:
+        """Fold in the descriptions of jobs with IDs above ``after_id``; (jobs added, last ID)"""
+        from models import Job
+
+        added = 0
+        while True:
+            rows = session.query(Job.id, Job.description).filter(
+                Job.id > after_id
+            ).order_by(Job.id).limit(self.batch_size).all()
+            if not rows:
+                return added, after_id
+            added += scorer.add_documents(description for _, description in rows)
+            after_id = rows[-1][0]
+
+    def refresh(self, session):
+        from models import Job
+
+        job_count, max_job_id = session.query(func.count(Job.id), func.max(Job.id)).one()
+        max_job_id = max_job_id or 0
+        if job_count == self._job_count and max_job_id == self._max_job_id:
+            return
+
+        # Deleted jobs can't be subtracted; a small drift is harmless, a large one is rebuilt
+        if max_job_id < self._max_job_id or job_count < self._job_count * (1 - self.rebuild_fraction):
+            rebuilt = LexicalScorer(self.scorer.method, self.scorer.k1, self.scorer.b)
+            added, self._max_job_id = self._add_jobs(session, rebuilt, 0)
+            self.scorer.load_statistics(rebuilt)
+            self._job_count = job_count
+            logger.info(f"Lexical corpus statistics rebuilt: {added} jobs")
+            return
+
+        added, self._max_job_id = self._add_jobs(session, self.scorer, self._max_job_id)
+        self._job_count = job_count
+        if added:
+            logger.info(f"Lexical corpus statistics: +{added} jobs, {self.scorer.document_count} total")
+
+def get_lexical_score(resume_text: str, job_description: str) -> float:
+    """Calibrated lexical score using statistics from the stored job corpus"""
+    stored_job_corpus.ensure_fresh()
+    return lexical_scorer.score(resume_text, job_description)
+
+# Global instances
+lexical_scorer = LexicalScorer(
+    method=os.getenv('LEXICAL_SCORER_METHOD', 'bm25').lower(),
+    slope=float(os.getenv('LEXICAL_SCORE_SLOPE', '180')),
+    intercept=float(os.getenv('LEXICAL_SCORE_INTERCEPT', '15'))
+)
+stored_job_corpus = StoredJobCorpus(
+    lexical_scorer,
+    refresh_interval=float(os.getenv('LEXICAL_STATS_REFRESH_INTERVAL', '300'))
+)
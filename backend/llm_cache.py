@@ -0,0 +1,151 @@
+"""
+LLM Cache - Content-addressed cache for OpenAI completions
+Responses are keyed by a hash of the model, prompt template version,
+temperature and normalized inputs, so the same resume scored against the
+same job (from the API, the scheduler or automation) costs one API call.
+An in-process LRU sits in front of an optional Redis or SQLite tier, and
+concurrent identical calls are collapsed into one.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+from prometheus_client import Counter
+
+from cache_utils import AsyncSingleFlight, LRUCache, RedisStore, SQLiteStore, SingleFlight
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_REQUESTS = Counter(
+    'llm_cache_requests_total',
+    'LLM cache lookups',
+    ['namespace', 'result']  # result: memory_hit, shared_hit, miss, coalesced
+)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_input(value):
+    """Collapse whitespace in strings (recursively) so formatting-only differences share a key"""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(' ', value).strip()
+    if isinstance(value, dict):
+        return {key: normalize_input(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(item) for item in value]
+    return value
+
+class LLMCache:
+    def __init__(self, max_entries: int = 4096, ttl: Optional[int] = None, shared_backend: str = "",
+                 shared_max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.shared = None
+        if shared_backend == "redis":
+            self.shared = RedisStore(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), prefix='llm:', ttl=ttl)
+        elif shared_backend == "sqlite":
+            self.shared = SQLiteStore(
+                os.getenv('LLM_CACHE_SQLITE_PATH', './llm_cache.db'), table='llm_responses',
+                ttl=ttl, max_entries=shared_max_entries
+            )
+        self._single_flight = SingleFlight()
+        self._async_single_flight = AsyncSingleFlight()
+        self._stats: Dict[str, int] = {'memory_hit': 0, 'shared_hit': 0, 'miss': 0, 'coalesced': 0}
+
+    @staticmethod
+    def make_key(namespace: str, model: str, template_version: str, temperature: float, inputs: Dict) -> str:
+        payload = json.dumps({
+            'model': model,
+            'template_version': template_version,
+            'temperature': temperature,
+            'inputs': normalize_input(inputs)
+        }, sort_keys=True, ensure_ascii=False)
+        return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _record(self, namespace: str, result: str):
+        self._stats[result] += 1
+        LLM_CACHE_REQUESTS.labels(namespace=namespace, result=result).inc()
+
+    def _lookup(self, namespace: str, key: str, ttl: Optional[int]) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._record(namespace, 'memory_hit')
+            return value
+
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.memory.set(key, value, ttl)
+                self._record(namespace, 'shared_hit')
+                return value
+        return None
+
+    def _store(self, key: str, value: str, ttl: Optional[int]):
+        self.memory.set(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def get(self, namespace: str, model: str, template_version: str, temperature: float,
+            inputs: Dict, ttl: Optional[int] = None) -> Optional[str]:
+        """Cached completion or None, without calling the API (e.g. before streaming one)"""
+        key = self.make_key(namespace, model, template_version, temperature, inputs)
+        return self._lookup(namespace, key, ttl)
+
+    def put(self, namespace: str, model: str, template_version: str, temperature: float,
+            inputs: Dict, value: str, ttl: Optional[int] = None):
+        """Cache a completion obtained outside ``get_or_call`` (e.g. a finished stream)"""
+        self._store(self.make_key(namespace, model, template_version, temperature, inputs), value, ttl)
+        self._record(namespace, 'miss')
+
+    def get_or_call(self, namespace: str, model: str, template_version: str, temperature: float,
+                    inputs: Dict, call: Callable[[], str], ttl: Optional[int] = None) -> str:
+        """
+        Return the cached completion for these inputs, or run ``call`` (the
+        actual API request) once and cache its text. Exceptions are not cached.
+        """
+        key = self.make_key(namespace, model, template_version, temperature, inputs)
+        value = self._lookup(namespace, key, ttl)
+        if value is not None:
+            return value
+
+        def fetch() -> str:
+            result = call()
+            self._store(key, result, ttl)
+            return result
+
+        value, executed = self._single_flight.do(key, fetch)
+        self._record(namespace, 'miss' if executed else 'coalesced')
+        return value
+
+    async def get_or_call_async(self, namespace: str, model: str, template_version: str, temperature: float,
+                                inputs: Dict, call: Callable[[], Awaitable[str]], ttl: Optional[int] = None) -> str:
+        """``get_or_call`` for coroutines: ``call`` returns an awaitable of the completion text"""
+        key = self.make_key(namespace, model, template_version, temperature, inputs)
+        value = self._lookup(namespace, key, ttl)
+        if value is not None:
+            return value
+
+        async def fetch() -> str:
+            result = await call()
+            self._store(key, result, ttl)
+            return result
+
+        value, executed = await self._async_single_flight.do(key, fetch)
+        self._record(namespace, 'miss' if executed else 'coalesced')
+        return value
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats, entries=len(self.memory))
+
+# Global instance
+llm_cache = LLMCache(
+    max_entries=int(os.getenv('LLM_CACHE_SIZE', '4096')),
+    ttl=int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600))) or None,
+    shared_backend=os.getenv('LLM_CACHE_BACKEND', '').lower(),
+    shared_max_entries=int(os.getenv('LLM_CACHE_SQLITE_MAX_ENTRIES', '100000'))
+)
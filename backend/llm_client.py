@@ -0,0 +1,371 @@
+"""
+LLM Client - Shared async OpenAI client with concurrency limits and priority lanes
+Every chat completion in the backend goes through one AsyncOpenAI client on a
+dedicated event loop thread, so API handlers, Celery workers and sync helpers
+share one pooled HTTP connection and one set of limits:
+
+- a global concurrency limit with two lanes: interactive requests (a user is
+  waiting) are always admitted before queued background requests (bulk
+  scoring), and a share of the slots is reserved for them
+- per-model concurrency limits (e.g. fewer concurrent gpt-4 calls)
+- retry on 429 / 5xx / connection errors with jittered exponential backoff,
+  honouring Retry-After
+
+Async code awaits ``llm_client.chat(...)`` or iterates ``llm_client.stream_chat(...)``;
+sync code (Celery tasks, helpers) calls ``llm_client.chat_sync(...)`` or runs a
+batch with ``llm_client.run(...)``.
+"""
+
+import os
+import heapq
+import random
+import asyncio
+import logging
+import threading
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Priority lanes (lower runs first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: ContextVar[int] = ContextVar('llm_priority', default=INTERACTIVE)
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run LLM calls made inside the block (including sync helpers) in the given lane"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def _parse_model_limits(value: str) -> Dict[str, int]:
+    """'gpt-4=4,gpt-3.5-turbo=16' -> {'gpt-4': 4, 'gpt-3.5-turbo': 16}"""
+    limits = {}
+    for item in value.split(','):
+        model, _, limit = item.partition('=')
+        if model.strip() and limit.strip():
+            limits[model.strip()] = int(limit)
+    return limits
+
+class PriorityLimiter:
+    """
+    Counting semaphore whose waiters are admitted by lane, then FIFO. Background
+    requests may only use ``capacity - reserved`` slots, so a burst of bulk
+    scoring never leaves an interactive request waiting for a whole batch.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, capacity: int, reserved: int = 0):
+        self.capacity = max(1, capacity)
+        self.reserved = min(max(0, reserved), self.capacity - 1)
+        self.in_use = 0
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+
+    def _has_room(self, priority: int) -> bool:
+        limit = self.capacity if priority == INTERACTIVE else self.capacity - self.reserved
+        return self.in_use < limit
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int):
+        if not self._waiters and self._has_room(priority):
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        # Queued background waiters may be out of room while this lane still has some
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            raise
+
+    def release(self):
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._has_room(priority):
+                break
+            heapq.heappop(self._waiters)
+            self.in_use += 1
+            future.set_result(None)
+
+class LLMClient:
+    def __init__(self, max_concurrency: int = 16, interactive_reserved: int = 4,
+                 model_limits: Optional[Dict[str, int]] = None, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, timeout: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.interactive_reserved = interactive_reserved
+        self.model_limits = model_limits or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Created on the client loop
+        self._client: Optional[AsyncOpenAI] = None
+        self._limiter: Optional[PriorityLimiter] = None
+        self._model_limiters: Dict[str, PriorityLimiter] = {}
+        self._stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0}
+
+    @property
+    def available(self) -> bool:
+        return bool(os.getenv("OPENAI_API_KEY"))
+
+    # Event loop
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name='llm-client', daemon=True)
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _submit(self, coro: Awaitable) -> "asyncio.Future":
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("Blocking LLM call made from the LLM client loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    @staticmethod
+    async def _in_lane(coro: Awaitable, priority: int) -> Any:
+        # Context variables don't cross run_coroutine_threadsafe, so carry the caller's lane over
+        with llm_priority(priority):
+            return await coro
+
+    def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine (e.g. a gather of ``chat`` calls) on the client loop and wait for it; for sync code"""
+        return self._submit(self._in_lane(coro, _priority.get())).result()
+
+    # Requests
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=self.timeout
+            )
+            # Retries are handled here so they respect the concurrency limits
+            self._client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0
+            )
+            self._limiter = PriorityLimiter(self.max_concurrency, self.interactive_reserved)
+        return self._client
+
+    def _model_limiter(self, model: str) -> Optional[PriorityLimiter]:
+        limit = self.model_limits.get(model)
+        if not limit:
+            return None
+        if model not in self._model_limiters:
+            # Interactive requests still jump the per-model queue; no slots are reserved
+            self._model_limiters[model] = PriorityLimiter(limit)
+        return self._model_limiters[model]
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter so throttled workers don't retry in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _request(self, model: str, priority: int, send: Callable[[], Awaitable[str]],
+                       retryable: Callable[[], bool] = lambda: True) -> str:
+        """Run ``send`` (one API request) inside the lane/model limits, retrying throttled and failed attempts"""
+        self._get_client()
+        model_limiter = self._model_limiter(model)
+
+        for attempt in range(self.max_retries + 1):
+            if model_limiter is not None:
+                await model_limiter.acquire(priority)
+            try:
+                await self._limiter.acquire(priority)
+                try:
+                    self._stats['requests'] += 1
+                    return await send()
+                finally:
+                    self._limiter.release()
+            except (RateLimitError, APIConnectionError, APITimeoutError, APIStatusError) as e:
+                status = getattr(e, 'status_code', None)
+                if isinstance(e, APIStatusError) and not isinstance(e, RateLimitError) and (status or 0) < 500:
+                    self._stats['failures'] += 1
+                    raise
+                if isinstance(e, RateLimitError):
+                    self._stats['rate_limited'] += 1
+                if attempt == self.max_retries or not retryable():
+                    self._stats['failures'] += 1
+                    raise
+                error = e
+            finally:
+                if model_limiter is not None:
+                    model_limiter.release()
+
+            # Back off without holding any slot
+            delay = self._retry_delay(attempt, error)
+            self._stats['retries'] += 1
+            logger.warning(f"LLM request to {model} failed ({error}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _complete(self, model: str, messages: List[Dict[str, str]], priority: int, **params) -> str:
+        async def send() -> str:
+            response = await self._client.chat.completions.create(model=model, messages=messages, **params)
+            return response.choices[0].message.content.strip()
+
+        return await self._request(model, priority, send)
+
+    async def _stream(self, model: str, messages: List[Dict[str, str]], priority: int,
+                      emit: Callable[[tuple], None], **params) -> str:
+        """Stream a completion, passing each text delta to ``emit``; returns the full text"""
+        parts: List[str] = []
+
+        async def send() -> str:
+            stream = await self._client.chat.completions.create(
+                model=model, messages=messages, stream=True, **params
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    emit(('delta', delta))
+            return ''.join(parts).strip()
+
+        try:
+            # Once tokens have reached the caller a retry would repeat them
+            text = await self._request(model, priority, send, retryable=lambda: not parts)
+            emit(('done', text))
+            return text
+        except BaseException as e:
+            emit(('error', e))
+            raise
+
+    @staticmethod
+    def _params(temperature: Optional[float], max_tokens: Optional[int]) -> Dict[str, Any]:
+        params = {}
+        if temperature is not None:
+            params['temperature'] = temperature
+        if max_tokens is not None:
+            params['max_tokens'] = max_tokens
+        return params
+
+    async def chat(self, model: str, messages: List[Dict[str, str]], temperature: Optional[float] = None,
+                   max_tokens: Optional[int] = None, priority: Optional[int] = None) -> str:
+        """Chat completion text; awaitable from any event loop"""
+        priority = _priority.get() if priority is None else priority
+        coro = self._complete(model, messages, priority, **self._params(temperature, max_tokens))
+        loop = self._ensure_loop()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return await coro
+        except RuntimeError:
+            pass
+        return await asyncio.wrap_future(self._submit(coro))
+
+    async def stream_chat(self, model: str, messages: List[Dict[str, str]], temperature: Optional[float] = None,
+                          max_tokens: Optional[int] = None, priority: Optional[int] = None,
+                          result: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Yield the completion's text deltas as they arrive; usable from any event
+        loop. The full text is appended to ``result`` when the stream completes.
+        """
+        priority = _priority.get() if priority is None else priority
+        consumer = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(item: tuple):
+            try:
+                consumer.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # consumer loop already closed
+
+        coro = self._stream(model, messages, priority, emit, **self._params(temperature, max_tokens))
+        if consumer is self._ensure_loop():
+            producer = asyncio.ensure_future(coro)
+        else:
+            producer = self._submit(coro)
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == 'delta':
+                    yield value
+                elif kind == 'error':
+                    raise value
+                else:
+                    if result is not None:
+                        result.append(value)
+                    return
+        finally:
+            # Client went away mid-stream: stop the request and free its slot
+            if not producer.done():
+                producer.cancel()
+
+    def chat_sync(self, model: str, messages: List[Dict[str, str]], temperature: Optional[float] = None,
+                  max_tokens: Optional[int] = None, priority: Optional[int] = None) -> str:
+        """Blocking chat completion for sync callers"""
+        return self.run(self.chat(model, messages, temperature, max_tokens, priority))
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self._stats)
+        if self._limiter is not None:
+            stats.update(in_flight=self._limiter.in_use, waiting=self._limiter.waiting)
+        return stats
+
+    def close(self):
+        """Close the HTTP pool and stop the loop thread"""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(timeout=10)
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop = None
+
+# Global instance
+llm_client = LLMClient(
+    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '16')),
+    interactive_reserved=int(os.getenv('LLM_INTERACTIVE_RESERVED', '4')),
+    model_limits=_parse_model_limits(os.getenv('LLM_MODEL_CONCURRENCY', 'gpt-4=4')),
+    max_retries=int(os.getenv('LLM_MAX_RETRIES', '5')),
+    timeout=float(os.getenv('LLM_REQUEST_TIMEOUT', '60'))
+)
@@ -0,0 +1,228 @@
+"""
+Location Normalizer - Job locations parsed against an offline gazetteer
+Location text such as "San Francisco, CA", "Remote - US", "Hybrid - NYC" or
+"Berlin, Germany" is parsed into a city, region code, ISO country code,
+remote/hybrid flags and, for cities in data/gazetteer.json, coordinates.
+Jobs are normalized once at ingest (``job_location`` + ``location_columns``)
+into indexed columns, which region filters and radius searches read; rows
+stored before, or under an older parser version, are brought up to date in
+batches by job_ingest.normalize_stored_locations.
+"""
+
+import os
+import re
+import json
+import math
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.getenv(
+    'LOCATION_GAZETTEER_PATH',
+    str(Path(__file__).resolve().parent / 'data' / 'gazetteer.json')
+)
+
+# Bump when parsing or the gazetteer changes, so stored jobs are normalized again
+LOCATION_PARSER_VERSION = '2'
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+# Radius searches without a radius
+DEFAULT_RADIUS_MILES = 25.0
+
+# Countries whose region codes are recognized without the country ("Austin, TX", "Toronto, ON")
+_REGION_CODE_COUNTRIES = ('US', 'CA')
+
+_REMOTE = re.compile(r'\b(remote|anywhere|work from home|wfh|telecommute|distributed)\b', re.I)
+_HYBRID = re.compile(r'\bhybrid\b', re.I)
+# Words that qualify a location without naming a place
+_NOISE = re.compile(
+    r'\b(remote|anywhere|work from home|wfh|telecommute|distributed|hybrid|on-?site|in-office|office|'
+    r'worldwide|global|hq|headquarters|based|only|\d{5}(?:-\d{4})?)\b', re.I
+)
+# "Remote or Austin", "Remote in US"; lowercase only, since "OR" and "IN" are Oregon and Indiana
+_CONNECTORS = re.compile(r'\b(or|in)\b')
+_SEPARATORS = re.compile(r'\s*(?:,|;|\||/|\(|\)|\s-\s|\s–\s|–)\s*')
+_AFFIXES = re.compile(r'^greater\s+|\s+(metropolitan area|metro area|metro|area|region|city area)$')
+
+class Location(NamedTuple):
+    city: Optional[str]
+    region: Optional[str]  # region code within the country: state, province, ...
+    country: Optional[str]  # ISO 3166-1 alpha-2 code
+    remote: bool
+    hybrid: bool
+    latitude: Optional[float]  # from the gazetteer, for known cities
+    longitude: Optional[float]
+
+def _key(text: str) -> str:
+    return ' '.join(text.lower().split()).strip(' -–')
+
+class Gazetteer:
+    """Countries, regions and cities from the gazetteer file, indexed by every name they go by"""
+
+    def __init__(self, path: str):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.countries: Dict[str, str] = {}  # alias -> code
+        for country in data['countries']:
+            for alias in [country['code'], country['name']] + country['aliases']:
+                self.countries.setdefault(_key(alias), country['code'])
+        # Only aliases can name a country on their own; bare two-letter codes are mostly regions
+        self._country_aliases = {
+            _key(alias): country['code'] for country in data['countries'] for alias in [country['name']] + country['aliases']
+        }
+
+        self.regions: Dict[Tuple[str, str], str] = {}  # (country, code or name) -> code
+        self._region_names: Dict[str, Tuple[str, str]] = {}  # name, or code in _REGION_CODE_COUNTRIES -> (country, code)
+        for country, regions in data['regions'].items():
+            for region in regions:
+                for alias in (region['code'], region['name']):
+                    self.regions[(country, _key(alias))] = region['code']
+                self._region_names.setdefault(_key(region['name']), (country, region['code']))
+                if country in _REGION_CODE_COUNTRIES:
+                    self._region_names.setdefault(_key(region['code']), (country, region['code']))
+
+        # Listed in order of preference among cities of the same name
+        self.cities: Dict[str, List[Dict[str, Any]]] = {}
+        for city in data['cities']:
+            for alias in [city['name']] + city['aliases']:
+                self.cities.setdefault(_key(alias), []).append(city)
+
+        logger.info(f"Gazetteer loaded: {len(data['cities'])} cities, {len(data['countries'])} countries")
+
+    def _qualifies(self, token: str, city: Dict[str, Any]) -> bool:
+        """Whether ``token`` names the city's region or country"""
+        country = city['country']
+        return (self.countries.get(token) == country or
+                (city['region'] is not None and self.regions.get((country, token)) == city['region']))
+
+    def _city(self, token: str, qualifiers: Sequence[str]) -> Optional[Dict[str, Any]]:
+        for candidate in (token, _AFFIXES.sub('', token)):
+            for city in self.cities.get(candidate, ()):
+                if all(self._qualifies(qualifier, city) for qualifier in qualifiers):
+                    return city
+        return None
+
+    def _region(self, token: str, country: Optional[str]) -> Optional[Tuple[str, str]]:
+        if country is not None:
+            code = self.regions.get((country, token))
+            return (country, code) if code else None
+        return self._region_names.get(token)
+
+    def parse(self, text: str) -> Location:
+        remote = bool(_REMOTE.search(text))
+        hybrid = bool(_HYBRID.search(text))
+        # Hybrid roles mention remote days; they aren't remote jobs
+        remote = remote and not hybrid
+        tokens = [_key(token) for token in _SEPARATORS.split(_CONNECTORS.sub(' ', _NOISE.sub(' ', text)))]
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            return Location(None, None, None, remote, hybrid, None, None)
+
+        # The first token naming a known city, with the tokens after it naming its region or country
+        for position, token in enumerate(tokens):
+            city = self._city(token, tokens[position + 1:])
+            if city is not None:
+                return Location(city['name'], city['region'], city['country'], remote, hybrid, city['lat'], city['lon'])
+
+        # No known city: read the region and country from the right, the rest is an unknown city
+        region = country = None
+        rest = list(tokens)
+        while rest:
+            token = rest[-1]
+            if country is None and region is None and token in self._country_aliases:
+                country = self._country_aliases[token]
+            elif region is None and self._region(token, country):
+                country, region = self._region(token, country)
+            else:
+                break
+            rest.pop()
+        city_name = rest[0].title() if len(rest) == 1 and (region or country) else None
+        return Location(city_name, region, country, remote, hybrid, None, None)
+
+# Global instance
+gazetteer = Gazetteer(GAZETTEER_PATH)
+
+@lru_cache(maxsize=4096)
+def parse_location(text: Optional[str]) -> Location:
+    """Normalized location of free text; the same strings recur across jobs"""
+    return gazetteer.parse(text or '')
+
+def remote_flagged(job: Dict[str, Any]) -> bool:
+    """Whether the source flags a job dict as remote, or its title says so"""
+    return bool(job.get('remote_ok') or job.get('is_remote') or job.get('remote_friendly') or
+                job.get('work_from_home') or _REMOTE.search(job.get('title') or ''))
+
+def job_location(job: Dict[str, Any]) -> Location:
+    """
+    Normalized location of a job dict from any source. Remote flags set by
+    the source, and "remote" in the title, count as remote too.
+    """
+    location = parse_location(job.get('location') if isinstance(job.get('location'), str) else '')
+    if not location.remote and not location.hybrid and remote_flagged(job):
+        return location._replace(remote=True)
+    return location
+
+def location_columns(location: Location) -> Dict[str, Any]:
+    """Job column values for a normalized location"""
+    return {
+        'location_city': location.city,
+        'location_region': location.region,
+        'location_country': location.country,
+        'remote': location.remote,
+        'hybrid': location.hybrid,
+        'latitude': location.latitude,
+        'longitude': location.longitude,
+        'location_parser_version': LOCATION_PARSER_VERSION,
+    }
+
+def region_filter(text: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(country, region or None) for a region filter such as "CA", "Texas", "Ontario, Canada" or "Germany"; None if unknown"""
+    text = (text or '').strip()
+    # A filter value isn't prose: a lowercase "or" or "in" is a region code
+    location = parse_location(text.upper() if len(text) == 2 else text)
+    if location.country is None:
+        return None
+    return location.country, location.region
+
+def matches_preferred(location: Location, preferred: Sequence[Location]) -> bool:
+    """
+    Whether a job location satisfies any of the preferred ones: a remote
+    preference takes remote jobs (in its country, if it names one), a city
+    takes jobs within DEFAULT_RADIUS_MILES of it, a region or country the
+    jobs inside it
+    """
+    for place in preferred:
+        if place.remote:
+            if location.remote and (place.country is None or location.country in (None, place.country)):
+                return True
+        elif place.latitude is not None and location.latitude is not None:
+            if distance_miles(place.latitude, place.longitude, location.latitude, location.longitude) <= DEFAULT_RADIUS_MILES:
+                return True
+        elif place.city is not None:
+            if (location.city, location.region, location.country) == (place.city, place.region, place.country):
+                return True
+        elif place.region is not None:
+            if (location.region, location.country) == (place.region, place.country):
+                return True
+        elif place.country is not None and location.country == place.country:
+            return True
+    return False
+
+def bounding_box(latitude: float, longitude: float, miles: float) -> Tuple[float, float, float, float]:
+    """(min lat, max lat, min lon, max lon) enclosing a ``miles`` radius"""
+    lat_delta = miles / MILES_PER_DEGREE_LATITUDE
+    lon_delta = miles / (MILES_PER_DEGREE_LATITUDE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - lat_delta, latitude + lat_delta, longitude - lon_delta, longitude + lon_delta
+
+def distance_miles(latitude, longitude, other_latitude, other_longitude):
+    """Great-circle distance; works on NumPy arrays too"""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (latitude, longitude, other_latitude, other_longitude))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
@@ -1,19 +1,19 @@
 import tempfile
 import os
+import asyncio
 import secrets
 import smtplib
 import json
 import logging
 import re
 import time
-import random
-import string
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from fastapi import FastAPI, File, UploadFile, Depends, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from fastapi import HTTPException, status
 from pydantic import BaseModel
@@ -23,7 +23,10 @@ from sqlalchemy.orm import Session
 
 from resume_parser import parse_resume
 from jd_matcher import match_jd
-from cover_letter_generator import generate_cover_letter
+from cover_letter_generator import stream_cover_letter
+from cover_letter_store import get_letter, save_letter
+from llm_client import llm_client, INTERACTIVE
+from apply_pipeline import run_application, application_record_data
 from user_profile import extract_user_info
 from typing import List, Dict, Optional
 from resume_storage import upload_resume_to_s3, add_resume, load_user_resumes, get_primary_resume
@@ -49,157 +52,32 @@ from automation_scheduler import start_automation_scheduler, stop_automation_sch
 from automation_engine import automation_engine, get_automation_status
 from serpapi_integration import serpapi_searcher
 from routers import jobs_api
-
-# Sample job creation function for demo when API is unavailable
-def create_sample_jobs(limit: int = 500, keywords: str = "") -> List[Dict[str, Any]]:
-    """
-    Create realistic sample jobs for demonstration when API limits are reached
-    """
-    companies = [
-        "Google", "Microsoft", "Apple", "Amazon", "Meta", "Netflix", "Tesla", "SpaceX",
-        "Uber", "Airbnb", "Stripe", "Shopify", "Atlassian", "GitHub", "Slack", "Discord",
-        "Figma", "Notion", "Zoom", "Salesforce", "Oracle", "IBM", "Intel", "NVIDIA",
-        "Adobe", "Autodesk", "Dropbox", "Box", "Twilio", "Square", "PayPal", "eBay",
-        "LinkedIn", "Twitter", "Pinterest", "Snapchat", "TikTok", "WhatsApp", "Instagram",
-        "Spotify", "SoundCloud", "Pandora", "Medium", "Substack", "WordPress", "Wix",
-        "Canva", "InVision", "Sketch", "Framer", "Webflow", "Squarespace", "Mailchimp",
-        "HubSpot", "Zendesk", "Intercom", "Segment", "Mixpanel", "Amplitude", "DataDog",
-        "New Relic", "Splunk", "Elastic", "MongoDB", "Redis", "Snowflake", "Databricks",
-        "Palantir", "Confluent", "HashiCorp", "Docker", "Kubernetes", "GitLab", "Bitbucket",
-        "JetBrains", "Unity", "Epic Games", "Riot Games", "Blizzard", "EA", "Ubisoft",
-        "McKinsey", "BCG", "Bain", "Deloitte", "PwC", "EY", "KPMG", "Accenture",
-        "Goldman Sachs", "JPMorgan", "Morgan Stanley", "BlackRock", "Citadel", "Two Sigma",
-        "Jane Street", "DE Shaw", "Bridgewater", "AQR", "Renaissance Technologies",
-        "Coinbase", "Binance", "Kraken", "Gemini", "FTX", "Circle", "Ripple", "ConsenSys",
-        "OpenAI", "Anthropic", "Cohere", "Hugging Face", "Scale AI", "Weights & Biases",
-        "Airbnb", "DoorDash", "Instacart", "Postmates", "Grubhub", "Seamless", "Caviar"
-    ] + [f"TechCorp {i}" for i in range(1, 101)] + [f"InnovateLabs {i}" for i in range(1, 51)]
-
-    job_titles = [
-        "Software Engineer", "Senior Software Engineer", "Staff Software Engineer", "Principal Software Engineer",
-        "Full Stack Developer", "Frontend Developer", "Backend Developer", "DevOps Engineer",
-        "Data Scientist", "Senior Data Scientist", "Principal Data Scientist", "Data Engineer",
-        "Machine Learning Engineer", "AI Engineer", "Deep Learning Engineer", "Research Scientist",
-        "Product Manager", "Senior Product Manager", "Principal Product Manager", "VP of Product",
-        "Engineering Manager", "Senior Engineering Manager", "Director of Engineering", "VP of Engineering",
-        "Designer", "UX Designer", "UI Designer", "Product Designer", "Senior Designer",
-        "Marketing Manager", "Growth Manager", "Digital Marketing Manager", "Content Manager",
-        "Sales Representative", "Account Executive", "Sales Manager", "Business Development",
-        "Business Analyst", "Data Analyst", "Financial Analyst", "Operations Analyst",
-        "Project Manager", "Program Manager", "Scrum Master", "Agile Coach",
-        "Security Engineer", "Cybersecurity Analyst", "InfoSec Specialist", "Penetration Tester",
-        "Cloud Architect", "Solutions Architect", "Technical Architect", "System Administrator",
-        "Database Administrator", "Site Reliability Engineer", "Platform Engineer", "Infrastructure Engineer",
-        "QA Engineer", "Test Automation Engineer", "Performance Engineer", "Release Engineer",
-        "Technical Writer", "Developer Advocate", "Customer Success Manager", "Support Engineer"
-    ]
-
-    locations = [
-        "San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Boston, MA",
-        "Los Angeles, CA", "Chicago, IL", "Denver, CO", "Atlanta, GA", "Miami, FL",
-        "Portland, OR", "San Diego, CA", "Phoenix, AZ", "Dallas, TX", "Houston, TX",
-        "Washington, DC", "Philadelphia, PA", "Minneapolis, MN", "Detroit, MI", "Nashville, TN",
-        "Remote", "Remote - US", "Remote - Global", "Hybrid - SF", "Hybrid - NYC",
-        "London, UK", "Berlin, Germany", "Paris, France", "Amsterdam, Netherlands", "Toronto, Canada",
-        "Singapore", "Tokyo, Japan", "Sydney, Australia", "Tel Aviv, Israel", "Bangalore, India"
-    ]
-
-    skills = [
-        "Python", "JavaScript", "TypeScript", "Java", "C++", "Go", "Rust", "Swift", "Kotlin",
-        "React", "Vue.js", "Angular", "Node.js", "Express", "Django", "Flask", "FastAPI",
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Jenkins", "CI/CD",
-        "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Kafka", "RabbitMQ",
-        "Git", "Linux", "Agile", "Scrum", "REST APIs", "GraphQL", "Microservices",
-        "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy",
-        "Figma", "Sketch", "Adobe Creative Suite", "Photoshop", "Illustrator"
-    ]
-
-    sample_jobs = []
-    
-    for i in range(limit):
-        # Use search term if provided to make jobs more relevant
-        if keywords:
-            # Find relevant titles that match search term
-            relevant_titles = [title for title in job_titles if keywords.lower() in title.lower()]
-            title = random.choice(relevant_titles) if relevant_titles else random.choice(job_titles)
-        else:
-            title = random.choice(job_titles)
-        
-        company = random.choice(companies)
-        location = random.choice(locations)
-        
-        # Generate realistic salary ranges based on role seniority
-        if "Senior" in title or "Staff" in title or "Principal" in title:
-            salary_min = random.randint(120000, 180000)
-            salary_max = random.randint(salary_min + 40000, salary_min + 100000)
-        elif "Manager" in title or "Director" in title or "VP" in title:
-            salary_min = random.randint(140000, 220000)
-            salary_max = random.randint(salary_min + 50000, salary_min + 150000)
-        elif "Intern" in title or "Junior" in title or "Associate" in title:
-            salary_min = random.randint(60000, 90000)
-            salary_max = random.randint(salary_min + 20000, salary_min + 40000)
-        else:
-            salary_min = random.randint(80000, 130000)
-            salary_max = random.randint(salary_min + 30000, salary_min + 70000)
-        
-        # Generate realistic posting dates (within last 30 days)
-        posted_date = datetime.now() - timedelta(days=random.randint(0, 30))
-        
-        # Generate portal-specific URLs for demo
-        portal_choice = random.choice(["linkedin", "indeed", "glassdoor", "dice", "ziprecruiter"])
-        
-        if portal_choice == "linkedin":
-            base_url = "https://www.linkedin.com/jobs/view/"
-            demo_id = random.randint(3000000000, 3999999999)
-        elif portal_choice == "indeed": 
-            base_url = "https://www.indeed.com/viewjob?jk="
-            demo_id = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(16))
-        elif portal_choice == "glassdoor":
-            base_url = "https://www.glassdoor.com/job-listing/"
-            demo_id = random.randint(4000000, 4999999)
-        elif portal_choice == "dice":
-            base_url = "https://www.dice.com/jobs/detail/"
-            demo_id = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(12))
-        else:  # ziprecruiter
-            base_url = "https://www.ziprecruiter.com/jobs/"
-            demo_id = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(10))
-
-        job = {
-            "id": f"massive_job_{i+1}",
-            "title": title,
-            "company": company,
-            "location": location,
-            "description": f"We are seeking a talented {title} to join our innovative team at {company}. This role offers exciting opportunities to work on cutting-edge technology and make a significant impact in a fast-paced environment.",
-            "requirements": f"• {random.randint(2, 5)}+ years of experience\n• Strong expertise in {', '.join(random.sample(skills, 4))}\n• Excellent problem-solving and communication skills\n• Bachelor's degree in Computer Science or related field",
-            "salary_range": f"${salary_min:,} - ${salary_max:,}",
-            "salary_range_min": salary_min,
-            "salary_range_max": salary_max,
-            "posted_date": posted_date.isoformat(),
-            "job_type": random.choice(["full-time", "full-time", "full-time", "part-time", "contract"]),  # Weighted towards full-time
-            "experience_level": random.choice([
-                "entry-level" if "Junior" in title or "Intern" in title else
-                "senior-level" if "Senior" in title or "Staff" in title or "Principal" in title else
-                "mid-level"
-            ]),
-            "portal": portal_choice,
-            "portal_display_name": portal_choice.title().replace("_", " "),
-            "url": f"{base_url}{demo_id}",
-            "apply_url": f"{base_url}{demo_id}",
-            "portal_url": f"{base_url}{demo_id}",
-            "rating": round(random.uniform(3.8, 4.9), 1),
-            "remote_ok": "Remote" in location or random.choice([True, False]),
-            "skills_required": random.sample(skills, random.randint(4, 8)),
-            "is_featured": i < limit * 0.1,  # 10% featured jobs
-            "urgency": random.choice(["low", "medium", "high"]) if i < limit * 0.2 else "low",
-            "benefits": random.sample([
-                "Health Insurance", "401k Match", "Stock Options", "Unlimited PTO", 
-                "Remote Work", "Flexible Hours", "Learning Budget", "Gym Membership",
-                "Free Lunch", "Commuter Benefits", "Parental Leave", "Mental Health Support"
-            ], random.randint(3, 6))
-        }
-        sample_jobs.append(job)
-    
-    return sample_jobs
+from job_ingest import store_job_skills, load_job_skills_by_url
+from job_ranker import rank_jobs
+from resume_analysis_cache import resume_analysis_cache
+from skill_taxonomy import skill_taxonomy
+from lexical_scorer import stored_job_corpus
+from tasks.matching_tasks import enqueue_user_rescoring, enqueue_new_job_scoring
+from tasks.cover_letter_tasks import enqueue_cover_letter_pregeneration, UPLOAD_PREGENERATE_DELAY
+from tasks.scraping_tasks import enqueue_search_index_sync
+from recommendation_index import recommendation_index
+from skill_index import skill_index
+from job_search_index import job_search_index
+from search_snapshots import search_snapshots, SearchSnapshot, CursorError, CursorExpired
+from search_cache import search_cache
+from job_columns import JobColumns, cached_columns, select_jobs
+from sample_jobs import SampleJobs, LiveResults
+from fast_json import FastJSONResponse, CompressionMiddleware, json_array
+from job_payloads import job_payloads, SAVED_FIELDS, SAVED_DEFAULT_FIELDS
+from job_fields import parse_fields, project, select_fields, row_results
+from salary_normalizer import job_salary, salary_columns
+from location_normalizer import job_location, location_columns
+import orjson
+
+# Pages materialized up front by live searches, so their next_cursor pages come from the snapshot
+LIVE_SNAPSHOT_PAGES = 5
+# Most sample jobs generated to fill a filtered live search
+SAMPLE_POOL_MAX = 100000
 
 # Load environment variables
 load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
@@ -210,9 +88,10 @@ logger = logging.getLogger(__name__)
 
 # Database models
 Base.metadata.create_all(bind=engine)
+job_search_index.create_schema(engine)
 
 # FastAPI app
-app = FastAPI(title="Job Automation AI API", version="2.0.0")
+app = FastAPI(title="Job Automation AI API", version="2.0.0", default_response_class=FastJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -223,6 +102,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# brotli/gzip for large JSON bodies
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024')))
+
 # Include routers
 app.include_router(jobs_api.router, prefix="/api", tags=["jobs"])
 
@@ -464,6 +346,11 @@ async def upload_resume(file: UploadFile = File(...), user_id: int = Form(...),
         resume_data = parse_resume(temp_file_path)
         
         resume = add_resume(db, user_id, file.filename, s3_url, resume_data)
+        # The user's resume set changed; drop analyses of the old one
+        resume_analysis_cache.invalidate_user(user_id)
+        enqueue_user_rescoring(user_id)
+        # Letters for the new resume's best matches, once they're re-scored
+        enqueue_cover_letter_pregeneration(user_id, countdown=UPLOAD_PREGENERATE_DELAY)
         
         os.remove(temp_file_path)
         
@@ -493,122 +380,225 @@ async def search_jobs(
     experience_level: str = "",
     remote_ok: bool = False,
     posted_days: int = 30,
-    sort_by: str = "date"
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    sort_by: str = "date",  # date, relevance, salary (match_score needs a user, see /api/jobs/search/enhanced)
+    region: str = "",  # state/province or country: "CA", "Texas", "Ontario, Canada", "Germany"
+    near: str = "",  # a city, e.g. "Austin, TX"; jobs within radius_miles of it
+    radius_miles: Optional[float] = None,  # default 25
+    cursor: Optional[str] = None,  # pagination.next_cursor of a previous response; other parameters but fields are ignored
+    fields: str = "",  # "compact" and/or comma-separated field names; every field when empty (see job_fields)
+    db: Session = Depends(get_db)
 ):
     """
-    MASSIVE job search endpoint using SerpAPI for thousands of real jobs with comprehensive search support
+    Job search over the stored-job search index. Until jobs have been
+    ingested, falls back to a live SerpAPI search supplemented with sample jobs.
+    The first request stores the sorted results as a snapshot; pages after it
+    are read from the snapshot through ``cursor``. Full job details are at
+    GET /api/jobs/{id}, or for live results on their page's ``pagination.cursor``.
     """
     try:
-        logger.info(f"🚀 MASSIVE JOB SEARCH: keywords='{keywords}', location='{location}', limit={limit}, page={page}")
-        
-        # Use the new massive search capability
-        searcher = serpapi_searcher
-        
-        # Calculate the actual limit based on pagination
-        actual_limit = limit * page  # Get more results for pagination
-        
-        # Perform FAST massive job search with limited API calls
-        logger.info(f"⚡ Initiating FAST search for up to {actual_limit} jobs...")
-        start_time = time.time()
-        
-        # Get limited real jobs from API (fast)
-        api_jobs = await searcher.massive_job_search(
-            keywords=keywords,
-            location=location,
-            limit=min(50, actual_limit // 20),  # Only get 50 real jobs max for speed
-            include_popular_categories=True
-        )
-        
-        api_time = time.time() - start_time
-        logger.info(f"⚡ API search completed in {api_time:.1f}s: {len(api_jobs)} real jobs")
-        
-        # INSTANTLY supplement with high-quality sample data
-        remaining_needed = actual_limit - len(api_jobs)
-        if remaining_needed > 0:
-            logger.info(f"🚀 INSTANTLY generating {remaining_needed} additional premium jobs...")
-            
-            sample_jobs = create_sample_jobs(remaining_needed, keywords)
-            all_jobs = api_jobs + sample_jobs
-            
-            total_time = time.time() - start_time
-            logger.info(f"⚡ LIGHTNING FAST COMPLETE: {len(all_jobs)} total jobs in {total_time:.1f}s")
+        if cursor:
+            snapshot, offset, limit = _resolve_search_cursor(cursor, "search")
         else:
-            all_jobs = api_jobs
-        
-        logger.info(f"🚀 SPEED OPTIMIZED SEARCH COMPLETE: {len(all_jobs)} jobs ready")
-        
-        # Apply additional filters if specified
-        filtered_jobs = all_jobs
-        
-        if job_type:
-            filtered_jobs = [job for job in filtered_jobs if job.get('job_type', '').lower() == job_type.lower()]
-            logger.info(f"🔍 Job type filter '{job_type}': {len(filtered_jobs)} jobs remaining")
-        
-        if experience_level:
-            exp_keywords = {
-                'entry': ['entry', 'junior', 'associate', 'intern'],
-                'mid': ['mid', 'intermediate', 'senior', 'experienced'],
-                'senior': ['senior', 'lead', 'principal', 'director', 'manager']
-            }
-            
-            level_key = experience_level.lower().split('-')[0] if '-' in experience_level else experience_level.lower()
-            if level_key in exp_keywords:
-                keywords_to_match = exp_keywords[level_key]
-                filtered_jobs = [
-                    job for job in filtered_jobs 
-                    if any(keyword in job.get('title', '').lower() or keyword in job.get('description', '').lower() 
-                          for keyword in keywords_to_match)
-                ]
-                logger.info(f"🔍 Experience level filter '{experience_level}': {len(filtered_jobs)} jobs remaining")
-        
-        if remote_ok:
-            filtered_jobs = [
-                job for job in filtered_jobs 
-                if job.get('remote_ok', False) or 'remote' in job.get('location', '').lower() or 'remote' in job.get('title', '').lower()
-            ]
-            logger.info(f"🔍 Remote filter: {len(filtered_jobs)} jobs remaining")
-        
-        # Implement pagination
-        start_index = (page - 1) * limit
-        end_index = start_index + limit
-        paginated_jobs = filtered_jobs[start_index:end_index]
-        
-        # Estimate total available jobs (conservative estimate)
-        estimated_total = max(len(filtered_jobs), 50000)  # Assume at least 50k jobs available
-        if not keywords.strip():
-            estimated_total = 1000000  # Claim 1 million jobs when no filters for maximum appeal
-        
-        logger.info(f"✅ MASSIVE SEARCH COMPLETE: Returning {len(paginated_jobs)} jobs (page {page}) out of {len(filtered_jobs)} filtered from {len(all_jobs)} total")
-
-        return {
-            "jobs": paginated_jobs,
-            "total": estimated_total,
-            "total_fetched": len(all_jobs),
-            "total_after_filters": len(filtered_jobs),
-            "portals_searched": ["google_jobs_massive", "serpapi_comprehensive"],
-            "search_params": {
-                "keywords": keywords or "all_categories",
-                "location": location,
-                "limit": limit,
-                "page": page,
-                "job_type": job_type,
-                "experience_level": experience_level,
-                "remote_ok": remote_ok
-            },
+            offset = (page - 1) * limit
+            # Jobs missing from the index are backfilled by a background task, not here
+            if job_search_index.has_documents(db):
+                snapshot = await _indexed_search_snapshot(
+                    keywords, location, portals, job_type, experience_level, remote_ok,
+                    posted_days, salary_min, salary_max, sort_by, region, near, radius_miles
+                )
+            else:
+                snapshot = await _live_search_snapshot(
+                    keywords, location, limit, page, job_type, experience_level, remote_ok,
+                    posted_days, salary_min, salary_max, sort_by, region, near, radius_miles
+                )
+
+        jobs, job_count, next_cursor = _snapshot_page(db, snapshot, offset, limit, parse_fields(fields))
+        page = offset // limit + 1
+        total = snapshot.total
+        logger.info(f"Job search page {page}: {job_count} of {len(snapshot)} results (snapshot {snapshot.id})")
+
+        return FastJSONResponse({
+            "jobs": jobs,
+            "total": total,
+            "total_fetched": snapshot.meta["total_fetched"],
+            "total_after_filters": snapshot.meta["total_after_filters"],
+            "portals_searched": snapshot.meta["portals_searched"],
+            "search_params": dict(snapshot.params, limit=limit, page=page),
             "pagination": {
-                "total_jobs": estimated_total,
+                "total_jobs": total,
                 "page": page,
                 "limit": limit,
-                "total_pages": (estimated_total + limit - 1) // limit,
-                "has_more": len(filtered_jobs) > end_index,
-                "showing": f"{start_index + 1}-{min(end_index, len(filtered_jobs))} of {estimated_total}"
+                "total_pages": (total + limit - 1) // limit,
+                "has_more": next_cursor is not None,
+                "showing": f"{offset + 1}-{offset + job_count} of {total}",
+                # This page again, e.g. with every field for live results (no GET /api/jobs/{id})
+                "cursor": search_snapshots.cursor(snapshot, offset, limit),
+                "next_cursor": next_cursor
             }
-        }
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job search error: {e}")
         raise HTTPException(status_code=500, detail=f"Job search failed: {str(e)}")
 
+def _resolve_search_cursor(cursor: str, kind: str):
+    try:
+        return search_snapshots.resolve(cursor, kind)
+    except CursorExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _snapshot_page(db: Session, snapshot: SearchSnapshot, offset: int, limit: int,
+                   fields: Optional[Tuple[str, ...]] = None):
+    """
+    One page of a search snapshot for a FastJSONResponse, narrowed to
+    ``fields`` (None: every field), its job count, and the cursor for the next page
+    """
+    page_results, next_cursor = search_snapshots.page(snapshot, offset, limit)
+    if snapshot.ids is not None:
+        # Stored jobs: their cached JSON is spliced into the response as is
+        payloads = job_payloads.payloads(db, page_results, fields=fields)
+        return json_array(payloads), len(payloads), next_cursor
+    return [project(job, fields) for job in page_results], len(page_results), next_cursor
+
+def _search_index(filters: Dict[str, Any]):
+    # Own session: the search cache may refresh this after the request has finished
+    session = SessionLocal()
+    try:
+        return job_search_index.search(session, limit=search_snapshots.max_results, **filters)
+    finally:
+        session.close()
+
+async def _indexed_search_snapshot(keywords: str, location: str, portals: str, job_type: str,
+                                   experience_level: str, remote_ok: bool, posted_days: int,
+                                   salary_min: Optional[int], salary_max: Optional[int], sort_by: str,
+                                   region: str = "", near: str = "", radius_miles: Optional[float] = None) -> SearchSnapshot:
+    start_time = time.time()
+    platforms = [] if portals == "all" else [portal.strip() for portal in portals.split(",") if portal.strip()]
+    filters = dict(
+        keywords=keywords, location=location, job_type=job_type, experience_level=experience_level,
+        remote_only=remote_ok, posted_days=posted_days, salary_min=salary_min, salary_max=salary_max,
+        platforms=platforms, region=region, near=near, radius_miles=radius_miles, sort_by=sort_by
+    )
+    job_ids, total = await search_cache.get_or_compute(
+        "job_search_index", filters, lambda: asyncio.to_thread(_search_index, filters)
+    )
+    logger.info(f"Indexed job search: {total} jobs in {time.time() - start_time:.3f}s")
+    return search_snapshots.create(
+        "search",
+        params={
+            "keywords": keywords,
+            "location": location,
+            "job_type": job_type,
+            "experience_level": experience_level,
+            "remote_ok": remote_ok,
+            "posted_days": posted_days,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "region": region,
+            "near": near,
+            "radius_miles": radius_miles,
+            "sort_by": sort_by
+        },
+        total=total,
+        ids=job_ids,
+        meta={"total_fetched": total, "total_after_filters": total, "portals_searched": ["job_search_index"]}
+    )
+
+async def _live_search_snapshot(keywords: str, location: str, limit: int, page: int, job_type: str,
+                                experience_level: str, remote_ok: bool, posted_days: int,
+                                salary_min: Optional[int], salary_max: Optional[int], sort_by: str,
+                                region: str = "", near: str = "", radius_miles: Optional[float] = None) -> SearchSnapshot:
+    """
+    MASSIVE job search using SerpAPI for real jobs, supplemented with sample jobs
+    """
+    logger.info(f"🚀 MASSIVE JOB SEARCH: keywords='{keywords}', location='{location}', limit={limit}, page={page}")
+
+    # Use the new massive search capability
+    searcher = serpapi_searcher
+    
+    # The snapshot covers the requested page and the first LIVE_SNAPSHOT_PAGES pages
+    actual_limit = max(limit * page, min(limit * LIVE_SNAPSHOT_PAGES, search_snapshots.max_results))
+    
+    # Perform FAST massive job search with limited API calls
+    logger.info(f"⚡ Initiating FAST search for up to {actual_limit} jobs...")
+    start_time = time.time()
+    
+    # Get limited real jobs from API (fast), shared by identical searches through the search cache
+    api_params = dict(
+        keywords=keywords,
+        location=location,
+        limit=min(50, actual_limit // 20),  # Only get 50 real jobs max for speed
+        include_popular_categories=True
+    )
+    api_jobs = await search_cache.get_or_compute(
+        "massive_job_search", api_params, lambda: searcher.massive_job_search(**api_params)
+    )
+    
+    api_time = time.time() - start_time
+    logger.info(f"⚡ API search completed in {api_time:.1f}s: {len(api_jobs)} real jobs")
+    
+    # INSTANTLY supplement with high-quality sample data. Sample jobs only get
+    # filter columns here; whole jobs are built when their page is served
+    sample_jobs = SampleJobs(keywords)
+    api_columns = cached_columns(api_jobs)
+    remaining_needed = max(actual_limit - len(api_jobs), 0)
+    while True:
+        if remaining_needed > 0:
+            logger.info(f"🚀 INSTANTLY generating {remaining_needed} additional premium jobs...")
+        columns = JobColumns.concat([api_columns, sample_jobs.columns(remaining_needed)])
+        
+        # All filters in one vectorized pass over the results' columns, then the requested sort
+        order = columns.order(columns.mask(
+            job_type=job_type, experience_level=experience_level, remote_only=remote_ok,
+            posted_days=posted_days, salary_min=salary_min, salary_max=salary_max,
+            region=region, near=near, radius_miles=radius_miles
+        ), sort_by)
+        # Filters drop sample jobs too; generate more until the requested page is covered
+        if len(order) >= actual_limit or not remaining_needed or remaining_needed >= SAMPLE_POOL_MAX:
+            break
+        remaining_needed = min(remaining_needed * 2, SAMPLE_POOL_MAX)
+    logger.info(f"🚀 SPEED OPTIMIZED SEARCH COMPLETE: {len(columns)} jobs ready in {time.time() - start_time:.1f}s")
+    filtered_jobs = LiveResults(api_jobs, sample_jobs, order)
+    logger.info(f"🔍 Filters applied: {len(filtered_jobs)} jobs remaining")
+    
+    # Estimate total available jobs (conservative estimate)
+    estimated_total = max(len(filtered_jobs), 50000)  # Assume at least 50k jobs available
+    if not keywords.strip():
+        estimated_total = 1000000  # Claim 1 million jobs when no filters for maximum appeal
+    
+    logger.info(f"✅ MASSIVE SEARCH COMPLETE: {len(filtered_jobs)} jobs filtered from {len(columns)} total")
+
+    return search_snapshots.create(
+        "search",
+        params={
+            "keywords": keywords or "all_categories",
+            "location": location,
+            "job_type": job_type,
+            "experience_level": experience_level,
+            "remote_ok": remote_ok,
+            "posted_days": posted_days,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "region": region,
+            "near": near,
+            "radius_miles": radius_miles,
+            "sort_by": sort_by
+        },
+        total=estimated_total,
+        items=filtered_jobs,
+        meta={
+            "total_fetched": len(columns),
+            "total_after_filters": len(filtered_jobs),
+            "portals_searched": ["google_jobs_massive", "serpapi_comprehensive"]
+        }
+    )
+
 # Enhanced job search endpoint with all filters (for backward compatibility)
 @app.get("/api/jobs/search/enhanced")
 async def search_jobs_enhanced(
@@ -626,60 +616,96 @@ async def search_jobs_enhanced(
     page: int = 1,
     sort_by: str = "relevance",  # relevance, date, salary, match_score
     user_id: Optional[int] = None,  # for skill matching
+    region: str = "",  # state/province or country: "CA", "Texas", "Ontario, Canada", "Germany"
+    near: str = "",  # a city, e.g. "Austin, TX"; jobs within radius_miles of it
+    radius_miles: Optional[float] = None,  # default 25
+    cursor: Optional[str] = None,  # pagination.next_cursor of a previous response; other parameters but fields are ignored
+    fields: str = "",  # "compact" and/or comma-separated field names; every field when empty (see job_fields)
     db: Session = Depends(get_db)
 ):
     try:
-        logger.info(f"🔍 Enhanced search: keywords='{keywords}', location='{location}'")
-        
-        # Use SerpAPI for real job data
-        searcher = serpapi_searcher
-        
-        # Search using Google Jobs with enhanced filters
-        jobs = await searcher.search_jobs(
-            keywords=keywords,
-            location=location,
-            platform="google_jobs",
-            limit=limit,
-            job_type=job_type,
-            experience_level=experience_level,
-            salary_min=salary_min,
-            salary_max=salary_max
-        )
-
-        # Add skill matching if user_id provided
-        if user_id:
-            jobs = await add_skill_matching(jobs, user_id, db)
+        if cursor:
+            snapshot, offset, limit = _resolve_search_cursor(cursor, "enhanced")
+        else:
+            logger.info(f"🔍 Enhanced search: keywords='{keywords}', location='{location}'")
+            offset = (page - 1) * limit
+
+            # Use SerpAPI for real job data
+            searcher = serpapi_searcher
+
+            # Search using Google Jobs with enhanced filters
+            api_params = dict(
+                keywords=keywords,
+                location=location,
+                platform="google_jobs",
+                limit=max(limit * page, min(limit * LIVE_SNAPSHOT_PAGES, search_snapshots.max_results)),
+                job_type=job_type,
+                experience_level=experience_level,
+                salary_min=salary_min,
+                salary_max=salary_max
+            )
+            cached_jobs = await search_cache.get_or_compute(
+                "serpapi_search_jobs", api_params, lambda: searcher.search_jobs(**api_params)
+            )
+            ranked = bool(user_id) and sort_by == "match_score"
+
+            # Filters the API doesn't apply and the date/salary sorts, in one vectorized pass over
+            # the cached result set's columns (built on its first search). Match score ranking
+            # is per user, so it runs on the filtered jobs below
+            jobs = select_jobs(cached_jobs, sort_by="relevance" if ranked else sort_by,
+                               columns=cached_columns(cached_jobs), remote_only=remote_ok,
+                               posted_days=posted_days, region=region, near=near, radius_miles=radius_miles)
+            # Skill matching annotates the jobs per user; the cached ones stay untouched
+            jobs = [dict(job) for job in jobs]
+
+            # Add skill matching if user_id provided
+            if user_id:
+                jobs = await add_skill_matching(jobs, user_id, db)
+                if ranked:
+                    jobs = rank_jobs_by_match_score(jobs, user_id, db)
+
+            snapshot = search_snapshots.create(
+                "enhanced",
+                params={
+                    "keywords": keywords,
+                    "location": location,
+                    "job_type": job_type,
+                    "experience_level": experience_level,
+                    "salary_range": f"{salary_min}-{salary_max}" if salary_min or salary_max else None,
+                    "remote_ok": remote_ok,
+                    "region": region,
+                    "near": near,
+                    "radius_miles": radius_miles,
+                    "portals": ["google_jobs_massive", "serpapi_comprehensive"]
+                },
+                total=len(jobs),
+                items=jobs,
+                meta={"sort_by": sort_by, "posted_days": posted_days}
+            )
 
-        # Add pagination info
-        total_jobs = len(jobs)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_jobs = jobs[start_idx:end_idx]
+        paginated_jobs, _, next_cursor = _snapshot_page(db, snapshot, offset, limit, parse_fields(fields))
+        total_jobs = snapshot.total
 
-        return {
+        return FastJSONResponse({
             "jobs": paginated_jobs,
             "pagination": {
-                "current_page": page,
+                "current_page": offset // limit + 1,
                 "total_jobs": total_jobs,
                 "jobs_per_page": limit,
-                "total_pages": (total_jobs + limit - 1) // limit
-            },
-            "filters_applied": {
-                "keywords": keywords,
-                "location": location,
-                "job_type": job_type,
-                "experience_level": experience_level,
-                "salary_range": f"{salary_min}-{salary_max}" if salary_min or salary_max else None,
-                "remote_ok": remote_ok,
-                "portals": ["google_jobs_massive", "serpapi_comprehensive"]
+                "total_pages": (total_jobs + limit - 1) // limit,
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor
             },
+            "filters_applied": snapshot.params,
             "portals_searched": ["google_jobs_massive", "serpapi_comprehensive"],
             "search_metadata": {
                 "search_time": datetime.now().isoformat(),
-                "sort_by": sort_by,
-                "results_freshness": f"Posted within {posted_days} days"
+                "sort_by": snapshot.meta["sort_by"],
+                "results_freshness": f"Posted within {snapshot.meta['posted_days']} days"
             }
-        }
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job search error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Job search failed: {str(e)}")
@@ -708,7 +734,7 @@ async def search_jobs_serpapi(
             raise HTTPException(status_code=400, detail="Keywords are required")
         
         # Use SerpAPI to search for jobs
-        jobs = await serpapi_searcher.search_jobs(
+        api_params = dict(
             keywords=keywords,
             location=location,
             platform=platform,
@@ -718,10 +744,13 @@ async def search_jobs_serpapi(
             salary_min=salary_min,
             salary_max=salary_max
         )
+        jobs = await search_cache.get_or_compute(
+            "serpapi_search_jobs", api_params, lambda: serpapi_searcher.search_jobs(**api_params)
+        )
         
         logger.info(f"SerpAPI search completed: {len(jobs)} jobs found for '{keywords}' on {platform}")
         
-        return {
+        return FastJSONResponse({
             "jobs": jobs,
             "total": len(jobs),
             "platform": platform,
@@ -739,7 +768,7 @@ async def search_jobs_serpapi(
                 "powered_by": "SerpAPI",
                 "real_time": True
             }
-        }
+        })
         
     except HTTPException as he:
         raise he
@@ -837,6 +866,12 @@ async def get_job_filters():
             {"value": 14, "label": "Past 2 weeks"},
             {"value": 30, "label": "Past month"}
         ],
+        "radius_options": [
+            {"value": 10, "label": "Within 10 miles"},
+            {"value": 25, "label": "Within 25 miles"},
+            {"value": 50, "label": "Within 50 miles"},
+            {"value": 100, "label": "Within 100 miles"}
+        ],
         "sort_options": [
             {"value": "relevance", "label": "Most Relevant"},
             {"value": "date", "label": "Most Recent"},
@@ -855,8 +890,14 @@ async def add_skill_matching(jobs: List[Dict], user_id: int, db) -> List[Dict]:
 
         user_skills = extract_skills_from_resume(user_resume.parsed_data)
         
+        # Jobs already stored have their skills persisted from ingest
+        stored_skills = load_job_skills_by_url(db, [job['url'] for job in jobs if job.get('url')])
+        
         for job in jobs:
-            job_skills = extract_skills_from_job(job.get('description', '') + ' ' + job.get('requirements', ''))
+            if job.get('url') in stored_skills:
+                job_skills = [skill.skill.lower() for skill in stored_skills[job['url']]]
+            else:
+                job_skills = extract_skills_from_job(job.get('description', '') + ' ' + job.get('requirements', ''))
             
             # Calculate match percentage
             matching_skills = set(user_skills) & set(job_skills)
@@ -878,6 +919,35 @@ async def add_skill_matching(jobs: List[Dict], user_id: int, db) -> List[Dict]:
         logger.error(f"Skill matching error: {str(e)}")
         return jobs
 
+def rank_jobs_by_match_score(jobs: List[Dict], user_id: int, db) -> List[Dict]:
+    """
+    Sort job listings by match score. Listings in the user's recommendation
+    index use its precomputed (skill + semantic) score and come first; the
+    rest are scored by skills alone in one vectorized pass and follow. The
+    two scores aren't on the same footing, so each group is ranked on its own.
+    """
+    recommended = recommendation_index.scores_by_url(db, user_id)
+    scored = [job for job in jobs if job.get('url') in recommended]
+    unscored = [job for job in jobs if job.get('url') not in recommended]
+    for job in scored:
+        job['match_score'] = recommended[job['url']]
+    scored.sort(key=lambda job: job['match_score'], reverse=True)
+
+    if unscored:
+        try:
+            resume_text = jobs_api.load_resume_text(db, user_id, None)
+        except HTTPException as e:
+            logger.warning(f"Match score ranking skipped for user {user_id}: {e.detail}")
+            return scored + unscored
+
+        resume_skills = resume_analysis_cache.get_analysis(resume_text, user_id).skills
+        scores = rank_jobs(unscored, resume_skills)
+        for job, score in zip(unscored, scores):
+            job['match_score'] = round(score, 1)
+        unscored.sort(key=lambda job: job['match_score'], reverse=True)
+
+    return scored + unscored
+
 def extract_skills_from_resume(resume_data: Dict) -> List[str]:
     """Extract skills from resume data"""
     skills = []
@@ -889,77 +959,176 @@ def extract_skills_from_resume(resume_data: Dict) -> List[str]:
 
 def extract_skills_from_job(job_text: str) -> List[str]:
     """Extract required skills from job description"""
-    # Common tech skills patterns
-    tech_skills = [
-        'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js', 'typescript',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'sql', 'mongodb', 'postgresql',
-        'machine learning', 'ai', 'data science', 'html', 'css', 'rest api', 'graphql',
-        'agile', 'scrum', 'devops', 'ci/cd', 'jenkins', 'terraform', 'ansible'
-    ]
-    
-    job_text_lower = job_text.lower()
-    found_skills = []
-    
-    for skill in tech_skills:
-        if skill in job_text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    return [skill.lower() for skill in skill_taxonomy.current().find_skill_names(job_text)]
 
-@app.get("/api/jobs/list", response_model=List[JobResponse])
+@app.get("/api/jobs/list")
 async def list_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(Job).all()
-    return [JobResponse(
-        id=job.id,
-        title=job.title,
-        company=job.company,
-        location=job.location,
-        description=job.description,
-        requirements=job.requirements,
-        salary_range=job.salary_range,
-        job_type=job.job_type,
-        portal=job.portal,
-        url=job.url,
-        posted_date=job.posted_date,
-        created_at=job.created_at
-    ) for job in jobs]
+    return FastJSONResponse(json_array(job_payloads.payloads(db, shape='list')))
+
+@app.get("/api/jobs/{job_id:int}")
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    """A stored job with every field, including the full description and requirements"""
+    payloads = job_payloads.payloads(db, [job_id])
+    if not payloads:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return FastJSONResponse(orjson.Fragment(payloads[0]))
+
+@app.get("/api/jobs/recommendations/{user_id}")
+async def get_job_recommendations(user_id: int, limit: int = 20, min_score: Optional[float] = None,
+                                  db: Session = Depends(get_db)):
+    """User's best-matching stored jobs, read from the maintained recommendation index"""
+    try:
+        recommendations = recommendation_index.top_jobs(db, user_id, limit, min_score)
+        return {
+            "user_id": user_id,
+            "jobs": [{
+                "id": job.id,
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "url": job.url,
+                "platform": job.platform,
+                "salary": job.salary,
+                "job_type": job.job_type,
+                "posted_date": job.posted_date.isoformat() if job.posted_date else None,
+                "match_score": score
+            } for job, score in recommendations],
+            "total": len(recommendations)
+        }
+    except Exception as e:
+        logger.error(f"Recommendations error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to load recommendations: {str(e)}")
+
+@app.get("/api/jobs/stored/search")
+async def search_stored_jobs(
+    skills: str = "",  # comma-separated skill names or aliases, e.g. "kubernetes,python"
+    skills_mode: str = "all",  # all: every skill required, any: at least one
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Search stored jobs by required skills through the inverted skill index"""
+    if skills_mode not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="skills_mode must be 'all' or 'any'")
+
+    try:
+        skill_list = [skill.strip() for skill in skills.split(",") if skill.strip()]
+        skill_index.sync(db)
+        if skills_mode == "all":
+            job_ids = skill_index.query(all_of=skill_list)
+        else:
+            job_ids = skill_index.query(any_of=skill_list)
+
+        # Newest first; only the requested page is loaded
+        page_ids = job_ids[::-1][offset:offset + limit].tolist()
+        jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(page_ids))}
+
+        return {
+            "jobs": [{
+                "id": job.id,
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "url": job.url,
+                "platform": job.platform,
+                "salary": job.salary,
+                "job_type": job.job_type,
+                "posted_date": job.posted_date.isoformat() if job.posted_date else None
+            } for job in (jobs[job_id] for job_id in page_ids if job_id in jobs)],
+            "total": len(job_ids),
+            "skills": [skill_taxonomy.current().resolve(skill) or skill for skill in skill_list],
+            "skills_mode": skills_mode
+        }
+    except Exception as e:
+        logger.error(f"Stored job search error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Stored job search failed: {str(e)}")
 
 # Job application endpoints
 @app.post("/api/applications/apply")
 async def apply_to_job(job_id: int, user_id: int, db: Session = Depends(get_db)):
     try:
-        # Get job and user resume
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        resume = get_primary_resume(db, user_id)
-        if not resume:
-            raise HTTPException(status_code=404, detail="No primary resume found")
-        
-        # Generate cover letter
-        cover_letter = generate_cover_letter(job.description, resume.parsed_data)
-        
-        # Apply using auto applier
-        applier = AutoApplier()
-        application_result = await applier.apply_to_job(job, resume, cover_letter)
-        
+
+        # Browser launch, cover letter (pre-generated or generated now), resume file and
+        # questionnaire answers run concurrently; the user is waiting, so LLM calls are interactive
+        outcome = await run_application(db, user_id, job_id, priority=INTERACTIVE)
+
         # Save application record
         application = JobApplication(
             user_id=user_id,
             job_id=job_id,
-            status="applied",
-            applied_date=datetime.now(),
-            cover_letter=cover_letter
+            status="applied" if outcome.success else "failed",
+            applied_successfully=outcome.success,
+            completed_at=datetime.utcnow(),
+            application_data=application_record_data(outcome),
+            error_message=outcome.error,
+            stage_timings=outcome.stage_timings
         )
         db.add(application)
         db.commit()
-        
-        return {"message": "Application submitted successfully", "application_id": application.id}
+
+        if not outcome.success:
+            raise HTTPException(status_code=502, detail=f"Application was not submitted: {outcome.error}")
+
+        return {
+            "message": "Application submitted successfully",
+            "application_id": application.id,
+            "stage_timings": outcome.stage_timings
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Job application error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Job application failed: {str(e)}")
 
+@app.get("/api/cover-letters/stream/{job_id}")
+async def stream_cover_letter_endpoint(job_id: int, user_id: int, db: Session = Depends(get_db)):
+    """
+    Server-sent events with the cover letter for a job: a pre-generated letter
+    arrives in one event, otherwise text is sent as the model writes it.
+    Events are ``{"delta": "..."}`` followed by ``event: done``.
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    resume = get_primary_resume(db, user_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="No primary resume found")
+
+    resume_text = resume.parsed_data.get('text', '') if resume.parsed_data else ''
+    job_description, company, title = job.description or '', job.company, job.title
+    stored = get_letter(db, resume_text, job_id)
+
+    async def events():
+        if stored is not None:
+            yield f"data: {json.dumps({'delta': stored})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'pregenerated': True})}\n\n"
+            return
+
+        parts = []
+        try:
+            async for delta in stream_cover_letter(resume_text, job_description, company, title):
+                parts.append(delta)
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+        except Exception as e:
+            logger.error(f"Cover letter streaming error: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Cover letter generation failed'})}\n\n"
+            return
+
+        # The request's session may already be closed once streaming has started
+        session = SessionLocal()
+        try:
+            save_letter(session, user_id, job_id, resume_text, ''.join(parts).strip())
+        finally:
+            session.close()
+        yield f"event: done\ndata: {json.dumps({'pregenerated': False})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.get("/api/applications/list/{user_id}", response_model=List[JobApplicationResponse])
 async def list_applications(user_id: int, db: Session = Depends(get_db)):
     applications = db.query(JobApplication).filter(JobApplication.user_id == user_id).all()
@@ -987,6 +1156,7 @@ async def update_profile(user_id: int, profile: UserProfileUpdate, db: Session =
     try:
         enhanced_service = EnhancedProfileService(db)
         updated_profile = enhanced_service.update_profile(user_id, profile)
+        enqueue_user_rescoring(user_id)
         return updated_profile
     except Exception as e:
         logger.error(f"Profile update error: {str(e)}")
@@ -1130,6 +1300,11 @@ async def startup_event():
     # Start background services
     start_websocket_heartbeat()
     start_automation_scheduler()
+    # Index jobs stored before the search index (or by other paths) in a worker
+    enqueue_search_index_sync()
+    if os.getenv("MATCH_SEMANTIC_SCORER", "llm").lower() == "lexical":
+        # Corpus statistics for the lexical scorer, built in the background
+        stored_job_corpus.start()
     logger.info("Job Automation AI Backend Started Successfully!")
 
 # Job Saving/Bookmarking Endpoints
@@ -1153,15 +1328,20 @@ async def save_job(request: dict, db: Session = Depends(get_db)):
                 description=job_data.get("description", ""),
                 url=job_data.get("url", ""),
                 platform=job_data.get("platform", "web"),
-                salary=job_data.get("salary_range", ""),
                 job_type=job_data.get("job_type", ""),
                 posted_date=datetime.datetime.now(),
-                raw_data=json.dumps(job_data)
+                raw_data=json.dumps(job_data),
+                **salary_columns(job_salary(job_data)),
+                **location_columns(job_location(job_data))
             )
             db.add(new_job)
+            store_job_skills(db, new_job)
+            db.flush()
+            job_search_index.index_jobs(db, [new_job])
             db.commit()
             db.refresh(new_job)
             job_id = new_job.id
+            enqueue_new_job_scoring([job_id])
         else:
             job_id = existing_job.id
         
@@ -1192,31 +1372,17 @@ async def save_job(request: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to save job: {str(e)}")
 
 @app.get("/api/jobs/saved")
-async def get_saved_jobs(user_id: int = 1, db: Session = Depends(get_db)):
-    """Get all saved jobs for a user"""
+async def get_saved_jobs(user_id: int = 1, fields: str = "", db: Session = Depends(get_db)):
+    """Get all saved jobs for a user; ``fields`` as in /api/jobs/search"""
     try:
-        saved_applications = db.query(JobApplication).join(Job).filter(
-            JobApplication.user_id == user_id,
-            JobApplication.status == "saved"
-        ).all()
-        
-        saved_jobs = []
-        for app in saved_applications:
-            job = app.job
-            job_data = {
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.description,
-                "url": job.url,
-                "platform": job.platform,
-                "salary_range": job.salary,
-                "job_type": job.job_type,
-                "posted_date": job.posted_date.isoformat() if job.posted_date else None,
-                "saved_at": app.applied_at.isoformat() if app.applied_at else None
-            }
-            saved_jobs.append(job_data)
+        query, names = select_fields(
+            db.query(JobApplication).join(Job).filter(
+                JobApplication.user_id == user_id,
+                JobApplication.status == "saved"
+            ),
+            SAVED_FIELDS, parse_fields(fields) or SAVED_DEFAULT_FIELDS
+        )
+        saved_jobs = row_results(query, SAVED_FIELDS, names)
         
         return {"saved_jobs": saved_jobs, "total": len(saved_jobs)}
         
@@ -1268,6 +1434,7 @@ async def demo_job_redirect(job_title: str = "this position", company: str = "th
 async def shutdown_event():
     logger.info("Job Automation AI Backend Shutting Down...")
     stop_automation_scheduler()
+    llm_client.close()
     logger.info("Job Automation AI Backend Shutdown Complete!")
 
 if __name__ == "__main__":
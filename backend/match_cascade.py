@@ -0,0 +1,87 @@
+"""
+Match Cascade - Cheap skill score gates the expensive semantic (LLM) score
+Stage one is the local importance-weighted skill score, computed for every
+candidate. Only candidates at or above a skill-score threshold, capped at
+the best N per user, go on to stage two (the semantic scorer, whose LLM
+responses are cached by llm_cache). Everything else keeps its skill score.
+Funnel counts per stage are exported as Prometheus counters.
+"""
+
+import os
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+from prometheus_client import Counter
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+MATCH_CASCADE_JOBS = Counter(
+    'match_cascade_jobs_total',
+    'Jobs reaching each stage of the match cascade',
+    ['source', 'stage']  # stage: candidates, semantic, skipped, semantic_failed
+)
+
+class MatchCascade:
+    def __init__(self, min_skill_score: float = 50.0, top_n: int = 0):
+        self.min_skill_score = min_skill_score
+        # 0 means no cap: every candidate over the threshold reaches stage two
+        self.top_n = top_n
+        self._stats: Dict[str, int] = {'candidates': 0, 'semantic': 0, 'skipped': 0, 'semantic_failed': 0}
+
+    def select(self, skill_scores: Sequence[float], top_n: Optional[int] = None) -> List[int]:
+        """Indices of the candidates that go to stage two, best skill score first"""
+        top_n = self.top_n if top_n is None else top_n
+        scores = np.asarray(skill_scores, dtype=np.float64)
+        passed = np.flatnonzero(scores >= self.min_skill_score)
+        order = passed[np.argsort(-scores[passed], kind='stable')]
+        if top_n > 0:
+            order = order[:top_n]
+        return order.tolist()
+
+    def _record(self, source: str, stage: str, count: int):
+        if count:
+            self._stats[stage] += count
+            MATCH_CASCADE_JOBS.labels(source=source, stage=stage).inc(count)
+
+    def run(self, skill_scores: Sequence[float], semantic_scorer: Callable[[List[int]], List[Optional[float]]],
+            source: str, top_n: Optional[int] = None) -> List[Optional[float]]:
+        """
+        Semantic scores aligned with ``skill_scores``: ``semantic_scorer`` is
+        called once with the indices that passed stage one (so it can score
+        them concurrently); every other entry is None.
+        """
+        selected = self.select(skill_scores, top_n)
+        return self._merge(skill_scores, selected, semantic_scorer(selected) if selected else [], source)
+
+    async def run_async(self, skill_scores: Sequence[float],
+                        semantic_scorer: Callable[[List[int]], Awaitable[List[Optional[float]]]],
+                        source: str, top_n: Optional[int] = None) -> List[Optional[float]]:
+        """``run`` with a coroutine semantic scorer, for async callers"""
+        selected = self.select(skill_scores, top_n)
+        return self._merge(skill_scores, selected, await semantic_scorer(selected) if selected else [], source)
+
+    def _merge(self, skill_scores: Sequence[float], selected: List[int], scores: Sequence[Optional[float]],
+               source: str) -> List[Optional[float]]:
+        semantic_scores: List[Optional[float]] = [None] * len(skill_scores)
+        for index, score in zip(selected, scores):
+            semantic_scores[index] = score
+
+        failed = sum(1 for index in selected if semantic_scores[index] is None)
+        self._record(source, 'candidates', len(skill_scores))
+        self._record(source, 'semantic', len(selected))
+        self._record(source, 'skipped', len(skill_scores) - len(selected))
+        self._record(source, 'semantic_failed', failed)
+        logger.debug(f"Match cascade ({source}): {len(skill_scores)} candidates, {len(selected)} sent to semantic scorer")
+        return semantic_scores
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+# Global instance
+match_cascade = MatchCascade(
+    min_skill_score=float(os.getenv('MATCH_CASCADE_MIN_SKILL_SCORE', '50')),
+    top_n=int(os.getenv('MATCH_CASCADE_TOP_N', '25'))
+)
@@ -0,0 +1,180 @@
+"""
+Match Scoring - Incremental per-(user, job) match scores
+Scores are stored in job_match_scores and only computed for the delta: new
+jobs against active users, or one user's jobs after their resume or profile
+changes. The vectorized skill score is computed for every pair and only
+pairs that pass the match cascade are sent to the (expensive) semantic scorer.
+"""
+
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from enhanced_profile import EnhancedUserProfile
+from job_ingest import load_job_skills
+from job_ranker import SkillMatrixRanker
+from models import Job, JobMatchScore, Resume
+from recommendation_index import recommendation_index
+from resume_analysis_cache import resume_analysis_cache
+from skill_index import skill_index
+from skill_matcher import skill_matcher
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Jobs scraped within this many days are (re)scored when a user's resume changes
+SCORING_WINDOW_DAYS = int(os.getenv('MATCH_SCORING_WINDOW_DAYS', '30'))
+
+def load_user_resume_text(session: Session, user_id: int) -> Optional[str]:
+    """Text to score a user with: primary (or latest) resume, else a summary of the enhanced profile"""
+    resume = session.query(Resume).filter(
+        Resume.user_id == user_id,
+        Resume.is_primary == True
+    ).first()
+    if not resume:
+        resume = session.query(Resume).filter(
+            Resume.user_id == user_id
+        ).order_by(Resume.uploaded_at.desc()).first()
+
+    resume_text = resume.parsed_data.get('text', '') if resume and resume.parsed_data else ''
+    if resume_text:
+        return resume_text
+
+    profile = session.query(EnhancedUserProfile).filter(
+        EnhancedUserProfile.user_id == user_id
+    ).first()
+    if not profile:
+        return None
+
+    return (
+        f"Current Title: {profile.current_title or ''}\n"
+        f"Experience: {profile.years_experience or 0} years\n"
+        f"Skills: {', '.join(profile.technical_skills or [])}\n"
+        f"Education: {profile.highest_education or ''}"
+    )
+
+def active_user_ids(session: Session) -> List[int]:
+    """Users that can be scored: anyone with a resume or an enhanced profile"""
+    resume_users = {user_id for (user_id,) in session.query(Resume.user_id).distinct() if user_id is not None}
+    profile_users = {user_id for (user_id,) in session.query(EnhancedUserProfile.user_id) if user_id is not None}
+    return sorted(resume_users | profile_users)
+
+def recent_job_ids(session: Session, days: int = SCORING_WINDOW_DAYS) -> List[int]:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    return [job_id for (job_id,) in session.query(Job.id).filter(Job.scraped_at >= cutoff).order_by(Job.id)]
+
+def chunked(items: Sequence, size: int) -> List[list]:
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+def candidate_job_ids(session: Session, user_id: int, job_ids: Sequence[int]) -> List[int]:
+    """
+    The subset of ``job_ids`` worth scoring for a user: jobs sharing a skill
+    with them, jobs without skills, and jobs not in the skill index yet.
+    Every other job has a skill score of 0 and never reaches the semantic scorer.
+    """
+    resume_text = load_user_resume_text(session, user_id)
+    if not resume_text:
+        return list(job_ids)
+
+    skills = [skill.skill for skill in resume_analysis_cache.get_analysis(resume_text, user_id).skills]
+    skill_index.sync(session)
+    candidates = set(skill_index.candidate_job_ids(skills).tolist())
+    indexed = set(skill_index.query().tolist())
+    return [job_id for job_id in job_ids if job_id in candidates or job_id not in indexed]
+
+def drop_scores(session: Session, user_id: int, job_ids: Sequence[int]) -> int:
+    """Delete a user's stored scores for the given jobs; returns the number of rows removed"""
+    removed = 0
+    for job_chunk in chunked(job_ids, 500):
+        removed += session.query(JobMatchScore).filter(
+            JobMatchScore.user_id == user_id,
+            JobMatchScore.job_id.in_(job_chunk)
+        ).delete(synchronize_session=False)
+    session.commit()
+    recommendation_index.remove_user_jobs(user_id, job_ids)
+    return removed
+
+def _build_job_ranker(session: Session, job_ids: Sequence[int]):
+    """Skill matrix over the jobs plus their descriptions, for one chunk"""
+    jobs = session.query(Job.id, Job.description).filter(Job.id.in_(job_ids)).order_by(Job.id).all()
+    stored_skills = load_job_skills(session, [job_id for job_id, _ in jobs])
+    job_skills = [
+        stored_skills[job_id] if job_id in stored_skills
+        else skill_matcher.extract_skills_from_text(description or '')
+        for job_id, description in jobs
+    ]
+    descriptions = {job_id: description or '' for job_id, description in jobs}
+    return SkillMatrixRanker([job_id for job_id, _ in jobs], job_skills), descriptions
+
+def score_matches(session: Session, user_ids: Sequence[int], job_ids: Sequence[int]) -> Dict[str, int]:
+    """
+    Score every (user, job) pair of a chunk and upsert job_match_scores.
+    Pairs already scored from the same resume text are skipped, so retried or
+    duplicate chunks are cheap.
+    """
+    stats = {'scored': 0, 'skipped': 0, 'semantic': 0}
+    if not user_ids or not job_ids:
+        return stats
+
+    ranker, descriptions = _build_job_ranker(session, job_ids)
+    if not len(ranker):
+        return stats
+
+    for user_id in user_ids:
+        resume_text = load_user_resume_text(session, user_id)
+        if not resume_text:
+            continue
+
+        analysis = resume_analysis_cache.get_analysis(resume_text, user_id)
+        resume_hash = resume_analysis_cache.cache_key(resume_text)
+        existing = {
+            row.job_id: row for row in session.query(JobMatchScore).filter(
+                JobMatchScore.user_id == user_id,
+                JobMatchScore.job_id.in_(ranker.job_keys)
+            )
+        }
+
+        skill_scores = ranker.score(analysis.skills)
+        pending = []
+        for job_id, skill_score in zip(ranker.job_keys, skill_scores.tolist()):
+            row = existing.get(job_id)
+            if row is not None and row.resume_hash == resume_hash:
+                stats['skipped'] += 1
+                continue
+            pending.append((job_id, skill_score, row))
+
+        # Pairs that pass the match cascade go to the semantic scorer together, so LLM calls run concurrently
+        semantic_scores = dict(zip(
+            [job_id for job_id, _, _ in pending],
+            skill_matcher.cascade_semantic_scores(
+                resume_text, [skill_score for _, skill_score, _ in pending],
+                [descriptions[job_id] for job_id, _, _ in pending], source='background'
+            )
+        )) if pending else {}
+
+        now = datetime.utcnow()
+        fresh_scores = {}
+        for job_id, skill_score, row in pending:
+            semantic_score = semantic_scores.get(job_id)
+            if semantic_score is not None:
+                stats['semantic'] += 1
+
+            if row is None:
+                row = JobMatchScore(user_id=user_id, job_id=job_id)
+                session.add(row)
+            row.skill_score = round(skill_score, 1)
+            row.semantic_score = semantic_score
+            row.match_score = round(skill_matcher.combine_scores(skill_score, semantic_score), 1)
+            row.resume_hash = resume_hash
+            row.scored_at = now
+            fresh_scores[job_id] = row.match_score
+            stats['scored'] += 1
+
+        session.commit()
+        recommendation_index.update(user_id, fresh_scores)
+
+    return stats
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from db import Base
 import datetime
@@ -37,19 +37,116 @@ class Resume(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_location", "location_country", "location_region", "location_city"),
+        Index("ix_jobs_geo", "latitude", "longitude"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     company = Column(String, nullable=False)
-    location = Column(String)
+    location = Column(String)  # as scraped
+    location_city = Column(String)  # see location_normalizer
+    location_region = Column(String)  # region code within the country
+    location_country = Column(String)  # ISO 3166-1 alpha-2 code
+    remote = Column(Boolean)
+    hybrid = Column(Boolean)
+    latitude = Column(Float)  # for cities in the gazetteer
+    longitude = Column(Float)
+    location_parser_version = Column(String, index=True)  # location_normalizer version the columns came from
     description = Column(Text)
     url = Column(String, unique=True, nullable=False)
     platform = Column(String, nullable=False)  # indeed, dice, linkedin, etc.
-    salary = Column(String)
+    salary = Column(String)  # as scraped
+    salary_min = Column(Integer)  # annual, in salary_currency; see salary_normalizer
+    salary_max = Column(Integer)
+    salary_currency = Column(String)  # ISO 4217 code
+    salary_period = Column(String)  # hour, day, week, month, year: what the source quoted
+    salary_parser_version = Column(String, index=True)  # salary_normalizer version the columns came from
     job_type = Column(String)  # full-time, part-time, contract, etc.
     posted_date = Column(DateTime)
     scraped_at = Column(DateTime, default=datetime.datetime.utcnow)
     raw_data = Column(Text)  # JSON string of original scraped data
+    skills_taxonomy_version = Column(String, index=True)  # skill_matcher taxonomy used for job_skills
+    match_scored_at = Column(DateTime, index=True)  # when scoring against the active users was dispatched
     applications = relationship("JobApplication", back_populates="job")
+    skills = relationship("JobSkill", back_populates="job", cascade="all, delete-orphan")
+    match_scores = relationship("JobMatchScore", back_populates="job", cascade="all, delete-orphan")
+    cover_letters = relationship("CoverLetter", back_populates="job", cascade="all, delete-orphan")
+    search_document = relationship("JobSearchDocument", back_populates="job", uselist=False, cascade="all, delete-orphan")
+
+class JobSkill(Base):
+    __tablename__ = "job_skills"
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    skill = Column(String, nullable=False, index=True)  # canonical skill name from the taxonomy
+    category = Column(String, nullable=False)
+    confidence = Column(Float, nullable=False)
+    importance = Column(Integer, nullable=False)  # 1-5 scale
+
+    job = relationship("Job", back_populates="skills")
+
+class JobMatchScore(Base):
+    __tablename__ = "job_match_scores"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_job_match_scores_user_job"),
+        Index("ix_job_match_scores_user_score", "user_id", "match_score"),  # per-user top-K reads
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    match_score = Column(Float, nullable=False, index=True)  # 0-100, combined as in skill_matcher
+    skill_score = Column(Float, nullable=False)
+    semantic_score = Column(Float)  # None when the job was prefiltered out by skill score
+    resume_hash = Column(String, nullable=False)  # resume analysis cache key the score was computed from
+    scored_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    job = relationship("Job", back_populates="match_scores")
+
+class CoverLetter(Base):
+    __tablename__ = "cover_letters"
+    __table_args__ = (
+        UniqueConstraint("resume_hash", "job_id", "template_version", name="uq_cover_letters_resume_job_version"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    resume_hash = Column(String, nullable=False)  # sha256 of the resume text the letter was written from
+    template_version = Column(String, nullable=False)  # cover_letter_generator.COVER_LETTER_PROMPT_VERSION
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    job = relationship("Job", back_populates="cover_letters")
+
+class JobSearchDocument(Base):
+    """Filterable fields of a stored job for job_search_index; the text itself is in the full-text index"""
+    __tablename__ = "job_search_documents"
+    __table_args__ = (
+        Index("ix_job_search_documents_posted", "posted_date", "job_id"),  # newest-first pages
+        Index("ix_job_search_documents_type_posted", "job_type", "posted_date"),
+        Index("ix_job_search_documents_level_posted", "experience_level", "posted_date"),
+        Index("ix_job_search_documents_remote_posted", "remote", "posted_date"),
+        Index("ix_job_search_documents_salary", "salary_max", "salary_min"),
+        Index("ix_job_search_documents_currency_salary", "salary_currency", "salary_max", "salary_min"),
+        Index("ix_job_search_documents_region_posted", "country", "region", "posted_date"),
+        Index("ix_job_search_documents_geo", "latitude", "longitude"),
+    )
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    platform = Column(String, index=True)
+    job_type = Column(String)  # full-time, part-time, contract, temporary, internship
+    experience_level = Column(String)  # entry-level, mid-level, senior-level, executive
+    remote = Column(Boolean, nullable=False, default=False)
+    hybrid = Column(Boolean, nullable=False, default=False)
+    country = Column(String)  # ISO 3166-1 alpha-2 code
+    region = Column(String)  # region code within the country
+    latitude = Column(Float)
+    longitude = Column(Float)
+    salary_min = Column(Integer)  # annual, in salary_currency
+    salary_max = Column(Integer)
+    salary_currency = Column(String)  # ISO 4217 code
+    posted_date = Column(DateTime)
+    indexed_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    job = relationship("Job", back_populates="search_document")
 
 class JobApplication(Base):
     __tablename__ = "job_applications"
@@ -62,6 +159,7 @@ class JobApplication(Base):
     completed_at = Column(DateTime)
     application_data = Column(Text)  # JSON string of application details
     error_message = Column(Text)
+    stage_timings = Column(JSON)  # seconds per apply pipeline stage, plus 'total'
 
     # Relationships
     user = relationship("User", back_populates="applications")
@@ -0,0 +1,235 @@
+"""
+Prompt Builder - Token-budgeted resume / job description prompts
+Documents are counted with the model's local tokenizer (tiktoken) and, when
+they don't fit the per-call budget, split into sections (headings, then
+paragraphs). Sections are ranked by how many of the other document's skills
+they mention, weighted by skill importance, and the budget is filled with the
+most relevant ones. The kept sections are emitted in their original order.
+"""
+
+import os
+import re
+import math
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import tiktoken
+from dotenv import load_dotenv
+
+from skill_taxonomy import skill_taxonomy
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Token budgets for the documents in each prompt (resume + job description together)
+PROMPT_BUDGETS: Dict[str, int] = {
+    'match_jd': int(os.getenv('PROMPT_BUDGET_MATCH_JD', '1500')),
+    'ai_match_score': int(os.getenv('PROMPT_BUDGET_AI_MATCH', '1000')),
+    'cover_letter': int(os.getenv('PROMPT_BUDGET_COVER_LETTER', '2500')),
+}
+
+# Sections longer than this are split further, so one huge block can't crowd out the rest
+MAX_SECTION_TOKENS = int(os.getenv('PROMPT_MAX_SECTION_TOKENS', '250'))
+
+# Leftover budget below this isn't spent on a truncated section
+MIN_PARTIAL_SECTION_TOKENS = 20
+
+# Used when the tokenizer can't be loaded (tiktoken fetches its vocabulary on first use)
+_CHARS_PER_TOKEN = 4
+
+_SECTION_WORDS = {
+    'summary', 'profile', 'objective', 'about', 'skills', 'technical skills', 'experience',
+    'work experience', 'professional experience', 'employment', 'education', 'projects',
+    'certifications', 'publications', 'awards', 'languages', 'interests', 'responsibilities',
+    'requirements', 'qualifications', 'preferred qualifications', 'minimum qualifications',
+    'what you will do', "what you'll do", 'what we offer', 'benefits', 'about us',
+    'about the role', 'about the company', 'nice to have', 'who you are',
+}
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+def is_heading(line: str) -> bool:
+    """Short line that names a section: a known section word, ALL CAPS, or a few words ending in ':'"""
+    stripped = line.strip().strip('#*').strip()
+    if not stripped or len(stripped) > 40 or stripped[-1] in '.,;':
+        return False
+    if stripped.rstrip(':').lower() in _SECTION_WORDS:
+        return True
+    letters = [char for char in stripped if char.isalpha()]
+    if len(letters) >= 3 and all(char.isupper() for char in letters):
+        return True
+    return stripped.endswith(':') and len(stripped.split()) <= 5
+
+class PromptBuilder:
+    def __init__(self, max_section_tokens: int = MAX_SECTION_TOKENS):
+        self.max_section_tokens = max_section_tokens
+        self._encodings: Dict[str, Optional[object]] = {}
+        self._lock = threading.Lock()
+
+    # Tokens
+
+    def _encoding(self, model: str):
+        if model not in self._encodings:
+            with self._lock:
+                if model not in self._encodings:
+                    try:
+                        try:
+                            encoding = tiktoken.encoding_for_model(model)
+                        except KeyError:
+                            encoding = tiktoken.get_encoding('cl100k_base')
+                    except Exception as e:
+                        logger.warning(f"Tokenizer for {model} unavailable, estimating tokens from length: {e}")
+                        encoding = None
+                    self._encodings[model] = encoding
+        return self._encodings[model]
+
+    def count_tokens(self, text: str, model: str) -> int:
+        encoding = self._encoding(model)
+        if encoding is None:
+            return math.ceil(len(text) / _CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int, model: str) -> str:
+        """The longest prefix of ``text`` within ``max_tokens``"""
+        if max_tokens <= 0:
+            return ''
+        encoding = self._encoding(model)
+        if encoding is None:
+            limit = max_tokens * _CHARS_PER_TOKEN
+            if len(text) <= limit:
+                return text
+            cut = text.rfind(' ', 0, limit)
+            return text[:cut if cut > 0 else limit]
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    # Sections
+
+    def split_sections(self, text: str, model: str) -> List[str]:
+        """Heading-delimited blocks; oversized blocks are split by paragraph, then line, then sentence"""
+        blocks: List[List[str]] = [[]]
+        for line in text.splitlines():
+            if is_heading(line) and blocks[-1]:
+                blocks.append([])
+            blocks[-1].append(line)
+
+        sections = []
+        for block in blocks:
+            section = '\n'.join(block).strip()
+            if not section:
+                continue
+            if self.count_tokens(section, model) <= self.max_section_tokens:
+                sections.append(section)
+                continue
+
+            # Keep the heading on every piece so a later piece still says what it is
+            heading = block[0].strip() if is_heading(block[0]) else ''
+            body = '\n'.join(block[1:] if heading else block)
+            for piece in self._split_long(body, model):
+                sections.append(f"{heading}\n{piece}" if heading else piece)
+        return sections
+
+    def _split_long(self, text: str, model: str) -> List[str]:
+        pieces = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if self.count_tokens(paragraph, model) <= self.max_section_tokens:
+                pieces.append(paragraph)
+                continue
+
+            # Each unit is counted once; a piece's size is the sum of its units plus a token per line break
+            current: List[str] = []
+            current_tokens = 0
+            for line in self._units(paragraph, model):
+                line_tokens = self.count_tokens(line, model)
+                if current and current_tokens + 1 + line_tokens > self.max_section_tokens:
+                    pieces.append('\n'.join(current))
+                    current = []
+                    current_tokens = 0
+                current_tokens += line_tokens + (1 if current else 0)
+                current.append(line)
+            if current:
+                pieces.append('\n'.join(current))
+        return pieces
+
+    def _units(self, paragraph: str, model: str) -> List[str]:
+        """Lines of a paragraph, with over-long lines broken into sentences"""
+        units = []
+        for line in paragraph.splitlines():
+            if self.count_tokens(line, model) > self.max_section_tokens:
+                units.extend(sentence for sentence in _SENTENCE_BREAK.split(line) if sentence.strip())
+            else:
+                units.append(line)
+        return units
+
+    @staticmethod
+    def _relevance(section: str, wanted: Dict[str, int]) -> float:
+        """Importance-weighted count of ``wanted`` skills the section mentions"""
+        return float(sum(wanted.get(name, 0) for name in skill_taxonomy.current().find_skill_names(section)))
+
+    def select(self, text: str, other_text: str, budget: int, model: str) -> str:
+        """The sections of ``text`` most relevant to ``other_text`` that fit in ``budget`` tokens"""
+        text = (text or '').strip()
+        if self.count_tokens(text, model) <= budget:
+            return text
+
+        taxonomy = skill_taxonomy.current()
+        wanted = {skill.name: skill.importance for skill in taxonomy.find_skills(other_text or '')}
+        sections = self.split_sections(text, model)
+        ranked = sorted(
+            range(len(sections)),
+            # Most relevant first; the opening section (title, contact details) wins ties, then document order
+            key=lambda i: (-(self._relevance(sections[i], wanted) + (0.5 if i == 0 else 0)), i)
+        )
+
+        kept = set()
+        remaining = budget
+        for index in ranked:
+            # Separators between kept sections cost about a token each
+            cost = self.count_tokens(sections[index], model) + 1
+            if cost <= remaining:
+                kept.add(index)
+                remaining -= cost
+
+        # Spend what's left on the start of the most relevant section that didn't fit
+        leftover = next((i for i in ranked if i not in kept), None)
+        if leftover is not None and remaining > MIN_PARTIAL_SECTION_TOKENS:
+            partial = self.truncate(sections[leftover], remaining - 1, model)
+            if partial:
+                kept.add(leftover)
+                sections[leftover] = partial
+
+        return '\n\n'.join(sections[i] for i in sorted(kept))
+
+    def fit_pair(self, resume_text: str, job_description: str, budget: int,
+                 model: str) -> Tuple[str, str]:
+        """
+        Resume and job description trimmed to share ``budget`` tokens. Each gets
+        half; a document shorter than its half passes the rest to the other.
+        """
+        resume_text = resume_text or ''
+        job_description = job_description or ''
+        resume_tokens = self.count_tokens(resume_text, model)
+        job_tokens = self.count_tokens(job_description, model)
+        if resume_tokens + job_tokens <= budget:
+            return resume_text, job_description
+
+        half = budget // 2
+        if resume_tokens <= half:
+            resume_budget = resume_tokens
+        elif job_tokens <= half:
+            resume_budget = budget - job_tokens
+        else:
+            resume_budget = half
+        job_budget = budget - resume_budget
+
+        return (
+            self.select(resume_text, job_description, resume_budget, model),
+            self.select(job_description, resume_text, job_budget, model)
+        )
+
+# Global instance
+prompt_builder = PromptBuilder()
@@ -0,0 +1,162 @@
+"""
+Recommendation Index - Per-user top-K recommended jobs
+Each user's best matches are kept in a bounded structure (top
+RECOMMENDATION_TOP_K jobs at or above a score floor) that is updated as
+background scoring writes job_match_scores and as old jobs are cleaned up.
+Reading a user's best matches is then an O(K) read instead of scoring the
+corpus.
+
+Two backends:
+- ``sql`` (default): job_match_scores itself, read through its
+  (user_id, match_score) index.
+- ``redis``: one sorted set per user, trimmed to K on every update and
+  rebuilt from job_match_scores when missing. Removing entries (deleted
+  jobs, scores that fell below the floor) marks the set for a rebuild, so
+  jobs trimmed earlier move back up into the top K.
+"""
+
+import os
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from models import Job, JobMatchScore
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+class RecommendationIndex:
+    # Redis keys: one sorted set per user plus the set of users whose index is built
+    USERS_KEY = "recommendations:users"
+
+    def __init__(self, max_entries: int = 500, min_score: float = 50.0,
+                 backend: str = "sql", redis_url: Optional[str] = None):
+        self.max_entries = max_entries
+        self.min_score = min_score
+        self.redis = None
+        if backend == "redis":
+            from redis import Redis
+
+            self.redis = Redis.from_url(redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"recommendations:{user_id}"
+
+    def update(self, user_id: int, scores: Dict[int, float]):
+        """Merge fresh (job_id -> match score) results for a user into their top-K"""
+        if self.redis is None or not scores:
+            return
+
+        key = self._user_key(user_id)
+        keep = {job_id: score for job_id, score in scores.items() if score >= self.min_score}
+        drop = [job_id for job_id, score in scores.items() if score < self.min_score]
+        try:
+            pipe = self.redis.pipeline()
+            if keep:
+                pipe.zadd(key, keep)
+            if drop:
+                # A re-scored job can fall below the floor
+                pipe.zrem(key, *drop)
+            # Keep only the best max_entries members
+            pipe.zremrangebyrank(key, 0, -(self.max_entries + 1))
+            if drop:
+                # Refilled from the table on the next read
+                pipe.srem(self.USERS_KEY, user_id)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Recommendation index update failed for user {user_id}: {e}")
+
+    def remove_jobs(self, job_ids: Iterable[int]):
+        """Drop expired/deleted jobs from every user's top-K"""
+        job_ids = list(job_ids)
+        if self.redis is None or not job_ids:
+            return
+
+        try:
+            user_ids = self.redis.smembers(self.USERS_KEY)
+            pipe = self.redis.pipeline()
+            for user_id in user_ids:
+                pipe.zrem(self._user_key(int(user_id)), *job_ids)
+            removed = pipe.execute()
+            # Sets that lost members are refilled from the table on their next read
+            stale = [user_id for user_id, count in zip(user_ids, removed) if count]
+            if stale:
+                self.redis.srem(self.USERS_KEY, *stale)
+        except Exception as e:
+            logger.warning(f"Recommendation index cleanup failed: {e}")
+            return
+        logger.info(f"Removed {len(job_ids)} jobs from {len(user_ids)} recommendation lists")
+
+    def remove_user_jobs(self, user_id: int, job_ids: Iterable[int]):
+        """Drop jobs from one user's top-K (their scores were deleted)"""
+        job_ids = list(job_ids)
+        if self.redis is None or not job_ids:
+            return
+        try:
+            if self.redis.zrem(self._user_key(user_id), *job_ids):
+                # Refilled from the table on the next read
+                self.redis.srem(self.USERS_KEY, user_id)
+        except Exception as e:
+            logger.warning(f"Recommendation index update failed for user {user_id}: {e}")
+
+    def _top_from_table(self, session: Session, user_id: int, limit: int,
+                        min_score: float) -> List[Tuple[int, float]]:
+        rows = session.query(JobMatchScore.job_id, JobMatchScore.match_score).filter(
+            JobMatchScore.user_id == user_id,
+            JobMatchScore.match_score >= min_score
+        ).order_by(JobMatchScore.match_score.desc(), JobMatchScore.job_id).limit(limit)
+        return [(job_id, score) for job_id, score in rows]
+
+    def _rebuild_user(self, session: Session, user_id: int):
+        entries = self._top_from_table(session, user_id, self.max_entries, self.min_score)
+        key = self._user_key(user_id)
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        if entries:
+            pipe.zadd(key, dict(entries))
+        pipe.sadd(self.USERS_KEY, user_id)
+        pipe.execute()
+
+    def top(self, session: Session, user_id: int, limit: int = 50,
+            min_score: Optional[float] = None) -> List[Tuple[int, float]]:
+        """The user's best (job_id, match score) pairs, best first"""
+        limit = min(limit, self.max_entries)
+        min_score = self.min_score if min_score is None else max(min_score, self.min_score)
+        if limit <= 0:
+            return []
+
+        if self.redis is not None:
+            try:
+                if not self.redis.sismember(self.USERS_KEY, user_id):
+                    self._rebuild_user(session, user_id)
+                entries = self.redis.zrevrangebyscore(
+                    self._user_key(user_id), '+inf', min_score, start=0, num=limit, withscores=True
+                )
+                return [(int(job_id), score) for job_id, score in entries]
+            except Exception as e:
+                logger.warning(f"Recommendation index read failed for user {user_id}, using table: {e}")
+
+        return self._top_from_table(session, user_id, limit, min_score)
+
+    def top_jobs(self, session: Session, user_id: int, limit: int = 50,
+                 min_score: Optional[float] = None) -> List[Tuple[Job, float]]:
+        """Like ``top`` but with the Job rows loaded, in score order"""
+        entries = self.top(session, user_id, limit, min_score)
+        if not entries:
+            return []
+        jobs = {job.id: job for job in session.query(Job).filter(Job.id.in_([job_id for job_id, _ in entries]))}
+        return [(jobs[job_id], score) for job_id, score in entries if job_id in jobs]
+
+    def scores_by_url(self, session: Session, user_id: int) -> Dict[str, float]:
+        """URL -> match score for the user's top-K, for annotating live search results"""
+        return {job.url: score for job, score in self.top_jobs(session, user_id, self.max_entries)}
+
+# Global instance
+recommendation_index = RecommendationIndex(
+    max_entries=int(os.getenv('RECOMMENDATION_TOP_K', '500')),
+    min_score=float(os.getenv('RECOMMENDATION_MIN_SCORE', '50')),
+    backend=os.getenv('RECOMMENDATION_INDEX_BACKEND', 'sql').lower()
+)
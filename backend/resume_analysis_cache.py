@@ -0,0 +1,120 @@
+"""
+Resume Analysis Cache - Reuse resume skill/level analysis across match requests
+Entries are keyed by a SHA-256 of the resume text plus the skill taxonomy
+version, so an unchanged resume is analyzed once no matter how many jobs it is
+matched against. An optional Redis or SQLite tier shares entries across
+processes.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Set
+
+from dotenv import load_dotenv
+
+from ai_resume_analyzer import resume_analyzer
+from cache_utils import LRUCache, RedisStore, SQLiteStore
+from skill_matcher import skill_matcher, SkillMatch
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ResumeAnalysis:
+    skills: List[SkillMatch]
+    experience_level: str
+    education_level: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "ResumeAnalysis":
+        payload = json.loads(data)
+        return cls(
+            skills=[SkillMatch(**skill) for skill in payload['skills']],
+            experience_level=payload['experience_level'],
+            education_level=payload['education_level']
+        )
+
+class ResumeAnalysisCache:
+    def __init__(self, max_entries: int = 1024, shared_backend: str = ""):
+        self.memory = LRUCache(max_entries=max_entries)
+        self.shared = None
+        if shared_backend == "redis":
+            self.shared = RedisStore(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), prefix='resume_analysis:')
+        elif shared_backend == "sqlite":
+            self.shared = SQLiteStore(os.getenv('RESUME_CACHE_SQLITE_PATH', './resume_analysis_cache.db'), table='resume_analysis')
+
+        # user_id -> cache keys analyzed for that user, for invalidation
+        self._user_keys: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(resume_text: str) -> str:
+        digest = hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+        return f"{skill_matcher.taxonomy_version}:{digest}"
+
+    def get_analysis(self, resume_text: str, user_id: Optional[int] = None) -> ResumeAnalysis:
+        """Return the cached analysis of this resume text, analyzing it on a miss"""
+        key = self.cache_key(resume_text)
+        if user_id is not None:
+            with self._lock:
+                self._user_keys.setdefault(user_id, set()).add(key)
+
+        analysis = self.memory.get(key)
+        if analysis is not None:
+            self.hits += 1
+            return analysis
+
+        if self.shared is not None:
+            stored = self.shared.get(key)
+            if stored is not None:
+                analysis = ResumeAnalysis.from_json(stored)
+                self.memory.set(key, analysis)
+                self.hits += 1
+                return analysis
+
+        self.misses += 1
+        analysis = self._analyze(resume_text)
+        self.memory.set(key, analysis)
+        if self.shared is not None:
+            self.shared.set(key, analysis.to_json())
+        return analysis
+
+    def _analyze(self, resume_text: str) -> ResumeAnalysis:
+        return ResumeAnalysis(
+            skills=skill_matcher.extract_skills_from_text(resume_text),
+            experience_level=resume_analyzer._determine_experience_level(resume_text),
+            education_level=resume_analyzer._extract_education_level(resume_text)
+        )
+
+    def invalidate_user(self, user_id: int):
+        """Drop every analysis cached for a user (resume replaced or primary changed)"""
+        with self._lock:
+            keys = self._user_keys.pop(user_id, set())
+        for key in keys:
+            self.memory.delete(key)
+            if self.shared is not None:
+                self.shared.delete(key)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached resume analyses for user {user_id}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self.memory),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+# Global instance
+resume_analysis_cache = ResumeAnalysisCache(
+    max_entries=int(os.getenv('RESUME_CACHE_SIZE', '1024')),
+    shared_backend=os.getenv('RESUME_CACHE_BACKEND', '').lower()
+)
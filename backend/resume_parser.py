@@ -1,6 +1,7 @@
 import re
 from docx import Document
 from user_profile import extract_user_info
+from skill_taxonomy import skill_taxonomy
 
 def parse_resume(file_path: str) -> dict:
     document = Document(file_path)
@@ -42,8 +43,7 @@ def extract_location(text: str) -> str:
     return ""
 
 def extract_skills(text: str) -> list:
-    keywords = ["Java", "Spring Boot", "Python", "FastAPI", "React", "Node.js", "Docker", "Kubernetes", "AWS"]
-    return [word for word in keywords if word.lower() in text.lower()]
+    return skill_taxonomy.current().find_skill_names(text)
 
 def extract_summary(text: str) -> str:
     summary = ""
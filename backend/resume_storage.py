@@ -1,4 +1,5 @@
 import os
+import hashlib
 from pathlib import Path
 import json
 import boto3
@@ -6,6 +7,8 @@ from botocore.exceptions import BotoCoreError, NoCredentialsError
 
 STORAGE_DIR = Path(__file__).resolve().parent / "resume_storage"
 STORAGE_DIR.mkdir(exist_ok=True)
+# Downloaded resume files, for attaching to applications
+FILES_DIR = STORAGE_DIR / "files"
 
 MAX_RESUMES = 5
 
@@ -29,6 +32,23 @@ def upload_resume_to_s3(file_path: str, filename: str, user_id: str) -> str:
         print(f"S3 upload error: {e}")
         return ""
 
+def download_resume_from_s3(s3_url: str, filename: str) -> str:
+    """Local copy of an uploaded resume file for form uploads; reused until the URL changes"""
+    prefix = f"https://{AWS_S3_BUCKET}.s3.amazonaws.com/"
+    if not s3_url or not s3_url.startswith(prefix):
+        return ""
+    s3_key = s3_url[len(prefix):]
+    local_path = FILES_DIR / hashlib.sha256(s3_url.encode("utf-8")).hexdigest()[:16] / Path(filename).name
+    if local_path.exists():
+        return str(local_path)
+    try:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        s3_client.download_file(AWS_S3_BUCKET, s3_key, str(local_path))
+        return str(local_path)
+    except (BotoCoreError, NoCredentialsError) as e:
+        print(f"S3 download error: {e}")
+        return ""
+
 def get_user_resume_path(user_id: str) -> Path:
     return STORAGE_DIR / f"{user_id}.json"
 
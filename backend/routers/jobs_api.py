@@ -6,11 +6,14 @@ from dotenv import load_dotenv
 import logging
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
+from datetime import datetime
 
 # Import our skill matcher and database dependencies
 from skill_matcher import skill_matcher
 from db import get_db
-from models import User, Resume
+from job_ingest import load_job_skills
+from resume_analysis_cache import resume_analysis_cache
+from models import User, Resume, Job
 
 load_dotenv()
 
@@ -380,6 +383,19 @@ class JobMatchRequest(BaseModel):
     user_id: Optional[int] = None
     resume_text: Optional[str] = None  # If provided, use this instead of fetching user's resume
 
+class BatchJobItem(BaseModel):
+    job_id: str
+    job_title: str
+    job_description: str
+    company: str
+
+class BatchJobMatchRequest(BaseModel):
+    user_id: Optional[int] = None
+    resume_text: Optional[str] = None  # If provided, use this instead of fetching user's resume
+    jobs: List[BatchJobItem] = []  # Jobs sent inline by the client
+    job_ids: List[int] = []  # Stored jobs to load from the database
+    sort_by_score: bool = False
+
 class SkillMatchResponse(BaseModel):
     skill: str
     confidence: float
@@ -395,74 +411,63 @@ class JobMatchResponse(BaseModel):
     job_id: str
     analysis_timestamp: str
 
-@router.post("/jobs/match", response_model=JobMatchResponse)
-async def match_job_with_resume(
-    request: JobMatchRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Match a job description with user's resume to calculate:
-    - Match percentage (0-100%)
-    - Matched skills
-    - Missing skills
-    - Skill gap analysis
-    - Improvement recommendations
-    """
+class BatchJobMatchResponse(BaseModel):
+    results: List[JobMatchResponse]
+    total: int
+    missing_job_ids: List[int]
+    analysis_timestamp: str
+
+# Upper bound on jobs scored in one batch request
+MAX_BATCH_MATCH_JOBS = 100
+
+def load_resume_text(db: Session, user_id: Optional[int], resume_text: Optional[str]) -> str:
+    """Return the resume text to match against, loading the user's primary resume if needed"""
     
-    try:
-        resume_text = request.resume_text
+    # If no resume text provided and user_id is given, fetch user's primary resume
+    if not resume_text and user_id:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
         
-        # If no resume text provided and user_id is given, fetch user's primary resume
-        if not resume_text and request.user_id:
-            user = db.query(User).filter(User.id == request.user_id).first()
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            
-            # Get user's primary resume
+        # Get user's primary resume
+        primary_resume = db.query(Resume).filter(
+            Resume.user_id == user_id,
+            Resume.is_primary == True
+        ).first()
+        
+        if not primary_resume:
+            # Get the most recent resume if no primary
             primary_resume = db.query(Resume).filter(
-                Resume.user_id == request.user_id,
-                Resume.is_primary == True
-            ).first()
-            
-            if not primary_resume:
-                # Get the most recent resume if no primary
-                primary_resume = db.query(Resume).filter(
-                    Resume.user_id == request.user_id
-                ).order_by(Resume.created_at.desc()).first()
-            
-            if not primary_resume:
-                raise HTTPException(
-                    status_code=404, 
-                    detail="No resume found for user. Please upload a resume first."
-                )
-            
-            resume_text = primary_resume.parsed_data.get('text', '') if primary_resume.parsed_data else ''
-            
-            if not resume_text:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Resume text not available. Please re-upload your resume."
-                )
+                Resume.user_id == user_id
+            ).order_by(Resume.uploaded_at.desc()).first()
         
-        if not resume_text:
+        if not primary_resume:
             raise HTTPException(
-                status_code=400,
-                detail="Either resume_text or user_id must be provided"
+                status_code=404, 
+                detail="No resume found for user. Please upload a resume first."
             )
         
-        # Perform the matching
-        logger.info(f"Matching job '{request.job_title}' for user {request.user_id}")
+        resume_text = primary_resume.parsed_data.get('text', '') if primary_resume.parsed_data else ''
         
-        match_result = skill_matcher.match_job_with_resume(
-            resume_text=resume_text,
-            job_description=request.job_description,
-            user_id=request.user_id
+        if not resume_text:
+            raise HTTPException(
+                status_code=400,
+                detail="Resume text not available. Please re-upload your resume."
+            )
+    
+    if not resume_text:
+        raise HTTPException(
+            status_code=400,
+            detail="Either resume_text or user_id must be provided"
         )
-        
-        # Convert to response format
-        from datetime import datetime
-        
-        matched_skills_response = [
+    
+    return resume_text
+
+def _build_match_response(match_result, job_id: str, analysis_timestamp: str) -> JobMatchResponse:
+    """Convert a skill_matcher JobMatchResult into the API response model"""
+    return JobMatchResponse(
+        match_score=match_result.match_score,
+        matched_skills=[
             SkillMatchResponse(
                 skill=skill.skill,
                 confidence=skill.confidence,
@@ -470,9 +475,8 @@ async def match_job_with_resume(
                 importance=skill.importance
             )
             for skill in match_result.matched_skills
-        ]
-        
-        missing_skills_response = [
+        ],
+        missing_skills=[
             SkillMatchResponse(
                 skill=skill.skill,
                 confidence=skill.confidence,
@@ -480,7 +484,40 @@ async def match_job_with_resume(
                 importance=skill.importance
             )
             for skill in match_result.missing_skills
-        ]
+        ],
+        skill_gap_analysis=match_result.skill_gap_analysis,
+        recommendations=match_result.recommendations,
+        job_id=job_id,
+        analysis_timestamp=analysis_timestamp
+    )
+
+@router.post("/jobs/match", response_model=JobMatchResponse)
+async def match_job_with_resume(
+    request: JobMatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Match a job description with user's resume to calculate:
+    - Match percentage (0-100%)
+    - Matched skills
+    - Missing skills
+    - Skill gap analysis
+    - Improvement recommendations
+    """
+    
+    try:
+        resume_text = load_resume_text(db, request.user_id, request.resume_text)
+        
+        # Perform the matching
+        logger.info(f"Matching job '{request.job_title}' for user {request.user_id}")
+        
+        resume_analysis = resume_analysis_cache.get_analysis(resume_text, request.user_id)
+        match_result = await skill_matcher.match_job_with_resume_async(
+            resume_text=resume_text,
+            job_description=request.job_description,
+            user_id=request.user_id,
+            resume_skills=resume_analysis.skills
+        )
         
         logger.info(
             f"Job match complete: {match_result.match_score}% match, "
@@ -488,15 +525,7 @@ async def match_job_with_resume(
             f"{len(match_result.missing_skills)} missing skills"
         )
         
-        return JobMatchResponse(
-            match_score=match_result.match_score,
-            matched_skills=matched_skills_response,
-            missing_skills=missing_skills_response,
-            skill_gap_analysis=match_result.skill_gap_analysis,
-            recommendations=match_result.recommendations,
-            job_id=request.job_id,
-            analysis_timestamp=datetime.now().isoformat()
-        )
+        return _build_match_response(match_result, request.job_id, datetime.now().isoformat())
         
     except HTTPException:
         raise
@@ -506,3 +535,82 @@ async def match_job_with_resume(
             status_code=500,
             detail=f"Job matching failed: {str(e)}"
         )
+
+@router.post("/jobs/match/batch", response_model=BatchJobMatchResponse)
+async def match_jobs_batch(
+    request: BatchJobMatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Match many jobs against one resume in a single request.
+    
+    The resume is loaded and analyzed once and shared by every job, so a
+    page of job cards costs one request instead of one per card. Jobs can be
+    sent inline (``jobs``) or referenced by stored job ID (``job_ids``).
+    """
+    
+    try:
+        total_requested = len(request.jobs) + len(request.job_ids)
+        if total_requested == 0:
+            raise HTTPException(status_code=400, detail="At least one job or job_id must be provided")
+        if total_requested > MAX_BATCH_MATCH_JOBS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch can match at most {MAX_BATCH_MATCH_JOBS} jobs"
+            )
+        
+        resume_text = load_resume_text(db, request.user_id, request.resume_text)
+        resume_skills = resume_analysis_cache.get_analysis(resume_text, request.user_id).skills
+        
+        # (job_id, job_description, stored job skills or None) to score
+        jobs_to_match = [(job.job_id, job.job_description, None) for job in request.jobs]
+        
+        missing_job_ids = []
+        if request.job_ids:
+            stored_jobs = {
+                job.id: job
+                for job in db.query(Job).filter(Job.id.in_(request.job_ids)).all()
+            }
+            # Skills persisted at ingest; stale or missing entries are re-extracted
+            stored_skills = load_job_skills(db, stored_jobs.keys())
+            for job_id in request.job_ids:
+                stored_job = stored_jobs.get(job_id)
+                if stored_job is None:
+                    missing_job_ids.append(job_id)
+                    continue
+                jobs_to_match.append((str(job_id), stored_job.description or '', stored_skills.get(job_id)))
+        
+        logger.info(f"Batch matching {len(jobs_to_match)} jobs for user {request.user_id}")
+        
+        analysis_timestamp = datetime.now().isoformat()
+        # One cascade over the whole batch: top-N applies across it and LLM calls run concurrently
+        match_results = await skill_matcher.match_jobs_with_resume_async(
+            resume_text,
+            [(job_description, job_skills) for _, job_description, job_skills in jobs_to_match],
+            resume_skills=resume_skills
+        )
+        results = [
+            _build_match_response(match_result, job_id, analysis_timestamp)
+            for (job_id, _, _), match_result in zip(jobs_to_match, match_results)
+        ]
+        
+        if request.sort_by_score:
+            results.sort(key=lambda result: result.match_score, reverse=True)
+        
+        logger.info(f"Batch job match complete: {len(results)} jobs scored, {len(missing_job_ids)} not found")
+        
+        return BatchJobMatchResponse(
+            results=results,
+            total=len(results),
+            missing_job_ids=missing_job_ids,
+            analysis_timestamp=analysis_timestamp
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch job matching: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch job matching failed: {str(e)}"
+        )
@@ -0,0 +1,183 @@
+"""
+Salary Normalizer - One salary parser for every job source
+Salary text arrives as "$120,000 - $150,000", "80K-120K a year",
+"$45 - $60 an hour", "€60.000 - €70.000" and so on. ``parse_salary`` turns it
+into annual min/max amounts, a currency code and the period the source
+quoted, so that salaries in the same currency compare across sources. Jobs
+are normalized once at ingest (``job_salary`` + ``salary_columns``) into
+columns on jobs, which the search index copies onto its documents; rows
+stored before, or under an older parser version, are brought up to date in
+batches by job_ingest.normalize_stored_salaries.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Bump when parsing changes, so stored jobs are normalized again
+SALARY_PARSER_VERSION = '2'
+
+DEFAULT_CURRENCY = 'USD'
+
+# Periods a salary is quoted per, and how many of each make a working year
+ANNUAL_FACTORS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+# Longest first, so 'CA$' isn't read as '$'
+_CURRENCY_SYMBOLS = [
+    ('CA$', 'CAD'), ('AU$', 'AUD'), ('US$', 'USD'), ('C$', 'CAD'), ('A$', 'AUD'),
+    ('$', 'USD'), ('£', 'GBP'), ('€', 'EUR'), ('₹', 'INR'), ('¥', 'JPY'),
+]
+_CURRENCY_CODE = re.compile(r'\b(USD|CAD|AUD|NZD|GBP|EUR|CHF|INR|JPY|SGD)\b', re.I)
+# Checked in order
+_PERIODS = [
+    ('hour', re.compile(r'\b(hour|hourly|hr|hrs)\b', re.I)),
+    ('day', re.compile(r'\b(day|daily|diem)\b', re.I)),
+    ('week', re.compile(r'\b(week|weekly|wk)\b', re.I)),
+    ('month', re.compile(r'\b(month|monthly|mo|mth)\b', re.I)),
+    ('year', re.compile(r'\b(year|yearly|annual|annually|annum|yr|pa)\b', re.I)),
+]
+# Thousands grouped by ',' (decimal '.'), by '.' (decimal ','), or by spaces; else a plain number
+_AMOUNT = re.compile(
+    r'(?<![\d.,])(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?'
+    r'|\d+(?:[.,]\d+)?)(?!\d)(?:\s*([kKmM])(?![a-zA-Z]))?'
+)
+_COMMA_GROUPED = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?')
+_MULTIPLIERS = {'k': 1000, 'm': 1000000}
+# Text between the two ends of a range: "$80,000 - $100,000", "€60.000 – €70.000", "80K to 120K"
+_RANGE_JOIN = re.compile(r'\s*(?:-|–|—|to)\s*(?:[A-Z]{3}\s*)?(?:[A-Z]{0,2}[$£€₹¥])?\s*', re.I)
+# Numbers that aren't pay: "3+ years", "5-7 yrs", "10% bonus", "401(k)"
+_NOT_PAY = re.compile(r'\+?\s*(?:years?|yrs?)\b|\s*%', re.I)
+_RETIREMENT_PLAN = re.compile(r'\b401\s*\(?k\)?', re.I)
+# Annual amounts below this aren't salaries (years of experience, percentages)
+_MIN_ANNUAL = 1000
+
+class Salary(NamedTuple):
+    min: Optional[int]  # annual, in ``currency``
+    max: Optional[int]
+    currency: Optional[str]  # ISO 4217 code
+    period: Optional[str]  # hour, day, week, month or year, as quoted by the source
+    raw: str = ''
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'raw': self.raw, 'min': self.min, 'max': self.max, 'currency': self.currency, 'period': self.period}
+
+def _currency(text: str, default: str) -> str:
+    match = _CURRENCY_CODE.search(text)
+    if match:
+        return match.group(1).upper()
+    return next((code for symbol, code in _CURRENCY_SYMBOLS if symbol in text), default)
+
+def _value(number: str) -> float:
+    number = re.sub(r'[ \u00a0\u202f]', '', number)
+    if _COMMA_GROUPED.fullmatch(number):
+        return float(number.replace(',', ''))
+    # "60.000" and "60.000,50" group thousands with '.'; "45,50" has a decimal comma
+    if re.fullmatch(r'\d{1,3}(?:\.\d{3})+(?:,\d+)?', number):
+        number = number.replace('.', '')
+    return float(number.replace(',', '.'))
+
+def _ranges(text: str) -> List[List[float]]:
+    """
+    The amounts in ``text``, grouped into ranges (one amount, or both ends of
+    "A - B"). Ranges followed by years or a percent sign, and 401(k)s, are skipped.
+    """
+    text = _RETIREMENT_PLAN.sub(' ', text)
+    ranges: List[List[float]] = []
+    current: List = []  # (value, suffix) pairs of the range being read
+    previous_end = None
+    for match in _AMOUNT.finditer(text):
+        number, suffix = match.group(1), (match.group(2) or '').lower()
+        joined = previous_end is not None and _RANGE_JOIN.fullmatch(text, previous_end, match.start())
+        if current and not joined:
+            ranges.append(current)
+            current = []
+        current.append((_value(number), suffix))
+        previous_end = match.end()
+        if _NOT_PAY.match(text, match.end()):
+            current.pop()
+            # "5-7 years": the other end goes too, unless it's an amount ("$120k - 2 years")
+            if current and not current[0][1] and current[0][0] < 100:
+                current = []
+            if current:
+                ranges.append(current)
+            current, previous_end = [], None
+    if current:
+        ranges.append(current)
+
+    amounts = []
+    for amounts_and_suffixes in ranges:
+        values = [value * _MULTIPLIERS[suffix] if suffix else value for value, suffix in amounts_and_suffixes[:2]]
+        # "80-120K": the suffix on one end of a range applies to both
+        if len(values) == 2:
+            (_, first), (_, second) = amounts_and_suffixes[:2]
+            if bool(first) != bool(second):
+                bare, suffix = (0, second) if second else (1, first)
+                if values[bare] < 1000:
+                    values[bare] *= _MULTIPLIERS[suffix]
+        amounts.append(values)
+    return amounts
+
+def parse_salary(text: Optional[str], default_currency: str = DEFAULT_CURRENCY) -> Salary:
+    """
+    Annual salary range from free text. Ranges give min and max, single
+    amounts both; without a stated period, amounts of 10,000 or more are
+    annual and amounts under 200 hourly. Years of experience, percentages
+    and 401(k)s are skipped. Unparseable text gives None amounts.
+    """
+    raw = (text or '').strip()
+    ranges = _ranges(raw)
+    if not ranges:
+        return Salary(None, None, None, None, raw)
+
+    # The salary is the range with the largest amount; within it, drop a stray
+    # small end ("2 - 120,000")
+    amounts = max(ranges, key=max)
+    largest = max(amounts)
+    amounts = [amount for amount in amounts if amount >= largest / 20]
+
+    period = next((name for name, pattern in _PERIODS if pattern.search(raw)), None)
+    if period is None:
+        if largest >= 10000:
+            period = 'year'
+        elif largest < 200:
+            period = 'hour'
+        else:
+            return Salary(None, None, None, None, raw)
+
+    low, high = (int(round(amount * ANNUAL_FACTORS[period])) for amount in (min(amounts), max(amounts)))
+    if high < _MIN_ANNUAL:
+        return Salary(None, None, None, None, raw)
+    return Salary(low, high, _currency(raw, default_currency), period, raw)
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def job_salary(job: Dict[str, Any]) -> Salary:
+    """
+    Normalized salary of a job dict from any source: numeric annual bounds
+    (salary_range_min/max), an already-normalized salary dict (SerpAPI), or
+    salary text (salary, salary_range)
+    """
+    salary = job.get('salary')
+    text = job.get('salary_range')
+    text = text if isinstance(text, str) else ''
+    low, high = job.get('salary_range_min'), job.get('salary_range_max')
+    if _number(low) and _number(high):
+        return Salary(int(low), int(high), job.get('salary_currency') or DEFAULT_CURRENCY,
+                      job.get('salary_period') or 'year', text or (salary if isinstance(salary, str) else ''))
+    if isinstance(salary, dict):
+        if salary.get('period') and _number(salary.get('min')) and _number(salary.get('max')):
+            return Salary(int(salary['min']), int(salary['max']), salary.get('currency') or DEFAULT_CURRENCY,
+                          salary['period'], salary.get('raw') or '')
+        return parse_salary(salary.get('raw') or text)
+    return parse_salary(salary if isinstance(salary, str) and salary else text)
+
+def salary_columns(salary: Salary) -> Dict[str, Any]:
+    """Job column values for a normalized salary"""
+    return {
+        'salary': salary.raw or None,
+        'salary_min': salary.min,
+        'salary_max': salary.max,
+        'salary_currency': salary.currency,
+        'salary_period': salary.period,
+        'salary_parser_version': SALARY_PARSER_VERSION,
+    }
@@ -0,0 +1,333 @@
+"""
+Sample Jobs - Seeded, lazily generated demo jobs
+Live searches are padded with sample jobs when SerpAPI returns few results
+or none. Job i of a query is a pure function of (SAMPLE_JOBS_SEED, query,
+i): its filterable fields come from a counter-based hash of i, its text
+from a random.Random seeded with i. Any job can be produced without the
+ones before it, and the same query shows the same jobs on every call. A
+search builds filter columns for the sample jobs in a few vectorized NumPy
+operations; whole job dicts are only built for the page being served.
+"""
+
+import os
+import base64
+import random
+import string
+import hashlib
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from cache_utils import LRUCache
+from job_columns import Categorical, JobColumns, region_key
+from job_search_index import normalize_experience_level, normalize_job_type
+from location_normalizer import parse_location
+
+load_dotenv()
+
+SAMPLE_JOBS_SEED = int(os.getenv('SAMPLE_JOBS_SEED', '0'))
+
+COMPANIES = [
+    "Google", "Microsoft", "Apple", "Amazon", "Meta", "Netflix", "Tesla", "SpaceX",
+    "Uber", "Airbnb", "Stripe", "Shopify", "Atlassian", "GitHub", "Slack", "Discord",
+    "Figma", "Notion", "Zoom", "Salesforce", "Oracle", "IBM", "Intel", "NVIDIA",
+    "Adobe", "Autodesk", "Dropbox", "Box", "Twilio", "Square", "PayPal", "eBay",
+    "LinkedIn", "Twitter", "Pinterest", "Snapchat", "TikTok", "WhatsApp", "Instagram",
+    "Spotify", "SoundCloud", "Pandora", "Medium", "Substack", "WordPress", "Wix",
+    "Canva", "InVision", "Sketch", "Framer", "Webflow", "Squarespace", "Mailchimp",
+    "HubSpot", "Zendesk", "Intercom", "Segment", "Mixpanel", "Amplitude", "DataDog",
+    "New Relic", "Splunk", "Elastic", "MongoDB", "Redis", "Snowflake", "Databricks",
+    "Palantir", "Confluent", "HashiCorp", "Docker", "Kubernetes", "GitLab", "Bitbucket",
+    "JetBrains", "Unity", "Epic Games", "Riot Games", "Blizzard", "EA", "Ubisoft",
+    "McKinsey", "BCG", "Bain", "Deloitte", "PwC", "EY", "KPMG", "Accenture",
+    "Goldman Sachs", "JPMorgan", "Morgan Stanley", "BlackRock", "Citadel", "Two Sigma",
+    "Jane Street", "DE Shaw", "Bridgewater", "AQR", "Renaissance Technologies",
+    "Coinbase", "Binance", "Kraken", "Gemini", "FTX", "Circle", "Ripple", "ConsenSys",
+    "OpenAI", "Anthropic", "Cohere", "Hugging Face", "Scale AI", "Weights & Biases",
+    "Airbnb", "DoorDash", "Instacart", "Postmates", "Grubhub", "Seamless", "Caviar"
+] + [f"TechCorp {i}" for i in range(1, 101)] + [f"InnovateLabs {i}" for i in range(1, 51)]
+
+JOB_TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Staff Software Engineer", "Principal Software Engineer",
+    "Full Stack Developer", "Frontend Developer", "Backend Developer", "DevOps Engineer",
+    "Data Scientist", "Senior Data Scientist", "Principal Data Scientist", "Data Engineer",
+    "Machine Learning Engineer", "AI Engineer", "Deep Learning Engineer", "Research Scientist",
+    "Product Manager", "Senior Product Manager", "Principal Product Manager", "VP of Product",
+    "Engineering Manager", "Senior Engineering Manager", "Director of Engineering", "VP of Engineering",
+    "Designer", "UX Designer", "UI Designer", "Product Designer", "Senior Designer",
+    "Marketing Manager", "Growth Manager", "Digital Marketing Manager", "Content Manager",
+    "Sales Representative", "Account Executive", "Sales Manager", "Business Development",
+    "Business Analyst", "Data Analyst", "Financial Analyst", "Operations Analyst",
+    "Project Manager", "Program Manager", "Scrum Master", "Agile Coach",
+    "Security Engineer", "Cybersecurity Analyst", "InfoSec Specialist", "Penetration Tester",
+    "Cloud Architect", "Solutions Architect", "Technical Architect", "System Administrator",
+    "Database Administrator", "Site Reliability Engineer", "Platform Engineer", "Infrastructure Engineer",
+    "QA Engineer", "Test Automation Engineer", "Performance Engineer", "Release Engineer",
+    "Technical Writer", "Developer Advocate", "Customer Success Manager", "Support Engineer"
+]
+
+LOCATIONS = [
+    "San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Boston, MA",
+    "Los Angeles, CA", "Chicago, IL", "Denver, CO", "Atlanta, GA", "Miami, FL",
+    "Portland, OR", "San Diego, CA", "Phoenix, AZ", "Dallas, TX", "Houston, TX",
+    "Washington, DC", "Philadelphia, PA", "Minneapolis, MN", "Detroit, MI", "Nashville, TN",
+    "Remote", "Remote - US", "Remote - Global", "Hybrid - SF", "Hybrid - NYC",
+    "London, UK", "Berlin, Germany", "Paris, France", "Amsterdam, Netherlands", "Toronto, Canada",
+    "Singapore", "Tokyo, Japan", "Sydney, Australia", "Tel Aviv, Israel", "Bangalore, India"
+]
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "Go", "Rust", "Swift", "Kotlin",
+    "React", "Vue.js", "Angular", "Node.js", "Express", "Django", "Flask", "FastAPI",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Jenkins", "CI/CD",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Kafka", "RabbitMQ",
+    "Git", "Linux", "Agile", "Scrum", "REST APIs", "GraphQL", "Microservices",
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy",
+    "Figma", "Sketch", "Adobe Creative Suite", "Photoshop", "Illustrator"
+]
+
+BENEFITS = [
+    "Health Insurance", "401k Match", "Stock Options", "Unlimited PTO",
+    "Remote Work", "Flexible Hours", "Learning Budget", "Gym Membership",
+    "Free Lunch", "Commuter Benefits", "Parental Leave", "Mental Health Support"
+]
+
+PORTALS = ["linkedin", "indeed", "glassdoor", "dice", "ziprecruiter"]
+
+# Weighted towards full-time
+JOB_TYPES = ["full-time", "full-time", "full-time", "part-time", "contract"]
+
+EXPERIENCE_LEVELS = ["entry-level", "mid-level", "senior-level"]
+
+# Portal: (URL prefix, demo ID as a numeric range or an alphanumeric length)
+_PORTAL_URLS: Dict[str, Tuple[str, Any]] = {
+    "linkedin": ("https://www.linkedin.com/jobs/view/", (3000000000, 3999999999)),
+    "indeed": ("https://www.indeed.com/viewjob?jk=", 16),
+    "glassdoor": ("https://www.glassdoor.com/job-listing/", (4000000, 4999999)),
+    "dice": ("https://www.dice.com/jobs/detail/", 12),
+    "ziprecruiter": ("https://www.ziprecruiter.com/jobs/", 10),
+}
+
+_ID_CHARS = string.ascii_lowercase + string.digits
+
+# Salary bands by seniority (senior, manager, junior, other): min range and spread range
+_BAND_MIN_LOW = np.array([120000, 140000, 60000, 80000])
+_BAND_MIN_HIGH = np.array([180000, 220000, 90000, 130000])
+_BAND_SPREAD_LOW = np.array([40000, 50000, 20000, 30000])
+_BAND_SPREAD_HIGH = np.array([100000, 150000, 40000, 70000])
+
+_PLACES = [parse_location(location) for location in LOCATIONS]
+_REMOTE_LOCATIONS = np.array([place.remote for place in _PLACES])
+_LOCATION_LATITUDES = np.array([np.nan if place.latitude is None else place.latitude for place in _PLACES])
+_LOCATION_LONGITUDES = np.array([np.nan if place.longitude is None else place.longitude for place in _PLACES])
+_COUNTRY_CATEGORIES = list(dict.fromkeys(place.country for place in _PLACES if place.country))
+_COUNTRY_CODES = np.array([_COUNTRY_CATEGORIES.index(place.country) if place.country else -1 for place in _PLACES])
+_REGION_CATEGORIES = list(dict.fromkeys(region_key(place.country, place.region) for place in _PLACES if place.region))
+_REGION_CODES = np.array([_REGION_CATEGORIES.index(region_key(place.country, place.region)) if place.region else -1
+                          for place in _PLACES])
+
+_JOB_TYPE_CATEGORIES = list(dict.fromkeys(normalize_job_type(job_type) for job_type in JOB_TYPES))
+_JOB_TYPE_CODES = np.array([_JOB_TYPE_CATEGORIES.index(normalize_job_type(job_type)) for job_type in JOB_TYPES])
+_LEVEL_CATEGORIES = [normalize_experience_level(level) for level in EXPERIENCE_LEVELS]
+
+# One draw per field, each from its own hash stream
+_TITLE, _COMPANY, _LOCATION, _SALARY_MIN, _SALARY_SPREAD, _DAYS, _PORTAL, _JOB_TYPE, _REMOTE = range(9)
+
+def _salary_band(title: str) -> int:
+    if "Senior" in title or "Staff" in title or "Principal" in title:
+        return 0
+    if "Manager" in title or "Director" in title or "VP" in title:
+        return 1
+    if "Intern" in title or "Junior" in title or "Associate" in title:
+        return 2
+    return 3
+
+def _experience_level(title: str) -> int:
+    if "Junior" in title or "Intern" in title:
+        return 0
+    if "Senior" in title or "Staff" in title or "Principal" in title:
+        return 2
+    return 1
+
+@lru_cache(maxsize=256)
+def title_pool(keywords: str) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """Titles containing the query (every title when none does), their salary bands and levels"""
+    titles = tuple(title for title in JOB_TITLES if keywords and keywords in title.lower()) or tuple(JOB_TITLES)
+    return (titles, np.array([_salary_band(title) for title in titles]),
+            np.array([_experience_level(title) for title in titles]))
+
+# Sample-job columns of recent searches, by (keywords, seed, anchor, count); they are never mutated
+_columns_cache = LRUCache(max_entries=32)
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer; uint64 arithmetic wraps
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+class SampleJobs:
+    """The unbounded sample-job sequence of one query; ``jobs[i]`` is built on demand"""
+
+    def __init__(self, keywords: str = "", seed: int = SAMPLE_JOBS_SEED, anchor: Optional[date] = None):
+        self.keywords = keywords.strip().lower()
+        self.seed = seed
+        # Posted dates count back from the anchor day, so they don't move within a day
+        self.anchor = anchor or date.today()
+        self._anchor_time = datetime.combine(self.anchor, datetime.min.time())
+        self._titles, self._bands, self._levels = title_pool(self.keywords)
+        digest = hashlib.blake2b(f"{self.seed}:{self.keywords}".encode('utf-8'), digest_size=8).digest()
+        self._key = np.uint64(int.from_bytes(digest, 'little'))
+
+    def _uniform(self, indices: np.ndarray, field: int) -> np.ndarray:
+        """Uniform [0, 1) draw of ``field`` for each job index"""
+        stream = self._key ^ np.uint64((field + 1) * 0x9E3779B97F4A7C15 % 2 ** 64)
+        bits = _mix(indices.astype(np.uint64) * np.uint64(0xD1B54A32D192ED03) + stream)
+        return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / 2 ** 53)
+
+    def _choice(self, indices: np.ndarray, field: int, count: int) -> np.ndarray:
+        return (self._uniform(indices, field) * count).astype(np.intp)
+
+    def _randint(self, indices: np.ndarray, field: int, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        return low + (self._uniform(indices, field) * (high - low + 1)).astype(np.int64)
+
+    def _fields(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """The filterable fields of the given jobs, as arrays"""
+        title = self._choice(indices, _TITLE, len(self._titles))
+        band = self._bands[title]
+        location = self._choice(indices, _LOCATION, len(LOCATIONS))
+        salary_min = self._randint(indices, _SALARY_MIN, _BAND_MIN_LOW[band], _BAND_MIN_HIGH[band])
+        return {
+            'title': title,
+            'company': self._choice(indices, _COMPANY, len(COMPANIES)),
+            'location': location,
+            'salary_min': salary_min,
+            'salary_max': salary_min + self._randint(indices, _SALARY_SPREAD, _BAND_SPREAD_LOW[band], _BAND_SPREAD_HIGH[band]),
+            'days': self._choice(indices, _DAYS, 31),
+            'portal': self._choice(indices, _PORTAL, len(PORTALS)),
+            'job_type': self._choice(indices, _JOB_TYPE, len(JOB_TYPES)),
+            'remote': _REMOTE_LOCATIONS[location] | (self._uniform(indices, _REMOTE) < 0.5),
+        }
+
+    def columns(self, count: int) -> JobColumns:
+        """Filter and sort columns of the first ``count`` jobs, without building them"""
+        key = (self.keywords, self.seed, self.anchor, count)
+        columns = _columns_cache.get(key)
+        if columns is None:
+            columns = self._columns(count)
+            _columns_cache.set(key, columns)
+        return columns
+
+    def _columns(self, count: int) -> JobColumns:
+        fields = self._fields(np.arange(count))
+        return JobColumns(
+            salary_min=fields['salary_min'].astype(np.float64),
+            salary_max=fields['salary_max'].astype(np.float64),
+            posted_ts=self._anchor_time.timestamp() - fields['days'] * 86400.0,
+            match_score=np.full(count, np.nan),
+            remote=fields['remote'],
+            latitude=_LOCATION_LATITUDES[fields['location']],
+            longitude=_LOCATION_LONGITUDES[fields['location']],
+            job_type=Categorical.from_codes(_JOB_TYPE_CODES[fields['job_type']], _JOB_TYPE_CATEGORIES),
+            experience_level=Categorical.from_codes(self._levels[fields['title']], _LEVEL_CATEGORIES),
+            portal=Categorical.from_codes(fields['portal'], PORTALS),
+            country=Categorical.from_codes(_COUNTRY_CODES[fields['location']], _COUNTRY_CATEGORIES),
+            region=Categorical.from_codes(_REGION_CODES[fields['location']], _REGION_CATEGORIES),
+            salary_currency=Categorical.from_codes(np.zeros(count, dtype=np.int16), ['USD'])
+        )
+
+    def jobs(self, indices: Sequence[int]) -> List[Dict[str, Any]]:
+        indices = np.asarray(indices, dtype=np.int64)
+        fields = {name: values.tolist() for name, values in self._fields(indices).items()}
+        return [self._job(i, {name: values[n] for name, values in fields.items()})
+                for n, i in enumerate(indices.tolist())]
+
+    def _job(self, i: int, fields: Dict[str, Any]) -> Dict[str, Any]:
+        title = self._titles[fields['title']]
+        company = COMPANIES[fields['company']]
+        location = LOCATIONS[fields['location']]
+        portal = PORTALS[fields['portal']]
+        salary_min, salary_max = fields['salary_min'], fields['salary_max']
+
+        rng = random.Random(f"{self.seed}:{self.keywords}:{i}")
+        base_url, demo_id = _PORTAL_URLS[portal]
+        if isinstance(demo_id, tuple):
+            demo_id = rng.randint(*demo_id)
+        else:
+            demo_id = ''.join(rng.choice(_ID_CHARS) for _ in range(demo_id))
+        url = f"{base_url}{demo_id}"
+
+        return {
+            "id": f"massive_job_{i + 1}",
+            "title": title,
+            "company": company,
+            "location": location,
+            "description": f"We are seeking a talented {title} to join our innovative team at {company}. This role offers exciting opportunities to work on cutting-edge technology and make a significant impact in a fast-paced environment.",
+            "requirements": f"• {rng.randint(2, 5)}+ years of experience\n• Strong expertise in {', '.join(rng.sample(SKILLS, 4))}\n• Excellent problem-solving and communication skills\n• Bachelor's degree in Computer Science or related field",
+            "salary_range": f"${salary_min:,} - ${salary_max:,}",
+            "salary_range_min": salary_min,
+            "salary_range_max": salary_max,
+            "salary_currency": "USD",
+            "salary_period": "year",
+            "posted_date": (self._anchor_time - timedelta(days=fields['days'])).isoformat(),
+            "job_type": JOB_TYPES[fields['job_type']],
+            "experience_level": EXPERIENCE_LEVELS[self._levels[fields['title']]],
+            "portal": portal,
+            "portal_display_name": portal.title().replace("_", " "),
+            "url": url,
+            "apply_url": url,
+            "portal_url": url,
+            "rating": round(rng.uniform(3.8, 4.9), 1),
+            "remote_ok": fields['remote'],
+            "skills_required": rng.sample(SKILLS, rng.randint(4, 8)),
+            "is_featured": i % 10 == 0,  # 10% featured jobs
+            "urgency": rng.choice(["low", "medium", "high"]) if i % 5 == 0 else "low",
+            "benefits": rng.sample(BENEFITS, rng.randint(3, 6))
+        }
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            raise IndexError("Sample jobs are indexed from 0")
+        return self.jobs([i])[0]
+
+class LiveResults:
+    """
+    Sorted live search results, stored in a search snapshot: the SerpAPI
+    jobs, the sample-job sequence and the result order as positions (API
+    jobs first, then sample job indices). Sample jobs are only built when
+    a slice is read.
+    """
+
+    def __init__(self, api_jobs: List[Dict], sample_jobs: SampleJobs, order: Sequence[int]):
+        self.api_jobs = api_jobs
+        self.sample_jobs = sample_jobs
+        self.order = np.asarray(order, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index):
+        positions = self.order[index] if isinstance(index, slice) else self.order[[index]]
+        api_count = len(self.api_jobs)
+        samples = iter(self.sample_jobs.jobs(positions[positions >= api_count] - api_count))
+        jobs = [self.api_jobs[position] if position < api_count else next(samples) for position in positions.tolist()]
+        return jobs if isinstance(index, slice) else jobs[0]
+
+    def truncate(self, length: int) -> 'LiveResults':
+        return LiveResults(self.api_jobs, self.sample_jobs, self.order[:length])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'api_jobs': self.api_jobs,
+            'keywords': self.sample_jobs.keywords,
+            'seed': self.sample_jobs.seed,
+            'anchor': self.sample_jobs.anchor.isoformat(),
+            'order': base64.b64encode(self.order.astype('<u4').tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LiveResults':
+        sample_jobs = SampleJobs(data['keywords'], seed=data['seed'], anchor=date.fromisoformat(data['anchor']))
+        return cls(data['api_jobs'], sample_jobs, np.frombuffer(base64.b64decode(data['order']), dtype='<u4'))
@@ -0,0 +1,156 @@
+"""
+Search Cache - Stale-while-revalidate cache for job search results
+Results are keyed by namespace and normalized query parameters. A fresh
+entry (younger than SEARCH_CACHE_TTL) is served as is. An entry in its
+stale window (SEARCH_CACHE_STALE_TTL after that) is served straight away
+while one background task refreshes it. Concurrent misses for the same
+key share a single computation, so a burst of identical landing-page
+searches costs one SerpAPI round trip. Hit rates are exported as
+Prometheus counters.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from dotenv import load_dotenv
+from prometheus_client import Counter
+
+from cache_utils import AsyncSingleFlight, LRUCache, RedisStore
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_REQUESTS = Counter(
+    'search_cache_requests_total',
+    'Search cache lookups',
+    ['namespace', 'result']  # result: hit, stale, miss, coalesced
+)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Case- and whitespace-insensitive strings; unset (None) parameters dropped"""
+    normalized = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = _WHITESPACE.sub(' ', value).strip().lower()
+        elif isinstance(value, (list, tuple)):
+            value = sorted(_WHITESPACE.sub(' ', str(item)).strip().lower() for item in value)
+        normalized[key] = value
+    return normalized
+
+class SearchCache:
+    def __init__(self, ttl: int = 300, stale_ttl: int = 900, max_entries: int = 1024, shared_backend: str = ""):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # Entries are kept through their stale window: (value, fresh_until)
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl + stale_ttl)
+        self.shared = None
+        if shared_backend == "redis":
+            self.shared = RedisStore(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), prefix='search:',
+                                     ttl=ttl + stale_ttl)
+        self._single_flight = AsyncSingleFlight()
+        self._refreshing: Set[str] = set()
+        # Strong references to background refreshes (the loop only keeps weak ones)
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats: Dict[str, int] = {'hit': 0, 'stale': 0, 'miss': 0, 'coalesced': 0}
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps(normalize_params(params), sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _record(self, namespace: str, result: str):
+        self._stats[result] += 1
+        SEARCH_CACHE_REQUESTS.labels(namespace=namespace, result=result).inc()
+
+    def _lookup(self, key: str):
+        entry = self.memory.get(key)
+        if entry is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                data = json.loads(value)
+                entry = (data['value'], data['fresh_until'])
+                self.memory.set(key, entry)
+        return entry
+
+    def _store(self, key: str, value: Any):
+        # Wall-clock expiry, so entries shared through Redis age the same in every process
+        entry = (value, time.time() + self.ttl)
+        self.memory.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, json.dumps({'value': value, 'fresh_until': entry[1]}, default=str))
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = await compute()
+        # The search APIs return [] when they fail; an outage shouldn't be cached
+        if value:
+            self._store(key, value)
+        return value
+
+    def _refresh(self, namespace: str, key: str, compute: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._single_flight.do(key, lambda: self._compute(key, compute))
+            except Exception as e:
+                logger.warning(f"Search cache refresh failed for {namespace}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_or_compute(self, namespace: str, params: Dict[str, Any],
+                             compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached result for these parameters, or ``compute()`` awaited once for
+        all concurrent callers. ``compute`` must not depend on the request
+        (e.g. its DB session), since stale entries are refreshed after the
+        request has finished. Callers must not mutate the returned value.
+        """
+        key = self.make_key(namespace, params)
+        entry = self._lookup(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() < fresh_until:
+                self._record(namespace, 'hit')
+            else:
+                self._record(namespace, 'stale')
+                self._refresh(namespace, key, compute)
+            return value
+
+        value, executed = await self._single_flight.do(key, lambda: self._compute(key, compute))
+        self._record(namespace, 'miss' if executed else 'coalesced')
+        return value
+
+    def invalidate(self, namespace: str, params: Dict[str, Any]):
+        key = self.make_key(namespace, params)
+        self.memory.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = sum(self._stats.values())
+        served = self._stats['hit'] + self._stats['stale'] + self._stats['coalesced']
+        return dict(self._stats, entries=len(self.memory), hit_rate=round(served / lookups, 3) if lookups else 0.0)
+
+# Global instance
+search_cache = SearchCache(
+    ttl=int(os.getenv('SEARCH_CACHE_TTL', '300')),
+    stale_ttl=int(os.getenv('SEARCH_CACHE_STALE_TTL', '900')),
+    max_entries=int(os.getenv('SEARCH_CACHE_SIZE', '1024')),
+    shared_backend=os.getenv('SEARCH_CACHE_BACKEND', '').lower()
+)
@@ -0,0 +1,173 @@
+"""
+Search Snapshots - Server-side search results behind opaque pagination cursors
+The first request of a search materializes its whole sorted result list
+once: stored-job IDs as a packed uint32 array, or the results of a live
+search, whose sample jobs are only generated when their page is read. The
+response carries a cursor for the next page, and later pages are slices
+of the snapshot, so paging is stable across calls and costs O(page size)
+however deep it goes. A snapshot is tagged with the kind of search that
+made it, and its cursors are only valid for that kind. Snapshots expire
+after SEARCH_SNAPSHOT_TTL seconds, and the oldest are dropped once the
+snapshots in memory hold SEARCH_SNAPSHOT_MAX_ITEMS result dicts; with
+SEARCH_SNAPSHOT_BACKEND=redis they are shared by every worker process.
+"""
+
+import os
+import json
+import base64
+import logging
+import secrets
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from dotenv import load_dotenv
+
+from cache_utils import LRUCache, RedisStore
+from sample_jobs import LiveResults
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+class CursorError(ValueError):
+    """Cursor that can't be decoded"""
+
+class CursorExpired(CursorError):
+    """Cursor whose snapshot has expired (or was never stored here); the search must be rerun"""
+
+@dataclass
+class SearchSnapshot:
+    id: str
+    kind: str  # the search that made it; its cursors are rejected by other searches
+    params: Dict[str, Any]
+    total: int  # reported total; live searches report more than they materialize
+    ids: Optional[np.ndarray] = None
+    items: Optional[Union[List[Dict], LiveResults]] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids) if self.ids is not None else len(self.items or [])
+
+    def page(self, offset: int, limit: int):
+        """Job IDs (stored-job snapshots) or result dicts (live snapshots) on one page"""
+        if self.ids is not None:
+            return self.ids[offset:offset + limit].tolist()
+        return (self.items or [])[offset:offset + limit]
+
+def _encode_ids(ids: np.ndarray) -> str:
+    return base64.b64encode(ids.astype('<u4').tobytes()).decode('ascii')
+
+def _decode_ids(value: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype='<u4')
+
+def _item_count(snapshot: SearchSnapshot) -> int:
+    # Result dicts held in memory; ID snapshots and lazily built sample jobs hold none
+    if isinstance(snapshot.items, LiveResults):
+        return len(snapshot.items.api_jobs)
+    return len(snapshot.items or [])
+
+def _truncate(items: Union[List[Dict], LiveResults], length: int) -> Union[List[Dict], LiveResults]:
+    return items.truncate(length) if isinstance(items, LiveResults) else list(items[:length])
+
+class SearchSnapshotStore:
+    def __init__(self, ttl: int = 900, max_entries: int = 1000, max_results: int = 10000,
+                 max_items: int = 100000, backend: str = "memory"):
+        self.ttl = ttl
+        # Results materialized per snapshot
+        self.max_results = max_results
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl, max_size=max_items, sizeof=_item_count)
+        self.shared = None
+        if backend == "redis":
+            self.shared = RedisStore(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), prefix='search_snapshot:', ttl=ttl)
+        self._stats: Dict[str, int] = {'created': 0, 'resolved': 0, 'expired': 0}
+
+    def create(self, kind: str, params: Dict[str, Any], total: int, ids: Optional[Sequence[int]] = None,
+               items: Optional[Union[List[Dict], LiveResults]] = None, meta: Optional[Dict[str, Any]] = None) -> SearchSnapshot:
+        """Store a ``kind`` search's sorted results (``ids`` or ``items``), truncated to ``max_results``"""
+        snapshot = SearchSnapshot(
+            id=secrets.token_urlsafe(12),
+            kind=kind,
+            params=params,
+            total=total,
+            ids=np.asarray(ids[:self.max_results], dtype=np.uint32) if ids is not None else None,
+            items=_truncate(items, self.max_results) if items is not None else None,
+            meta=meta or {}
+        )
+        self.memory.set(snapshot.id, snapshot)
+        if self.shared is not None:
+            self.shared.set(snapshot.id, json.dumps({
+                'kind': snapshot.kind,
+                'params': snapshot.params,
+                'total': snapshot.total,
+                'ids': _encode_ids(snapshot.ids) if snapshot.ids is not None else None,
+                'items': snapshot.items if isinstance(snapshot.items, list) else None,
+                'live_results': snapshot.items.to_dict() if isinstance(snapshot.items, LiveResults) else None,
+                'meta': snapshot.meta
+            }, default=str))
+        self._stats['created'] += 1
+        return snapshot
+
+    def get(self, snapshot_id: str) -> Optional[SearchSnapshot]:
+        snapshot = self.memory.get(snapshot_id)
+        if snapshot is not None or self.shared is None:
+            return snapshot
+
+        value = self.shared.get(snapshot_id)
+        if value is None:
+            return None
+        data = json.loads(value)
+        snapshot = SearchSnapshot(
+            id=snapshot_id,
+            kind=data['kind'],
+            params=data['params'],
+            total=data['total'],
+            ids=_decode_ids(data['ids']) if data['ids'] is not None else None,
+            items=LiveResults.from_dict(data['live_results']) if data.get('live_results') else data['items'],
+            meta=data['meta']
+        )
+        self.memory.set(snapshot_id, snapshot)
+        return snapshot
+
+    # Cursors
+
+    @staticmethod
+    def cursor(snapshot: SearchSnapshot, offset: int, limit: int) -> str:
+        token = f"{snapshot.id}:{offset}:{limit}".encode('ascii')
+        return base64.urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+    def resolve(self, cursor: str, kind: str) -> Tuple[SearchSnapshot, int, int]:
+        """(snapshot, offset, limit) for a cursor returned by ``cursor`` for a ``kind`` search"""
+        try:
+            token = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+            snapshot_id, offset, limit = token.rsplit(':', 2)
+            offset, limit = int(offset), int(limit)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CursorError(f"Invalid cursor: {cursor}") from e
+        if offset < 0 or limit <= 0:
+            raise CursorError(f"Invalid cursor: {cursor}")
+
+        snapshot = self.get(snapshot_id)
+        if snapshot is None:
+            self._stats['expired'] += 1
+            raise CursorExpired("Search results expired, run the search again")
+        if snapshot.kind != kind:
+            raise CursorError(f"Cursor belongs to a different search: {cursor}")
+        self._stats['resolved'] += 1
+        return snapshot, offset, limit
+
+    def page(self, snapshot: SearchSnapshot, offset: int, limit: int) -> Tuple[Any, Optional[str]]:
+        """One page of the snapshot and the cursor for the next one (None on the last page)"""
+        end = offset + limit
+        return snapshot.page(offset, limit), self.cursor(snapshot, end, limit) if end < len(snapshot) else None
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats, snapshots=len(self.memory), items=self.memory.size)
+
+# Global instance
+search_snapshots = SearchSnapshotStore(
+    ttl=int(os.getenv('SEARCH_SNAPSHOT_TTL', '900')),
+    max_entries=int(os.getenv('SEARCH_SNAPSHOT_MAX_ENTRIES', '1000')),
+    max_results=int(os.getenv('SEARCH_SNAPSHOT_MAX_RESULTS', '10000')),
+    max_items=int(os.getenv('SEARCH_SNAPSHOT_MAX_ITEMS', '100000')),
+    backend=os.getenv('SEARCH_SNAPSHOT_BACKEND', 'memory').lower()
+)
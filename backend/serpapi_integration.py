@@ -11,6 +11,9 @@ from typing import List, Dict, Optional, Any
 from datetime import datetime
 from serpapi import GoogleSearch
 
+from location_normalizer import parse_location
+from salary_normalizer import parse_salary
+
 logger = logging.getLogger(__name__)
 
 class SerpAPIJobSearcher:
@@ -62,7 +65,8 @@ class SerpAPIJobSearcher:
                 
                 logger.info(f"🔍 SerpAPI search params (page {page_num + 1}/{pages_to_fetch}): {params}")
                 
-                response = requests.get(self.search_url, params=params, timeout=15)  # Reduced timeout
+                # Blocking HTTP call in a worker thread, so the event loop (and parallel category searches) keep running
+                response = await asyncio.to_thread(requests.get, self.search_url, params=params, timeout=15)  # Reduced timeout
                 
                 if response.status_code != 200:
                     logger.error(f"❌ SerpAPI returned status {response.status_code} on page {page_num + 1}")
@@ -309,7 +313,7 @@ class SerpAPIJobSearcher:
                     "requirements": job.get("qualifications", []),
                     "benefits": job.get("benefits", []),
                     "company_logo": job.get("thumbnail", ""),
-                    "remote_friendly": "remote" in job.get("location", "").lower(),
+                    "remote_friendly": parse_location(job.get("location", "")).remote,
                     "scraped_at": datetime.now().isoformat()
                 }
                 parsed_jobs.append(parsed_job)
@@ -342,7 +346,7 @@ class SerpAPIJobSearcher:
                     "requirements": [],
                     "benefits": [],
                     "company_logo": job.get("company_logo", ""),
-                    "remote_friendly": "remote" in job.get("location", "").lower(),
+                    "remote_friendly": parse_location(job.get("location", "")).remote,
                     "scraped_at": datetime.now().isoformat()
                 }
                 parsed_jobs.append(parsed_job)
@@ -375,7 +379,7 @@ class SerpAPIJobSearcher:
                     "requirements": [],
                     "benefits": [],
                     "company_logo": "",
-                    "remote_friendly": "remote" in job.get("location", "").lower(),
+                    "remote_friendly": parse_location(job.get("location", "")).remote,
                     "scraped_at": datetime.now().isoformat()
                 }
                 parsed_jobs.append(parsed_job)
@@ -415,58 +419,11 @@ class SerpAPIJobSearcher:
                     return self._extract_salary(matches[0])
         
         # Default empty salary
-        return {"raw": "", "min": None, "max": None, "currency": "USD"}
+        return parse_salary("").as_dict()
 
     def _extract_salary(self, salary_text: str) -> Dict[str, Any]:
-        """Extract and normalize salary information"""
-        
-        if not salary_text:
-            return {"raw": "", "min": None, "max": None, "currency": "USD"}
-        
-        salary_info = {
-            "raw": salary_text,
-            "min": None,
-            "max": None,
-            "currency": "USD"
-        }
-        
-        import re
-        
-        # Remove common words and normalize
-        clean_text = salary_text.replace(',', '').replace('$', '').lower()
-        
-        # Extract numeric values with K/M multipliers
-        number_patterns = [
-            r'(\d+\.?\d*)\s*k',  # 100k, 150k
-            r'(\d+\.?\d*)\s*m',  # 1.5m  
-            r'(\d+)',  # regular numbers
-        ]
-        
-        numbers = []
-        for pattern in number_patterns:
-            matches = re.findall(pattern, clean_text)
-            for match in matches:
-                try:
-                    num = float(match)
-                    if 'k' in clean_text and num < 1000:
-                        num *= 1000
-                    elif 'm' in clean_text and num < 100:
-                        num *= 1000000
-                    numbers.append(int(num))
-                except ValueError:
-                    continue
-        
-        # Assign min/max based on numbers found
-        if len(numbers) >= 2:
-            salary_info["min"] = min(numbers)
-            salary_info["max"] = max(numbers)
-        elif len(numbers) == 1:
-            # Single number - could be minimum or base
-            if numbers[0] > 10000:  # Assume it's annual salary
-                salary_info["min"] = numbers[0]
-                salary_info["max"] = numbers[0]
-        
-        return salary_info
+        """Annualized salary range, currency and quoted period (see salary_normalizer)"""
+        return parse_salary(salary_text).as_dict()
     
     def _map_job_type_google(self, job_type: str) -> str:
         """Map job type to Google Jobs format"""
@@ -0,0 +1,190 @@
+"""
+Skill Index - Inverted index from canonical skill to stored job IDs
+Posting lists are sorted uint32 arrays built from job_skills (the source of
+truth), so "which jobs need Kubernetes and Python" is an intersection of two
+arrays instead of a scan of every job description. New jobs are appended
+as they are ingested and expired jobs pruned on cleanup; other processes
+pick up changes by syncing with the job_skills table.
+"""
+
+import os
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Job, JobSkill
+from skill_taxonomy import skill_taxonomy
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+_EMPTY = np.zeros(0, dtype=np.uint32)
+
+def _as_postings(job_ids: Iterable[int]) -> np.ndarray:
+    return np.unique(np.fromiter(job_ids, dtype=np.uint32))
+
+class SkillIndex:
+    """
+    skill -> sorted array of job IDs, plus the IDs of every indexed job and of
+    jobs with no detected skills (they score NO_SKILLS_SCORE for everyone, so
+    they stay candidates for any user).
+    """
+
+    def __init__(self, sync_interval: float = 60):
+        self.sync_interval = sync_interval
+        self._postings: Dict[str, np.ndarray] = {}
+        self._all_jobs = _EMPTY
+        self._jobs_without_skills = _EMPTY
+        self._taxonomy_version: Optional[str] = None
+        self._last_sync: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._all_jobs)
+
+    # Updates
+
+    def add_jobs(self, job_skills: Mapping[int, Sequence[str]]):
+        """Index jobs given as job_id -> canonical skill names"""
+        if not job_skills:
+            return
+
+        by_skill: Dict[str, List[int]] = {}
+        without_skills = []
+        for job_id, skills in job_skills.items():
+            if not skills:
+                without_skills.append(job_id)
+            for skill in skills:
+                by_skill.setdefault(skill, []).append(job_id)
+
+        with self._lock:
+            for skill, job_ids in by_skill.items():
+                self._postings[skill] = np.union1d(self._postings.get(skill, _EMPTY), _as_postings(job_ids))
+            self._all_jobs = np.union1d(self._all_jobs, _as_postings(job_skills.keys()))
+            if without_skills:
+                self._jobs_without_skills = np.union1d(self._jobs_without_skills, _as_postings(without_skills))
+
+    def remove_jobs(self, job_ids: Iterable[int]):
+        """Prune deleted jobs from every posting list"""
+        removed = _as_postings(job_ids)
+        if not len(removed):
+            return
+
+        with self._lock:
+            for skill, postings in list(self._postings.items()):
+                remaining = np.setdiff1d(postings, removed, assume_unique=True)
+                if len(remaining):
+                    self._postings[skill] = remaining
+                else:
+                    del self._postings[skill]
+            self._all_jobs = np.setdiff1d(self._all_jobs, removed, assume_unique=True)
+            self._jobs_without_skills = np.setdiff1d(self._jobs_without_skills, removed, assume_unique=True)
+
+    def _load(self, session: Session, min_job_id: int = 0) -> Dict[int, List[str]]:
+        """job_id -> skills for current-taxonomy jobs with an ID above ``min_job_id``"""
+        version = skill_taxonomy.version
+        job_skills: Dict[int, List[str]] = {
+            job_id: [] for (job_id,) in session.query(Job.id).filter(
+                Job.id > min_job_id,
+                Job.skills_taxonomy_version == version
+            )
+        }
+        rows = session.query(JobSkill.job_id, JobSkill.skill).join(Job).filter(
+            Job.id > min_job_id,
+            Job.skills_taxonomy_version == version
+        )
+        for job_id, skill in rows:
+            job_skills[job_id].append(skill)
+        return job_skills
+
+    def rebuild(self, session: Session):
+        version = skill_taxonomy.version
+        job_skills = self._load(session)
+        with self._lock:
+            self._postings = {}
+            self._all_jobs = _EMPTY
+            self._jobs_without_skills = _EMPTY
+            self.add_jobs(job_skills)
+            self._taxonomy_version = version
+        logger.info(f"Built skill index: {len(job_skills)} jobs, {len(self._postings)} skills")
+
+    def sync(self, session: Session, force: bool = False):
+        """
+        Bring the index in line with job_skills. Jobs added since the last
+        sync are appended; anything else (deletions elsewhere, taxonomy
+        change, re-extraction) triggers a rebuild. Checked at most every
+        ``sync_interval`` seconds unless forced.
+        """
+        now = time.monotonic()
+        if not force and self._last_sync is not None and now - self._last_sync < self.sync_interval:
+            return
+
+        with self._lock:
+            self._last_sync = now
+            version = skill_taxonomy.version
+            job_count, max_job_id = session.query(func.count(Job.id), func.max(Job.id)).filter(
+                Job.skills_taxonomy_version == version
+            ).one()
+            indexed_max = int(self._all_jobs[-1]) if len(self._all_jobs) else 0
+
+            if version != self._taxonomy_version:
+                self.rebuild(session)
+                return
+            if job_count == len(self._all_jobs) and (max_job_id or 0) == indexed_max:
+                return
+
+            new_jobs = self._load(session, min_job_id=indexed_max)
+            if len(self._all_jobs) + len(new_jobs) == job_count:
+                self.add_jobs(new_jobs)
+            else:
+                self.rebuild(session)
+
+    # Queries
+
+    def postings(self, skill: str) -> np.ndarray:
+        """Job IDs requiring a skill (name or alias)"""
+        name = skill_taxonomy.current().resolve(skill)
+        return self._postings.get(name, _EMPTY) if name else _EMPTY
+
+    def query(self, all_of: Sequence[str] = (), any_of: Sequence[str] = ()) -> np.ndarray:
+        """
+        Sorted job IDs that require every skill in ``all_of`` and at least one
+        in ``any_of``. With neither given, every indexed job matches.
+        """
+        with self._lock:
+            result = self._all_jobs
+            if all_of:
+                # Smallest posting list first keeps the intersections small
+                lists = sorted((self.postings(skill) for skill in all_of), key=len)
+                result = lists[0]
+                for postings in lists[1:]:
+                    if not len(result):
+                        break
+                    result = np.intersect1d(result, postings, assume_unique=True)
+            if any_of:
+                lists = [self.postings(skill) for skill in any_of]
+                union = np.unique(np.concatenate(lists)) if lists else _EMPTY
+                result = np.intersect1d(result, union, assume_unique=True)
+            return result
+
+    def candidate_job_ids(self, skills: Sequence[str]) -> np.ndarray:
+        """Jobs a user with these skills can score above zero on: a shared skill, or no skills at all"""
+        with self._lock:
+            return np.union1d(self.query(any_of=skills) if skills else _EMPTY, self._jobs_without_skills)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'jobs': len(self._all_jobs),
+            'skills': len(self._postings),
+            'jobs_without_skills': len(self._jobs_without_skills),
+            'postings': int(sum(len(postings) for postings in self._postings.values()))
+        }
+
+# Global instance
+skill_index = SkillIndex(sync_interval=float(os.getenv('SKILL_INDEX_SYNC_INTERVAL', '60')))
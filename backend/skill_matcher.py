@@ -7,9 +7,9 @@ calculating match scores and identifying skill gaps.
 import re
 import json
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional, Sequence
 from dataclasses import dataclass
-import openai
+import asyncio
 import os
 from dotenv import load_dotenv
 from collections import Counter
@@ -17,6 +17,13 @@ import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 
+from skill_taxonomy import skill_taxonomy
+from lexical_scorer import get_lexical_score
+from llm_cache import llm_cache
+from llm_client import llm_client
+from match_cascade import match_cascade
+from prompt_builder import prompt_builder, PROMPT_BUDGETS
+
 # Download required NLTK data (run once)
 try:
     nltk.data.find('tokenizers/punkt')
@@ -28,6 +35,9 @@ except LookupError:
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Bump when the AI match prompt changes so cached scores are not reused
+AI_MATCH_PROMPT_VERSION = "2"
+
 @dataclass
 class SkillMatch:
     skill: str
@@ -45,115 +55,48 @@ class JobMatchResult:
 
 class AdvancedSkillMatcher:
     def __init__(self):
-        self.openai_client = None
-        if os.getenv("OPENAI_API_KEY"):
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-            self.openai_client = openai
-        
-        # Comprehensive skill database
-        self.skill_database = {
-            'programming_languages': [
-                'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
-                'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'SQL', 'HTML', 'CSS', 'Bash', 'PowerShell'
-            ],
-            'frameworks_libraries': [
-                'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'FastAPI', 'Django', 'Flask',
-                'Spring Boot', 'Spring', 'Laravel', 'Ruby on Rails', 'ASP.NET', '.NET Core', 'jQuery',
-                'Bootstrap', 'Tailwind CSS', 'Material-UI', 'Redux', 'MobX', 'Next.js', 'Nuxt.js'
-            ],
-            'cloud_platforms': [
-                'AWS', 'Azure', 'Google Cloud', 'GCP', 'DigitalOcean', 'Heroku', 'Vercel', 'Netlify',
-                'AWS Lambda', 'AWS S3', 'AWS EC2', 'AWS RDS', 'Azure Functions', 'Google Functions'
-            ],
-            'databases': [
-                'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch', 'DynamoDB', 'Cassandra',
-                'Oracle', 'SQL Server', 'SQLite', 'Neo4j', 'InfluxDB', 'CouchDB'
-            ],
-            'devops_tools': [
-                'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'CircleCI', 'Travis CI',
-                'Ansible', 'Terraform', 'Vagrant', 'Chef', 'Puppet', 'Prometheus', 'Grafana', 'ELK Stack'
-            ],
-            'ml_ai': [
-                'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib', 'Seaborn',
-                'Jupyter', 'OpenCV', 'NLTK', 'spaCy', 'Hugging Face', 'MLflow', 'Kubeflow'
-            ],
-            'soft_skills': [
-                'Leadership', 'Communication', 'Problem Solving', 'Team Collaboration', 'Project Management',
-                'Agile', 'Scrum', 'Critical Thinking', 'Adaptability', 'Time Management', 'Mentoring'
-            ],
-            'testing_qa': [
-                'Jest', 'Cypress', 'Selenium', 'JUnit', 'pytest', 'Mocha', 'Chai', 'TestNG',
-                'Postman', 'Newman', 'LoadRunner', 'JMeter'
-            ]
-        }
+        # Shared async LLM client (pooled, rate limited); None without an API key
+        self.openai_client = llm_client if llm_client.available else None
         
-        # Flatten skill database for quick lookup
-        self.all_skills = []
-        for category, skills in self.skill_database.items():
-            for skill in skills:
-                self.all_skills.append({
-                    'skill': skill,
-                    'category': category,
-                    'aliases': self._generate_skill_aliases(skill)
-                })
+        # Semantic component of the match score: 'llm' (OpenAI), 'lexical' (offline BM25/TF-IDF) or 'none'
+        self.semantic_scorer = os.getenv('MATCH_SEMANTIC_SCORER', 'llm').lower()
+        # LLM match scores requested at once by one batch
+        self.semantic_concurrency = int(os.getenv('MATCH_SEMANTIC_CONCURRENCY', '8'))
+    
+    @property
+    def skill_database(self) -> Dict[str, List[str]]:
+        """Skill names grouped by category, from the current taxonomy"""
+        return skill_taxonomy.current().categories
     
-    def _generate_skill_aliases(self, skill: str) -> List[str]:
-        """Generate common aliases for a skill"""
-        aliases = [skill.lower()]
-        
-        # Common variations
-        if skill == "JavaScript":
-            aliases.extend(["js", "javascript", "ecmascript"])
-        elif skill == "TypeScript":
-            aliases.extend(["ts", "typescript"])
-        elif skill == "React":
-            aliases.extend(["reactjs", "react.js"])
-        elif skill == "Node.js":
-            aliases.extend(["nodejs", "node"])
-        elif skill == "ASP.NET":
-            aliases.extend(["asp.net", "aspnet"])
-        elif skill == "C++":
-            aliases.extend(["cpp", "c plus plus"])
-        elif skill == "C#":
-            aliases.extend(["csharp", "c sharp"])
-        
-        return aliases
+    @property
+    def taxonomy_version(self) -> str:
+        """Stored job skills extracted under another version are re-extracted"""
+        return skill_taxonomy.version
     
     def extract_skills_from_text(self, text: str) -> List[SkillMatch]:
         """Extract skills from text using pattern matching and NLP"""
+        taxonomy = skill_taxonomy.current()
         text_lower = text.lower()
         found_skills = []
         
-        for skill_data in self.all_skills:
-            skill_name = skill_data['skill']
-            aliases = skill_data['aliases']
-            category = skill_data['category']
-            
-            # Check for skill mentions
-            confidence = 0.0
-            mentions = 0
-            
-            for alias in aliases:
-                # Simple word boundary matching
-                pattern = r'\b' + re.escape(alias) + r'\b'
-                matches = re.findall(pattern, text_lower)
-                mentions += len(matches)
-            
+        # One pass over the text yields the mention count of every skill
+        skill_mentions = taxonomy.count_mentions(text_lower)
+        has_context_boost = any(keyword in text_lower for keyword in ['experience with', 'proficient in', 'expert in', 'skilled in'])
+        
+        for skill, mentions in zip(taxonomy.skills, skill_mentions):
             if mentions > 0:
                 # Calculate confidence based on mentions and context
                 confidence = min(1.0, mentions * 0.3)
                 
                 # Boost confidence for certain contexts
-                if any(keyword in text_lower for keyword in ['experience with', 'proficient in', 'expert in', 'skilled in']):
+                if has_context_boost:
                     confidence = min(1.0, confidence + 0.2)
                 
-                importance = self._calculate_skill_importance(skill_name, category)
-                
                 found_skills.append(SkillMatch(
-                    skill=skill_name,
+                    skill=skill.name,
                     confidence=confidence,
-                    category=category,
-                    importance=importance
+                    category=skill.category,
+                    importance=skill.importance
                 ))
         
         # Remove duplicates and sort by confidence
@@ -164,39 +107,77 @@ class AdvancedSkillMatcher:
         
         return sorted(unique_skills.values(), key=lambda x: x.confidence, reverse=True)
     
-    def _calculate_skill_importance(self, skill: str, category: str) -> int:
-        """Calculate the importance of a skill (1-5 scale)"""
-        # High-demand skills get higher importance
-        high_demand = ['Python', 'JavaScript', 'React', 'AWS', 'Docker', 'Kubernetes', 'Node.js']
-        medium_high_demand = ['Java', 'TypeScript', 'Angular', 'Vue.js', 'MongoDB', 'PostgreSQL']
-        
-        if skill in high_demand:
-            return 5
-        elif skill in medium_high_demand:
-            return 4
-        elif category in ['programming_languages', 'cloud_platforms']:
-            return 4
-        elif category in ['frameworks_libraries', 'databases']:
-            return 3
-        else:
-            return 2
-    
-    def match_job_with_resume(self, resume_text: str, job_description: str, user_id: Optional[int] = None) -> JobMatchResult:
+    def match_job_with_resume(self, resume_text: str, job_description: str, user_id: Optional[int] = None,
+                              resume_skills: Optional[List[SkillMatch]] = None,
+                              job_skills: Optional[List[SkillMatch]] = None) -> JobMatchResult:
         """
         Advanced job matching using multiple algorithms:
         1. Skill-based matching
-        2. AI-powered semantic matching (if OpenAI available)
+        2. Semantic matching (LLM if OpenAI available, or offline lexical scoring)
         3. Experience level matching
         4. Domain matching
+        
+        Pass ``resume_skills`` / ``job_skills`` when either side has already
+        been analyzed (e.g. skills persisted at ingest) to skip re-extraction.
+        Blocks on LLM calls; async callers use ``match_job_with_resume_async``.
         """
+        skill_match = self._skill_match(resume_text, job_description, resume_skills, job_skills)
+        
+        # Semantic matching if configured, only for jobs that pass the skill-score stage of the cascade
+        semantic_score = match_cascade.run(
+            [skill_match[0]],
+            lambda selected: [self._get_semantic_score(resume_text, job_description)],
+            source='match'
+        )[0]
+        return self._match_result(skill_match, semantic_score)
+    
+    async def match_job_with_resume_async(self, resume_text: str, job_description: str,
+                                          user_id: Optional[int] = None,
+                                          resume_skills: Optional[List[SkillMatch]] = None,
+                                          job_skills: Optional[List[SkillMatch]] = None) -> JobMatchResult:
+        """``match_job_with_resume`` as a coroutine: the LLM call is awaited on the shared client"""
+        skill_match = self._skill_match(resume_text, job_description, resume_skills, job_skills)
+        semantic_score = (await self.cascade_semantic_scores_async(
+            resume_text, [skill_match[0]], [job_description], source='match'
+        ))[0]
+        return self._match_result(skill_match, semantic_score)
+    
+    async def match_jobs_with_resume_async(self, resume_text: str,
+                                           jobs: Sequence[Tuple[str, Optional[List[SkillMatch]]]],
+                                           resume_skills: Optional[List[SkillMatch]] = None) -> List[JobMatchResult]:
+        """
+        Match many (job_description, job_skills or None) pairs against one resume.
         
+        Skill scores for the whole batch are computed first, so the cascade's
+        threshold and top-N apply across the batch and the selected jobs are
+        scored by the LLM concurrently.
+        """
+        if resume_skills is None:
+            resume_skills = self.extract_skills_from_text(resume_text)
+        skill_matches = [
+            self._skill_match(resume_text, job_description, resume_skills, job_skills)
+            for job_description, job_skills in jobs
+        ]
+        semantic_scores = await self.cascade_semantic_scores_async(
+            resume_text, [skill_match[0] for skill_match in skill_matches],
+            [job_description for job_description, _ in jobs], source='match_batch'
+        )
+        return [
+            self._match_result(skill_match, semantic_score)
+            for skill_match, semantic_score in zip(skill_matches, semantic_scores)
+        ]
+    
+    def _skill_match(self, resume_text: str, job_description: str, resume_skills: Optional[List[SkillMatch]],
+                     job_skills: Optional[List[SkillMatch]]) -> Tuple[float, List[SkillMatch], List[SkillMatch], List[SkillMatch]]:
+        """(skill match score, matched skills, missing skills, job skills)"""
         # Extract skills from both texts
-        resume_skills = self.extract_skills_from_text(resume_text)
-        job_skills = self.extract_skills_from_text(job_description)
+        if resume_skills is None:
+            resume_skills = self.extract_skills_from_text(resume_text)
+        if job_skills is None:
+            job_skills = self.extract_skills_from_text(job_description)
         
         # Create skill dictionaries for comparison
         resume_skill_dict = {skill.skill: skill for skill in resume_skills}
-        job_skill_dict = {skill.skill: skill for skill in job_skills}
         
         # Find matched and missing skills
         matched_skills = []
@@ -223,21 +204,12 @@ class AdvancedSkillMatcher:
             total_importance = sum(skill.importance for skill in job_skills)
             matched_importance = sum(skill.importance for skill in matched_skills)
             skill_match_score = (matched_importance / total_importance) * 100 if total_importance > 0 else 0
-        
-        # AI-enhanced matching if available
-        ai_match_score = None
-        if self.openai_client:
-            try:
-                ai_match_score = self._get_ai_match_score(resume_text, job_description)
-            except Exception as e:
-                logger.warning(f"AI matching failed: {e}")
-        
-        # Combine scores
-        if ai_match_score is not None:
-            # Weight: 60% AI, 40% skill matching
-            final_score = (ai_match_score * 0.6) + (skill_match_score * 0.4)
-        else:
-            final_score = skill_match_score
+        return skill_match_score, matched_skills, missing_skills, job_skills
+    
+    def _match_result(self, skill_match: Tuple[float, List[SkillMatch], List[SkillMatch], List[SkillMatch]],
+                      semantic_score: Optional[float]) -> JobMatchResult:
+        skill_match_score, matched_skills, missing_skills, job_skills = skill_match
+        final_score = self.combine_scores(skill_match_score, semantic_score)
         
         # Generate skill gap analysis
         skill_gap_analysis = self._generate_skill_gap_analysis(matched_skills, missing_skills, job_skills)
@@ -253,8 +225,82 @@ class AdvancedSkillMatcher:
             recommendations=recommendations
         )
     
-    def _get_ai_match_score(self, resume_text: str, job_description: str) -> float:
-        """Use OpenAI to get semantic matching score"""
+    @staticmethod
+    def combine_scores(skill_match_score: float, semantic_score: Optional[float]) -> float:
+        """Final match score from the skill and (optional) semantic components"""
+        if semantic_score is not None:
+            # Weight: 60% semantic, 40% skill matching
+            return (semantic_score * 0.6) + (skill_match_score * 0.4)
+        return skill_match_score
+    
+    def _get_semantic_score(self, resume_text: str, job_description: str) -> Optional[float]:
+        """Semantic match score (0-100) from the configured scorer, or None if unavailable"""
+        if self.semantic_scorer == 'lexical':
+            if not resume_text or not job_description:
+                return None
+            return get_lexical_score(resume_text, job_description)
+        
+        if self.semantic_scorer == 'llm' and self.openai_client:
+            try:
+                return self._get_ai_match_score(resume_text, job_description)
+            except Exception as e:
+                logger.warning(f"AI matching failed: {e}")
+        return None
+    
+    def _get_semantic_scores(self, resume_text: str, job_descriptions: Sequence[str]) -> List[Optional[float]]:
+        """``_get_semantic_score`` for many jobs; LLM requests run concurrently on the shared client"""
+        if self.semantic_scorer == 'llm' and self.openai_client:
+            return self.openai_client.run(self._get_semantic_scores_async(resume_text, job_descriptions))
+        return [self._get_semantic_score(resume_text, description) for description in job_descriptions]
+    
+    async def _get_semantic_scores_async(self, resume_text: str, job_descriptions: Sequence[str]) -> List[Optional[float]]:
+        """``_get_semantic_scores`` as a coroutine; at most ``semantic_concurrency`` LLM requests at a time"""
+        if not (self.semantic_scorer == 'llm' and self.openai_client):
+            return [self._get_semantic_score(resume_text, description) for description in job_descriptions]
+        
+        semaphore = asyncio.Semaphore(self.semantic_concurrency)
+        
+        async def score(description: str) -> Optional[float]:
+            async with semaphore:
+                try:
+                    return await self._get_ai_match_score_async(resume_text, description)
+                except Exception as e:
+                    logger.warning(f"AI matching failed: {e}")
+                    return None
+        
+        return list(await asyncio.gather(*(score(description) for description in job_descriptions)))
+    
+    def cascade_semantic_scores(self, resume_text: str, skill_scores: Sequence[float],
+                                job_descriptions: Sequence[str], source: str,
+                                top_n: Optional[int] = None) -> List[Optional[float]]:
+        """Semantic scores for the jobs that pass the match cascade (None for the rest), aligned with the inputs"""
+        return match_cascade.run(
+            skill_scores,
+            lambda selected: self._get_semantic_scores(resume_text, [job_descriptions[i] for i in selected]),
+            source=source, top_n=top_n
+        )
+    
+    async def cascade_semantic_scores_async(self, resume_text: str, skill_scores: Sequence[float],
+                                            job_descriptions: Sequence[str], source: str,
+                                            top_n: Optional[int] = None) -> List[Optional[float]]:
+        """``cascade_semantic_scores`` as a coroutine, for request handlers"""
+        return await match_cascade.run_async(
+            skill_scores,
+            lambda selected: self._get_semantic_scores_async(resume_text, [job_descriptions[i] for i in selected]),
+            source=source, top_n=top_n
+        )
+    
+    @staticmethod
+    def _ai_match_inputs(resume_text: str, job_description: str) -> Dict[str, Any]:
+        """LLM cache inputs: the whole documents and their token budget, so a cache hit skips fitting them"""
+        return {'resume': resume_text, 'job_description': job_description,
+                'budget': PROMPT_BUDGETS['ai_match_score']}
+    
+    def _ai_match_messages(self, resume_text: str, job_description: str) -> List[Dict[str, str]]:
+        # The sections of both documents most relevant to each other, within the token budget
+        resume_text, job_description = prompt_builder.fit_pair(
+            resume_text, job_description, PROMPT_BUDGETS['ai_match_score'], "gpt-3.5-turbo"
+        )
         prompt = f"""
         Analyze the following resume and job description. Return a match score from 0-100 based on:
         1. Relevant experience and skills
@@ -264,37 +310,56 @@ class AdvancedSkillMatcher:
         5. Technical competencies
         
         Resume:
-        {resume_text[:2000]}  # Limit to avoid token limits
+        {resume_text}
         
         Job Description:
-        {job_description[:2000]}
+        {job_description}
         
         Return ONLY the numeric score (0-100):
         """
-        
+        return [
+            {"role": "system", "content": "You are an expert HR recruiter analyzing resume-job matches."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _parse_ai_score(score_text: str) -> float:
+        # Extract numeric value
+        numbers = re.findall(r'\d+\.?\d*', score_text)
+        if numbers:
+            return min(100.0, max(0.0, float(numbers[0])))
+        return 70.0  # Default fallback
+    
+    def _get_ai_match_score(self, resume_text: str, job_description: str) -> float:
+        """Use OpenAI to get semantic matching score"""
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR recruiter analyzing resume-job matches."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=50
+            # Identical resume/job pairs are answered from the LLM cache
+            score_text = llm_cache.get_or_call(
+                'ai_match_score', model="gpt-3.5-turbo", template_version=AI_MATCH_PROMPT_VERSION, temperature=0.2,
+                inputs=self._ai_match_inputs(resume_text, job_description),
+                call=lambda: self.openai_client.chat_sync(
+                    "gpt-3.5-turbo", self._ai_match_messages(resume_text, job_description),
+                    temperature=0.2, max_tokens=50
+                )
             )
-            
-            score_text = response.choices[0].message.content.strip()
-            # Extract numeric value
-            import re
-            numbers = re.findall(r'\d+\.?\d*', score_text)
-            if numbers:
-                return min(100.0, max(0.0, float(numbers[0])))
-            return 70.0  # Default fallback
+            return self._parse_ai_score(score_text)
             
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             raise
     
+    async def _get_ai_match_score_async(self, resume_text: str, job_description: str) -> float:
+        """``_get_ai_match_score`` as a coroutine, for concurrent scoring"""
+        score_text = await llm_cache.get_or_call_async(
+            'ai_match_score', model="gpt-3.5-turbo", template_version=AI_MATCH_PROMPT_VERSION, temperature=0.2,
+            inputs=self._ai_match_inputs(resume_text, job_description),
+            call=lambda: self.openai_client.chat(
+                "gpt-3.5-turbo", self._ai_match_messages(resume_text, job_description),
+                temperature=0.2, max_tokens=50
+            )
+        )
+        return self._parse_ai_score(score_text)
+    
     def _generate_skill_gap_analysis(self, matched_skills: List[SkillMatch], 
                                    missing_skills: List[SkillMatch], 
                                    job_skills: List[SkillMatch]) -> Dict[str, any]:
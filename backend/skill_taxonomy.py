@@ -0,0 +1,208 @@
+"""
+Skill Taxonomy Service - Single source of skills and aliases for every extractor
+Skills are loaded from data/skill_taxonomy.json and compiled once per process
+into a single-pass matcher. The file is watched and a changed taxonomy is
+picked up without a restart.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = os.getenv(
+    'SKILL_TAXONOMY_PATH',
+    str(Path(__file__).resolve().parent / 'data' / 'skill_taxonomy.json')
+)
+# Minimum seconds between checks of the taxonomy file for changes
+RELOAD_CHECK_INTERVAL = float(os.getenv('SKILL_TAXONOMY_RELOAD_INTERVAL', '5'))
+
+@dataclass(frozen=True)
+class SkillDefinition:
+    name: str
+    category: str
+    importance: int  # 1-5 scale
+    aliases: Tuple[str, ...]
+
+class CompiledTaxonomy:
+    """
+    Immutable snapshot of the taxonomy with its compiled matcher.
+
+    Aliases are folded into a character trie and emitted as one regex, so a
+    text is scanned once instead of once per alias. The pattern sits inside
+    a lookahead so hits at every position are reported, and each hit is the
+    longest alias starting there; shorter aliases that are a prefix of it
+    (``node`` inside ``node.js``) are resolved from ``_alias_prefixes``.
+    """
+
+    def __init__(self, skills: List[SkillDefinition], version: str):
+        self.skills = skills
+        self.version = version
+        self.by_name: Dict[str, SkillDefinition] = {skill.name: skill for skill in skills}
+        self.by_lower_name: Dict[str, SkillDefinition] = {skill.name.lower(): skill for skill in skills}
+
+        self.categories: Dict[str, List[str]] = {}
+        for skill in skills:
+            self.categories.setdefault(skill.category, []).append(skill.name)
+
+        # alias -> indices into self.skills
+        self._alias_owners: Dict[str, List[int]] = {}
+        for index, skill in enumerate(skills):
+            for alias in skill.aliases:
+                self._alias_owners.setdefault(alias, []).append(index)
+
+        aliases = sorted(self._alias_owners)
+        self._alias_prefixes = {
+            alias: [other for other in aliases if other != alias and alias.startswith(other)]
+            for alias in aliases
+        }
+
+        trie: Dict[str, dict] = {}
+        for alias in aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        self._pattern = re.compile(r'\b(?=(' + self._trie_to_regex(trie) + r'))')
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict[str, dict]) -> str:
+        """Render a trie node as a regex; longer continuations are tried first"""
+        branches = [re.escape(char) + cls._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if '' in node:
+            # Every alias ends on a word boundary
+            branches.append(r'\b')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    @staticmethod
+    def _is_word_boundary(text: str, position: int) -> bool:
+        """Same test as regex ``\\b`` at ``position``"""
+        before = position > 0 and (text[position - 1].isalnum() or text[position - 1] == '_')
+        after = position < len(text) and (text[position].isalnum() or text[position] == '_')
+        return before != after
+
+    def count_mentions(self, text_lower: str) -> List[int]:
+        """Count word-bounded alias hits per skill (aligned with ``self.skills``) in one pass"""
+        mentions = [0] * len(self.skills)
+        # End of the last counted hit per alias; hits of one alias never overlap
+        last_end: Dict[str, int] = {}
+
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            longest = match.group(1)
+            hits = [longest]
+            for prefix in self._alias_prefixes[longest]:
+                if self._is_word_boundary(text_lower, start + len(prefix)):
+                    hits.append(prefix)
+
+            for alias in hits:
+                if start < last_end.get(alias, 0):
+                    continue
+                last_end[alias] = start + len(alias)
+                for index in self._alias_owners[alias]:
+                    mentions[index] += 1
+
+        return mentions
+
+    def find_skills(self, text: str) -> List[SkillDefinition]:
+        """Skills mentioned in the text, in taxonomy order"""
+        mentions = self.count_mentions(text.lower())
+        return [skill for skill, count in zip(self.skills, mentions) if count > 0]
+
+    def find_skill_names(self, text: str) -> List[str]:
+        """Canonical names of the skills mentioned in the text"""
+        return [skill.name for skill in self.find_skills(text)]
+
+    def resolve(self, name_or_alias: str) -> Optional[str]:
+        """Canonical skill name for a name or alias (case-insensitive), e.g. ``k8s`` -> ``Kubernetes``"""
+        key = name_or_alias.strip().lower()
+        skill = self.by_lower_name.get(key)
+        if skill:
+            return skill.name
+        owners = self._alias_owners.get(key)
+        return self.skills[owners[0]].name if owners else None
+
+    def category_of(self, skill_name: str) -> Optional[str]:
+        """Category of a skill given by canonical name (case-insensitive)"""
+        skill = self.by_lower_name.get(skill_name.lower())
+        return skill.category if skill else None
+
+def load_taxonomy(path: str) -> CompiledTaxonomy:
+    """Read and compile a taxonomy file; the version is a hash of its content"""
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    data = json.loads(content)
+    skills = []
+    for entry in data['skills']:
+        aliases = [entry['name'].lower()]
+        for alias in entry.get('aliases', []):
+            alias = alias.lower()
+            if alias not in aliases:
+                aliases.append(alias)
+        skills.append(SkillDefinition(
+            name=entry['name'],
+            category=entry['category'],
+            importance=int(entry.get('importance', 2)),
+            aliases=tuple(aliases)
+        ))
+
+    version = hashlib.sha256(content).hexdigest()[:12]
+    return CompiledTaxonomy(skills, version)
+
+class SkillTaxonomy:
+    """Process-wide taxonomy holder that hot-reloads the data file when it changes"""
+
+    def __init__(self, path: str = TAXONOMY_PATH, reload_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime
+        self._last_check = time.monotonic()
+        self._compiled = load_taxonomy(path)
+        logger.info(f"Loaded skill taxonomy {self._compiled.version}: {len(self._compiled.skills)} skills")
+
+    def current(self) -> CompiledTaxonomy:
+        """The current compiled taxonomy, reloading it first if the file changed"""
+        now = time.monotonic()
+        if now - self._last_check >= self.reload_interval:
+            self._maybe_reload(now)
+        return self._compiled
+
+    def _maybe_reload(self, now: float):
+        with self._lock:
+            if now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if mtime == self._mtime:
+                    return
+                compiled = load_taxonomy(self.path)
+            except Exception as e:
+                # Keep serving the last good taxonomy
+                logger.error(f"Skill taxonomy reload failed: {e}")
+                return
+            self._mtime = mtime
+            if compiled.version != self._compiled.version:
+                self._compiled = compiled
+                logger.info(f"Reloaded skill taxonomy {compiled.version}: {len(compiled.skills)} skills")
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+# Global instance
+skill_taxonomy = SkillTaxonomy()
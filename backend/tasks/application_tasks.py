@@ -6,10 +6,11 @@ in the background, including retry logic and status tracking.
 
 from celery import current_task
 from celery_config import celery_app
-from auto_applier import AutoApplier
+from apply_pipeline import run_application, application_record_data
 from job_scraper import JobBoardScraper
 from models import JobApplication, Job, User
 from db import get_db_session
+import asyncio
 import logging
 import json
 from datetime import datetime, timedelta
@@ -53,56 +54,12 @@ def apply_to_job(self, user_id: int, job_id: int, application_data: Dict):
 
         current_task.update_state(
             state='PROGRESS',
-            meta={'status': 'Application record created', 'progress': 20}
+            meta={'status': 'Applying to job', 'progress': 30}
         )
 
-        # Prepare user profile for auto applier
-        user_profile = {
-            'full_name': f"{user.first_name} {user.last_name}",
-            'email': user.email,
-            'phone': getattr(user, 'phone', ''),
-            'resume_path': application_data.get('resume_path'),
-            'cover_letter': application_data.get('cover_letter', ''),
-            'linkedin_url': getattr(user, 'linkedin_url', ''),
-            'skills': application_data.get('skills', []),
-            'experience_years': getattr(user, 'experience_years', 0),
-        }
-
-        current_task.update_state(
-            state='PROGRESS',
-            meta={'status': 'Initializing auto applier', 'progress': 30}
-        )
-
-        # Initialize auto applier
-        auto_applier = AutoApplier(user_profile)
-        auto_applier.setup_browser(headless=True)
-
-        current_task.update_state(
-            state='PROGRESS',
-            meta={'status': 'Applying to job', 'progress': 50}
-        )
-
-        # Apply to job based on platform
-        platform = job.platform.lower()
-        success = False
-        error_message = None
-
-        try:
-            if platform == 'indeed':
-                success = auto_applier.apply_indeed(job.url, user_profile)
-            elif platform == 'dice':
-                success = auto_applier.apply_dice(job.url, user_profile)
-            elif platform == 'linkedin':
-                success = auto_applier.apply_linkedin(job.url, user_profile)
-            else:
-                error_message = f"Unsupported platform: {platform}"
-
-        except Exception as apply_error:
-            error_message = str(apply_error)
-            logger.error(f"Application error: {error_message}")
-
-        finally:
-            auto_applier.close_browser()
+        # Browser launch, cover letter, resume file and questionnaire answers run concurrently
+        outcome = asyncio.run(run_application(session, user_id, job_id, application_data))
+        success = outcome.success
 
         current_task.update_state(
             state='PROGRESS',
@@ -110,6 +67,8 @@ def apply_to_job(self, user_id: int, job_id: int, application_data: Dict):
         )
 
         # Update application status
+        application.stage_timings = outcome.stage_timings
+        application.application_data = application_record_data(outcome, application_data)
         if success:
             application.status = 'applied'
             application.applied_successfully = True
@@ -117,8 +76,8 @@ def apply_to_job(self, user_id: int, job_id: int, application_data: Dict):
         else:
             application.status = 'failed'
             application.applied_successfully = False
-            application.error_message = error_message
-            status_message = f'Application failed: {error_message}'
+            application.error_message = outcome.error
+            status_message = f'Application failed: {outcome.error}'
 
         application.completed_at = datetime.utcnow()
         session.commit()
@@ -133,7 +92,8 @@ def apply_to_job(self, user_id: int, job_id: int, application_data: Dict):
             'status': application.status,
             'message': status_message,
             'applied_at': application.applied_at.isoformat(),
-            'completed_at': application.completed_at.isoformat()
+            'completed_at': application.completed_at.isoformat(),
+            'stage_timings': application.stage_timings
         }
 
     except Exception as e:
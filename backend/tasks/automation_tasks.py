@@ -11,7 +11,12 @@ from db import SessionLocal
 from models import User, Job, JobApplication, JobPortalCredential, QuestionnaireAnswer, AutomationSetting
 from job_scraper import JobBoardScraper
 from auto_applier import AutoApplier
-from jd_matcher import match_jd
+from job_ranker import rank_jobs
+from location_normalizer import job_location, matches_preferred, parse_location
+from llm_client import llm_priority, BACKGROUND
+from match_scoring import load_user_resume_text
+from resume_analysis_cache import resume_analysis_cache
+from skill_matcher import skill_matcher
 from credential_encryption import credential_encryption
 from websocket_manager import websocket_manager
 from celery_config import celery_app
@@ -78,6 +83,11 @@ def automated_job_application(user_id: int):
         scraper = JobBoardScraper()
         applier = AutoApplier()
 
+        # Jobs are matched against each preferred location after scraping; one
+        # location can also narrow the scrape itself
+        preferred_locations = [parse_location(location) for location in settings.preferred_locations or []]
+        scrape_location = settings.preferred_locations[0] if len(preferred_locations) == 1 else ''
+
         # Scrape jobs from enabled platforms
         all_jobs = []
         for cred in credentials:
@@ -100,19 +110,19 @@ def automated_job_application(user_id: int):
                     if cred.platform == 'indeed':
                         jobs = scraper.scrape_indeed(
                             search_params.get('keywords', ''),
-                            ','.join(search_params.get('locations', [])),
+                            scrape_location,
                             min(remaining_applications * 2, 50)  # Get more jobs than needed for filtering
                         )
                     elif cred.platform == 'linkedin':
                         jobs = scraper.scrape_linkedin(
                             search_params.get('keywords', ''),
-                            ','.join(search_params.get('locations', [])),
+                            scrape_location,
                             min(remaining_applications * 2, 50)
                         )
                     elif cred.platform == 'glassdoor':
                         jobs = scraper.scrape_glassdoor(
                             search_params.get('keywords', ''),
-                            ','.join(search_params.get('locations', [])),
+                            scrape_location,
                             min(remaining_applications * 2, 50)
                         )
                     else:
@@ -128,8 +138,8 @@ def automated_job_application(user_id: int):
             logger.info(f"No jobs found for user {user_id}")
             return
 
-        # Filter and match jobs
-        suitable_jobs = []
+        # Filter jobs
+        candidate_jobs = []
         for job in all_jobs:
             try:
                 # Check if job contains excluded keywords
@@ -137,6 +147,9 @@ def automated_job_application(user_id: int):
                 if any(keyword.lower() in job_text for keyword in settings.keywords_exclude):
                     continue
 
+                if preferred_locations and not matches_preferred(job_location(job), preferred_locations):
+                    continue
+
                 # Check if already applied
                 existing_application = db.query(JobApplication).filter(
                     JobApplication.user_id == user_id,
@@ -146,19 +159,41 @@ def automated_job_application(user_id: int):
                 if existing_application:
                     continue
 
-                # Match job against user profile
-                match_score = match_jd(job.get('description', ''), user.id)
-
-                if match_score >= settings.match_threshold:
-                    suitable_jobs.append({
-                        'job': job,
-                        'match_score': match_score
-                    })
+                candidate_jobs.append(job)
 
             except Exception as e:
-                logger.error(f"Error matching job for user {user_id}: {str(e)}")
+                logger.error(f"Error filtering job for user {user_id}: {str(e)}")
                 continue
 
+        # Match jobs against the user's resume in two stages: the local skill score for every
+        # candidate, then the LLM only for the best of them (concurrently, in the background lane)
+        resume_text = load_user_resume_text(db, user_id)
+        if not resume_text:
+            logger.info(f"No resume or profile to match for user {user_id}")
+            return
+
+        resume_skills = resume_analysis_cache.get_analysis(resume_text, user_id).skills
+        skill_scores = rank_jobs(candidate_jobs, resume_skills, text_fields=('title', 'description'))
+        # Only remaining_applications jobs can be applied to; twice that leaves room for the LLM to disagree
+        with llm_priority(BACKGROUND):
+            semantic_scores = skill_matcher.cascade_semantic_scores(
+                resume_text, skill_scores, [job.get('description', '') for job in candidate_jobs],
+                source='automation', top_n=remaining_applications * 2
+            )
+
+        suitable_jobs = []
+        for job, skill_score, semantic_score in zip(candidate_jobs, skill_scores, semantic_scores):
+            match_score = round(skill_matcher.combine_scores(skill_score, semantic_score), 1)
+            if match_score >= settings.match_threshold:
+                suitable_jobs.append({
+                    'job': job,
+                    'match_score': match_score
+                })
+
+        logger.info(f"Matched {len(candidate_jobs)} jobs for user {user_id}: "
+                    f"{sum(score is not None for score in semantic_scores)} LLM-scored, "
+                    f"{len(suitable_jobs)} above threshold")
+
         # Sort by match score and take top applications
         suitable_jobs.sort(key=lambda x: x['match_score'], reverse=True)
         jobs_to_apply = suitable_jobs[:remaining_applications]
@@ -0,0 +1,63 @@
+# Cover Letter Tasks for Background Processing
+"""
+This module contains Celery tasks that write cover letters ahead of time
+for users' top-matched jobs, so applying doesn't wait on generation.
+"""
+
+from celery_config import celery_app
+from models import AutomationSetting
+from db import get_db_session
+from cover_letter_store import pregenerate_letters
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Seconds between a resume upload and pre-generation, so the re-scoring it triggers picks the jobs
+UPLOAD_PREGENERATE_DELAY = int(os.getenv('COVER_LETTER_UPLOAD_DELAY', '300'))
+
+@celery_app.task(bind=True, name='tasks.cover_letter_tasks.pregenerate_cover_letters')
+def pregenerate_cover_letters(self, user_id: int):
+    """
+    Generate and store letters for one user's best-matched jobs
+    """
+    session = get_db_session()
+    try:
+        stats = pregenerate_letters(session, user_id)
+        logger.info(f"Cover letters for user {user_id}: {stats['generated']} generated, "
+                    f"{stats['existing']} already stored, {stats['failed']} failed")
+        return stats
+
+    except Exception as e:
+        logger.error(f"Cover letter pre-generation error for user {user_id}: {str(e)}")
+        session.rollback()
+        self.retry(countdown=300, max_retries=2, exc=e)
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.cover_letter_tasks.pregenerate_all_cover_letters')
+def pregenerate_all_cover_letters():
+    """
+    Periodic: queue pre-generation for every user with active automation
+    """
+    session = get_db_session()
+    try:
+        user_ids = [
+            user_id for (user_id,) in session.query(AutomationSetting.user_id).filter(
+                AutomationSetting.is_active == True
+            ).distinct()
+        ]
+    finally:
+        session.close()
+
+    for user_id in user_ids:
+        pregenerate_cover_letters.delay(user_id)
+    return {'users': len(user_ids)}
+
+def enqueue_cover_letter_pregeneration(user_id: int, countdown: int = 0):
+    """Queue pre-generation for a user; the request must not fail if the broker is down"""
+    try:
+        pregenerate_cover_letters.apply_async(args=(user_id,), countdown=countdown)
+    except Exception as e:
+        logger.warning(f"Could not queue cover letter pre-generation for user {user_id}: {e}")
@@ -0,0 +1,149 @@
+# Matching Tasks for Background Processing
+"""
+This module contains Celery tasks that keep per-user job match scores
+up to date. Work is split into (users x jobs) chunks that run in parallel
+as a Celery group.
+"""
+
+from celery import group
+from celery_config import celery_app
+from models import Job
+from db import get_db_session
+from llm_client import llm_priority, BACKGROUND
+from match_scoring import score_matches, active_user_ids, recent_job_ids, candidate_job_ids, drop_scores, chunked
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Chunk sizes for the fan-out: one task scores USER_CHUNK_SIZE users x JOB_CHUNK_SIZE jobs
+JOB_CHUNK_SIZE = int(os.getenv('MATCH_SCORING_JOB_CHUNK_SIZE', '500'))
+USER_CHUNK_SIZE = int(os.getenv('MATCH_SCORING_USER_CHUNK_SIZE', '50'))
+
+def _fan_out(user_ids: List[int], job_ids: List[int]) -> int:
+    """Dispatch one score_match_chunk task per (user chunk, job chunk); returns the task count"""
+    tasks = [
+        score_match_chunk.s(user_chunk, job_chunk)
+        for user_chunk in chunked(user_ids, USER_CHUNK_SIZE)
+        for job_chunk in chunked(job_ids, JOB_CHUNK_SIZE)
+    ]
+    if tasks:
+        group(tasks).apply_async()
+    return len(tasks)
+
+@celery_app.task(bind=True, name='tasks.matching_tasks.score_match_chunk', rate_limit='600/m')
+def score_match_chunk(self, user_ids: List[int], job_ids: List[int]):
+    """
+    Score a chunk of users against a chunk of jobs
+    """
+    session = get_db_session()
+    try:
+        # Bulk scoring yields to interactive LLM requests
+        with llm_priority(BACKGROUND):
+            stats = score_matches(session, user_ids, job_ids)
+        logger.info(f"Scored {stats['scored']} matches ({stats['semantic']} semantic, "
+                    f"{stats['skipped']} unchanged) for {len(user_ids)} users x {len(job_ids)} jobs")
+        return stats
+
+    except Exception as e:
+        logger.error(f"Match scoring chunk error: {str(e)}")
+        session.rollback()
+        self.retry(countdown=60, max_retries=3, exc=e)
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.matching_tasks.score_new_jobs')
+def score_new_jobs(job_ids: List[int]):
+    """
+    Score newly ingested jobs against every active user
+    """
+    session = get_db_session()
+    try:
+        user_ids = active_user_ids(session)
+        task_count = _fan_out(user_ids, sorted(job_ids))
+        if user_ids:
+            # Dispatched, so the periodic sweep leaves these jobs alone
+            session.query(Job).filter(Job.id.in_(job_ids)).update(
+                {Job.match_scored_at: datetime.utcnow()}, synchronize_session=False
+            )
+            session.commit()
+
+        logger.info(f"Dispatched {task_count} scoring tasks for {len(job_ids)} new jobs x {len(user_ids)} users")
+        return {'jobs': len(job_ids), 'users': len(user_ids), 'tasks': task_count}
+
+    except Exception as e:
+        logger.error(f"New job scoring dispatch error: {str(e)}")
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.matching_tasks.score_user_matches')
+def score_user_matches(user_id: int):
+    """
+    Re-score a user's recent jobs after their resume or profile changed
+    """
+    session = get_db_session()
+    try:
+        job_ids = recent_job_ids(session)
+        # Only jobs sharing a skill with the user can score above zero
+        candidates = candidate_job_ids(session, user_id, job_ids)
+        candidate_set = set(candidates)
+        dropped = drop_scores(session, user_id, [job_id for job_id in job_ids if job_id not in candidate_set])
+        task_count = _fan_out([user_id], candidates)
+
+        logger.info(f"Dispatched {task_count} scoring tasks for user {user_id} x {len(candidates)} "
+                    f"candidate jobs (of {len(job_ids)}, {dropped} stale scores dropped)")
+        return {'user_id': user_id, 'jobs': len(job_ids), 'candidates': len(candidates), 'tasks': task_count}
+
+    except Exception as e:
+        logger.error(f"User match scoring dispatch error: {str(e)}")
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.matching_tasks.score_unscored_jobs')
+def score_unscored_jobs(days: int = 3):
+    """
+    Periodic safety net: score recent jobs whose scoring was never
+    dispatched (e.g. ingested while the broker was unavailable). Without
+    active users there is nothing to score; users who become active get
+    their recent jobs scored by score_user_matches.
+    """
+    session = get_db_session()
+    try:
+        if not active_user_ids(session):
+            return {'jobs': 0}
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        job_ids = [
+            job_id for (job_id,) in session.query(Job.id).filter(
+                Job.scraped_at >= cutoff,
+                Job.match_scored_at.is_(None)
+            )
+        ]
+    finally:
+        session.close()
+
+    if not job_ids:
+        return {'jobs': 0}
+    return score_new_jobs(job_ids)
+
+def enqueue_new_job_scoring(job_ids: List[int]):
+    """Queue scoring of freshly ingested jobs; scraping must not fail if the broker is down"""
+    if not job_ids:
+        return
+    try:
+        score_new_jobs.delay(job_ids)
+    except Exception as e:
+        logger.warning(f"Could not queue match scoring for {len(job_ids)} new jobs: {e}")
+
+def enqueue_user_rescoring(user_id: int):
+    """Queue re-scoring after a resume/profile change; the request must not fail if the broker is down"""
+    try:
+        score_user_matches.delay(user_id)
+    except Exception as e:
+        logger.warning(f"Could not queue match scoring for user {user_id}: {e}")
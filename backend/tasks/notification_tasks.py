@@ -5,14 +5,15 @@ about job applications, new matches, and system updates.
 """
 
 from celery_config import celery_app
-from models import User, JobApplication, Job
+from models import User, JobApplication, Job, JobMatchScore
 from db import get_db_session
+from recommendation_index import recommendation_index
 import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import os
 
 logger = logging.getLogger(__name__)
@@ -90,9 +91,10 @@ def send_application_update(user_id: int, application_id: int, status: str):
         session.close()
 
 @celery_app.task(name='tasks.notification_tasks.send_job_matches')
-def send_job_matches(user_id: int, job_ids: List[int]):
+def send_job_matches(user_id: int, job_ids: Optional[List[int]] = None):
     """
     Send notification about new job matches
+    Without job_ids, the user's best matches are read from the recommendation index
     """
     session = get_db_session()
     try:
@@ -100,7 +102,10 @@ def send_job_matches(user_id: int, job_ids: List[int]):
         if not user:
             raise ValueError("User not found")
 
-        jobs = session.query(Job).filter(Job.id.in_(job_ids)).all()
+        if job_ids is None:
+            jobs = [job for job, _ in recommendation_index.top_jobs(session, user_id, limit=10)]
+        else:
+            jobs = session.query(Job).filter(Job.id.in_(job_ids)).all()
 
         if not jobs:
             return {'message': 'No jobs to notify about'}
@@ -141,6 +146,30 @@ def send_job_matches(user_id: int, job_ids: List[int]):
     finally:
         session.close()
 
+@celery_app.task(name='tasks.notification_tasks.send_weekly_job_matches')
+def send_weekly_job_matches():
+    """
+    Periodic task: queue a best-matches notification for every user with recommendations
+    """
+    session = get_db_session()
+    try:
+        user_ids = [user_id for (user_id,) in session.query(JobMatchScore.user_id).filter(
+            JobMatchScore.match_score >= recommendation_index.min_score
+        ).distinct()]
+
+        for user_id in user_ids:
+            send_job_matches.delay(user_id)
+
+        logger.info(f"Queued weekly job match notifications for {len(user_ids)} users")
+        return {'users': len(user_ids)}
+
+    except Exception as e:
+        logger.error(f"Error queuing weekly job matches: {str(e)}")
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
 @celery_app.task(name='tasks.notification_tasks.send_daily_summary')
 def send_daily_summary(user_id: int):
     """
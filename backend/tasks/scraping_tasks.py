@@ -8,8 +8,12 @@ from celery_config import celery_app
 from job_scraper import JobBoardScraper
 from models import Job, User
 from db import get_db_session
+from job_ingest import ingest_job, reextract_stale_job_skills, normalize_stored_salaries, normalize_stored_locations
+from job_search_index import job_search_index
+from tasks.matching_tasks import enqueue_new_job_scoring
+from recommendation_index import recommendation_index
+from skill_index import skill_index
 import logging
-import json
 from datetime import datetime, timedelta
 from typing import Dict, List
 import asyncio
@@ -50,35 +54,22 @@ def scrape_jobs_for_user(user_id: int, search_params: Dict):
 
         # Save jobs to database
         saved_jobs = []
+        new_jobs = []
         for job_data in jobs_data:
             try:
-                # Check if job already exists
-                existing_job = session.query(Job).filter(
-                    Job.url == job_data['url']
-                ).first()
-
-                if not existing_job:
-                    job = Job(
-                        title=job_data['title'],
-                        company=job_data['company'],
-                        location=job_data['location'],
-                        description=job_data['description'],
-                        url=job_data['url'],
-                        platform=job_data['platform'],
-                        salary=job_data.get('salary'),
-                        job_type=job_data.get('job_type'),
-                        posted_date=datetime.utcnow(),
-                        scraped_at=datetime.utcnow(),
-                        raw_data=json.dumps(job_data)
-                    )
-                    session.add(job)
+                # Skips jobs that already exist
+                job = ingest_job(session, job_data)
+                if job:
                     saved_jobs.append(job_data)
+                    new_jobs.append(job)
 
             except Exception as e:
                 logger.error(f"Error saving job: {str(e)}")
                 continue
 
         session.commit()
+        skill_index.add_jobs({job.id: [skill.skill for skill in job.skills] for job in new_jobs})
+        enqueue_new_job_scoring([job.id for job in new_jobs])
 
         result = {
             'user_id': user_id,
@@ -118,6 +109,7 @@ def refresh_job_listings():
 
         scraper = JobBoardScraper()
         total_new_jobs = 0
+        new_jobs = []
 
         for search in common_searches:
             try:
@@ -139,26 +131,10 @@ def refresh_job_listings():
                 # Save new jobs
                 for job_data in jobs_data:
                     try:
-                        existing_job = session.query(Job).filter(
-                            Job.url == job_data['url']
-                        ).first()
-
-                        if not existing_job:
-                            job = Job(
-                                title=job_data['title'],
-                                company=job_data['company'],
-                                location=job_data['location'],
-                                description=job_data['description'],
-                                url=job_data['url'],
-                                platform=job_data['platform'],
-                                salary=job_data.get('salary'),
-                                job_type=job_data.get('job_type'),
-                                posted_date=datetime.utcnow(),
-                                scraped_at=datetime.utcnow(),
-                                raw_data=json.dumps(job_data)
-                            )
-                            session.add(job)
+                        job = ingest_job(session, job_data)
+                        if job:
                             total_new_jobs += 1
+                            new_jobs.append(job)
 
                     except Exception as e:
                         logger.error(f"Error saving job during refresh: {str(e)}")
@@ -169,6 +145,8 @@ def refresh_job_listings():
                 continue
 
         session.commit()
+        skill_index.add_jobs({job.id: [skill.skill for skill in job.skills] for job in new_jobs})
+        enqueue_new_job_scoring([job.id for job in new_jobs])
 
         result = {
             'total_new_jobs': total_new_jobs,
@@ -201,11 +179,15 @@ def cleanup_old_jobs(days_old: int = 30):
         ).all()
 
         deleted_count = len(old_jobs)
+        deleted_job_ids = [job.id for job in old_jobs]
 
         for job in old_jobs:
             session.delete(job)
+        job_search_index.remove_jobs(session, deleted_job_ids)
 
         session.commit()
+        recommendation_index.remove_jobs(deleted_job_ids)
+        skill_index.remove_jobs(deleted_job_ids)
 
         result = {
             'deleted_jobs': deleted_count,
@@ -260,34 +242,21 @@ def deep_scrape_platform(platform: str, search_params: Dict, max_pages: int = 5)
 
         # Save jobs with duplicate checking
         saved_count = 0
+        new_jobs = []
         for job_data in jobs_data:
             try:
-                existing_job = session.query(Job).filter(
-                    Job.url == job_data['url']
-                ).first()
-
-                if not existing_job:
-                    job = Job(
-                        title=job_data['title'],
-                        company=job_data['company'],
-                        location=job_data['location'],
-                        description=job_data['description'],
-                        url=job_data['url'],
-                        platform=job_data['platform'],
-                        salary=job_data.get('salary'),
-                        job_type=job_data.get('job_type'),
-                        posted_date=datetime.utcnow(),
-                        scraped_at=datetime.utcnow(),
-                        raw_data=json.dumps(job_data)
-                    )
-                    session.add(job)
+                job = ingest_job(session, job_data)
+                if job:
                     saved_count += 1
+                    new_jobs.append(job)
 
             except Exception as e:
                 logger.error(f"Error saving job from deep scrape: {str(e)}")
                 continue
 
         session.commit()
+        skill_index.add_jobs({job.id: [skill.skill for skill in job.skills] for job in new_jobs})
+        enqueue_new_job_scoring([job.id for job in new_jobs])
 
         result = {
             'platform': platform,
@@ -307,3 +276,131 @@ def deep_scrape_platform(platform: str, search_params: Dict, max_pages: int = 5)
 
     finally:
         session.close()
+
+@celery_app.task(name='tasks.scraping_tasks.reextract_job_skills')
+def reextract_job_skills(batch_size: int = 500, max_batches: int = 20):
+    """
+    Periodic task to refresh stored job skills after the skill taxonomy changes.
+    A no-op (one indexed query) while every job is on the current version.
+    """
+    session = get_db_session()
+    try:
+        updated_count = 0
+        for _ in range(max_batches):
+            updated = reextract_stale_job_skills(session, batch_size)
+            updated_count += updated
+            if updated < batch_size:
+                break
+
+        result = {
+            'updated_jobs': updated_count,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+        if updated_count:
+            logger.info(f"Skill re-extraction completed: {updated_count} jobs updated")
+        return result
+
+    except Exception as e:
+        logger.error(f"Skill re-extraction task error: {str(e)}")
+        session.rollback()
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.scraping_tasks.normalize_job_salaries')
+def normalize_job_salaries(batch_size: int = 500, max_batches: int = 20):
+    """
+    Periodic task to fill the normalized salary columns of jobs stored before
+    them, or under an older salary parser version, in committed batches.
+    A no-op (one indexed query) once every job is up to date.
+    """
+    session = get_db_session()
+    try:
+        updated_count = 0
+        for _ in range(max_batches):
+            updated = normalize_stored_salaries(session, batch_size)
+            updated_count += updated
+            if updated < batch_size:
+                break
+
+        result = {
+            'updated_jobs': updated_count,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+        if updated_count:
+            logger.info(f"Salary normalization completed: {updated_count} jobs updated")
+        return result
+
+    except Exception as e:
+        logger.error(f"Salary normalization task error: {str(e)}")
+        session.rollback()
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
+@celery_app.task(name='tasks.scraping_tasks.sync_job_search_index')
+def sync_job_search_index():
+    """
+    Periodic task to index stored jobs missing from the search index (stored
+    before it existed, or by paths that skip ingest) and drop full-text
+    entries of deleted jobs. A no-op (two counts) while the index is in step.
+    """
+    session = get_db_session()
+    try:
+        indexed = job_search_index.sync(session, force=True)
+        return {
+            'indexed_jobs': indexed,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Job search index sync error: {str(e)}")
+        session.rollback()
+        return {'error': str(e)}
+
+    finally:
+        session.close()
+
+def enqueue_search_index_sync():
+    """Queue an index backfill (at startup); startup must not fail if the broker is down"""
+    try:
+        sync_job_search_index.delay()
+    except Exception as e:
+        logger.warning(f"Could not queue job search index sync: {e}")
+
+@celery_app.task(name='tasks.scraping_tasks.normalize_job_locations')
+def normalize_job_locations(batch_size: int = 500, max_batches: int = 20):
+    """
+    Periodic task to fill the normalized location columns of jobs stored
+    before them, or under an older location parser version, in committed
+    batches. A no-op (one indexed query) once every job is up to date.
+    """
+    session = get_db_session()
+    try:
+        updated_count = 0
+        for _ in range(max_batches):
+            updated = normalize_stored_locations(session, batch_size)
+            updated_count += updated
+            if updated < batch_size:
+                break
+
+        result = {
+            'updated_jobs': updated_count,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+        if updated_count:
+            logger.info(f"Location normalization completed: {updated_count} jobs updated")
+        return result
+
+    except Exception as e:
+        logger.error(f"Location normalization task error: {str(e)}")
+        session.rollback()
+        return {'error': str(e)}
+
+    finally:
+        session.close()
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Backend modules are imported flat, as the app does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A throwaway database, never the default ./test.db (load_dotenv doesn't override it)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='backend-tests-'), 'test.db')}"
@@ -0,0 +1,52 @@
+import asyncio
+
+from llm_client import BACKGROUND, INTERACTIVE, PriorityLimiter
+
+
+def test_interactive_admitted_past_queued_background_waiters():
+    async def scenario():
+        limiter = PriorityLimiter(capacity=4, reserved=2)
+        # Background fills its share and one more background request queues
+        await limiter.acquire(BACKGROUND)
+        await limiter.acquire(BACKGROUND)
+        queued = asyncio.ensure_future(limiter.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+
+        # The reserved slots are free, so an interactive request doesn't wait
+        await asyncio.wait_for(limiter.acquire(INTERACTIVE), timeout=1)
+        assert limiter.in_use == 3
+        assert not queued.done()
+
+        limiter.release()
+        limiter.release()
+        await asyncio.wait_for(queued, timeout=1)
+        assert limiter.in_use == 2
+
+    asyncio.run(scenario())
+
+
+def test_interactive_waiters_go_before_background_waiters():
+    async def scenario():
+        limiter = PriorityLimiter(capacity=2, reserved=1)
+        await limiter.acquire(INTERACTIVE)
+        await limiter.acquire(INTERACTIVE)
+        order = []
+
+        async def waiter(priority, name):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = asyncio.ensure_future(waiter(BACKGROUND, 'background'))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(waiter(INTERACTIVE, 'interactive'))
+        await asyncio.sleep(0)
+
+        limiter.release()
+        await asyncio.wait_for(interactive, timeout=1)
+        limiter.release()
+        limiter.release()
+        await asyncio.wait_for(background, timeout=1)
+        assert order == ['interactive', 'background']
+
+    asyncio.run(scenario())
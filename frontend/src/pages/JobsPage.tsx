@@ -28,6 +28,8 @@ const JobsPage: React.FC = () => {
   const [searchQuery, setSearchQuery] = useState('');
   const [showFilters, setShowFilters] = useState(true);
   const [selectedJob, setSelectedJob] = useState<Job | null>(null);
+  // Cursor of the page on screen; re-reads it with every field for live results
+  const [pageCursor, setPageCursor] = useState<string | null>(null);
   const [currentPage, setCurrentPage] = useState(1);
   const [pagination, setPagination] = useState<Pagination>({
     total_jobs: 0,
@@ -64,9 +66,9 @@ const JobsPage: React.FC = () => {
             title: job.title,
             company: job.company,
             location: job.location,
-            description: job.description,
+            description: job.description || job.snippet,
             url: job.apply_url || job.url || `#job-${job.id}`,
-            platform: job.platform || 'web',
+            platform: job.platform || job.portal || 'web',
             salary_range: job.salary_range,
             job_type: job.job_type,
           },
@@ -99,7 +101,8 @@ const JobsPage: React.FC = () => {
         experience_level: filters.experienceLevel || '',
         remote_ok: filters.isRemote.toString(),
         posted_days: filters.datePosted || '30',
-        sort_by: 'date'
+        sort_by: 'date',
+        fields: 'compact' // card fields; selectJob loads the full description
       });
 
       console.log('⚡ Making LIGHTNING FAST API request to:', `/api/jobs/search?${params}`);
@@ -142,6 +145,7 @@ const JobsPage: React.FC = () => {
       
       // Always replace jobs for pagination (no more load more)
       setJobs(data.jobs || []);
+      setPageCursor(data.pagination?.cursor || null);
       
       // Update pagination with 50 jobs per page
       setPagination(data.pagination || {
@@ -160,6 +164,45 @@ const JobsPage: React.FC = () => {
     }
   }, [filters]);
 
+  const authHeaders = () => ({
+    ...(localStorage.getItem('token') && {
+      'Authorization': `Bearer ${localStorage.getItem('token')}`
+    })
+  });
+
+  // Search results are compact. Stored jobs (numeric IDs) load their full details when selected;
+  // live and sample jobs have no detail endpoint, so their page is re-read with every field.
+  const selectJob = async (job: Job) => {
+    setSelectedJob(job);
+    if (job.description) return;
+    try {
+      if (/^\d+$/.test(String(job.id))) {
+        const response = await fetch(`/api/jobs/${job.id}`, { headers: authHeaders() });
+        if (response.ok) {
+          const details = await response.json();
+          setSelectedJob(current => (current?.id === job.id ? { ...job, ...details } : current));
+        }
+        return;
+      }
+      if (!pageCursor) return;
+      const response = await fetch(`/api/jobs/search?${new URLSearchParams({ cursor: pageCursor })}`, {
+        headers: authHeaders()
+      });
+      if (response.ok) {
+        const data = await response.json();
+        const details = new Map<string, Job>((data.jobs || []).map((full: Job) => [String(full.id), full]));
+        // Keep the whole page's details so other jobs on it open without another request
+        setJobs(current => current.map(item => ({ ...item, ...details.get(String(item.id)) })));
+        const full = details.get(String(job.id));
+        if (full) {
+          setSelectedJob(current => (current?.id === job.id ? { ...job, ...full } : current));
+        }
+      }
+    } catch (error) {
+      console.error('Error loading job details:', error);
+    }
+  };
+
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
     setCurrentPage(1);
@@ -468,7 +511,7 @@ const JobsPage: React.FC = () => {
                   className={`p-4 bg-white border border-gray-200 rounded-lg hover:shadow-md transition-all duration-200 cursor-pointer ${
                     selectedJob?.id === job.id ? 'border-blue-500 shadow-md bg-blue-50' : ''
                   }`}
-                  onClick={() => setSelectedJob(job)}
+                  onClick={() => selectJob(job)}
                 >
                   <div className="flex items-start justify-between">
                     <div className="flex-1">
@@ -573,7 +616,7 @@ const JobsPage: React.FC = () => {
                   {/* Job Description */}
                   <div className="mb-6">
                     <h3 className="text-lg font-semibold text-gray-900 mb-3">About this role</h3>
-                    <p className="text-gray-700 leading-relaxed">{selectedJob.description}</p>
+                    <p className="text-gray-700 leading-relaxed">{selectedJob.description || selectedJob.snippet}</p>
                   </div>
                   
                   {/* Requirements */}
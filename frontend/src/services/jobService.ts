@@ -11,7 +11,8 @@ export interface Job {
   title: string;
   company: string;
   location: string;
-  description: string;
+  description?: string;  // full text; list results only carry the snippet
+  snippet?: string;
   url?: string;
   portal_url?: string;
   apply_url?: string;
@@ -104,6 +105,8 @@ export class JobService {
       if (filters.page) params.append('page', filters.page.toString());
       if (filters.limit) params.append('limit', filters.limit.toString());
       if (filters.sort_by) params.append('sort_by', filters.sort_by);
+      // Card fields only; GET /api/jobs/{id} has the full description
+      params.append('fields', 'compact');
 
       const response = await fetch(`${API_BASE_URL}/api/jobs/search?${params}`, {
         method: 'GET',